@@ -8,8 +8,9 @@ from sqlalchemy import pool
 from alembic import context
 
 # Import your models' Base
+from app.core.config import settings
 from app.core.database import Base
-from app.models import workflow  # Import all models
+from app.models import events, stats, workflow  # Import all models
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -20,6 +21,10 @@ config = context.config
 if config.config_file_name is not None:
     fileConfig(config.config_file_name)
 
+# alembic.iniで指定がなければアプリケーションの設定を使う
+if not config.get_main_option("sqlalchemy.url"):
+    config.set_main_option("sqlalchemy.url", str(settings.DATABASE_URL))
+
 # add your model's MetaData object here
 # for 'autogenerate' support
 target_metadata = Base.metadata
@@ -45,6 +50,8 @@ def run_migrations_online() -> None:
     url = config.get_main_option("sqlalchemy.url")
     if url.startswith("sqlite+aiosqlite"):
         url = url.replace("sqlite+aiosqlite", "sqlite")
+    elif url.startswith("postgresql+asyncpg"):
+        url = url.replace("postgresql+asyncpg", "postgresql")
     
     configuration = config.get_section(config.config_ini_section, {})
     configuration["sqlalchemy.url"] = url
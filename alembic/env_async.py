@@ -11,7 +11,7 @@ from alembic import context
 
 # Import your models' Base
 from app.core.database import Base
-from app.models import workflow  # Import all models
+from app.models import events, stats, workflow  # Import all models
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
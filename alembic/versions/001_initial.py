@@ -0,0 +1,91 @@
+"""initial schema with indexes for progress queries
+
+Revision ID: 001_initial
+Revises: 
+Create Date: 2025-02-01 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '001_initial'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PROGRESS_STATUSES = (
+    'DISCOVERED',
+    'PURCHASED',
+    'MANUSCRIPT_REQUESTED',
+    'MANUSCRIPT_RECEIVED',
+    'FIRST_PROOF',
+    'SECOND_PROOF',
+    'COMPLETED',
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        'workflow_items',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('n_number', sa.String(length=20), nullable=False),
+        sa.Column('book_id', sa.String(length=50), nullable=True),
+        sa.Column('title', sa.String(length=200), nullable=True),
+        sa.Column('author', sa.String(length=100), nullable=True),
+        sa.Column('repository_name', sa.String(length=100), nullable=True),
+        sa.Column('slack_channel', sa.String(length=50), nullable=True),
+        sa.Column('status', sa.Enum(*PROGRESS_STATUSES, name='progressstatus'), nullable=False),
+        sa.Column('assigned_editor', sa.String(length=50), nullable=True),
+        sa.Column(
+            'workflow_metadata',
+            sa.JSON().with_variant(postgresql.JSONB(), 'postgresql'),
+            nullable=False,
+        ),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_workflow_items_n_number', 'workflow_items', ['n_number'], unique=True)
+    op.create_index('ix_workflow_items_book_id', 'workflow_items', ['book_id'])
+
+    # 一覧取得（フィルタ + updated_at DESC, id DESC）用の複合インデックス
+    op.create_index(
+        'ix_workflow_items_status_updated_at',
+        'workflow_items',
+        ['status', sa.text('updated_at DESC'), sa.text('id DESC')],
+    )
+    op.create_index(
+        'ix_workflow_items_assigned_editor_updated_at',
+        'workflow_items',
+        ['assigned_editor', sa.text('updated_at DESC'), sa.text('id DESC')],
+    )
+    op.create_index(
+        'ix_workflow_items_updated_at',
+        'workflow_items',
+        [sa.text('updated_at DESC'), sa.text('id DESC')],
+    )
+
+    # メタデータの包含検索（@>）用（PostgreSQLのみ）
+    if op.get_bind().dialect.name == 'postgresql':
+        op.create_index(
+            'ix_workflow_items_workflow_metadata',
+            'workflow_items',
+            ['workflow_metadata'],
+            postgresql_using='gin',
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        op.drop_index('ix_workflow_items_workflow_metadata', table_name='workflow_items')
+    op.drop_index('ix_workflow_items_updated_at', table_name='workflow_items')
+    op.drop_index('ix_workflow_items_assigned_editor_updated_at', table_name='workflow_items')
+    op.drop_index('ix_workflow_items_status_updated_at', table_name='workflow_items')
+    op.drop_index('ix_workflow_items_book_id', table_name='workflow_items')
+    op.drop_index('ix_workflow_items_n_number', table_name='workflow_items')
+    op.drop_table('workflow_items')
+    sa.Enum(name='progressstatus').drop(op.get_bind(), checkfirst=True)
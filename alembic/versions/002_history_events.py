@@ -0,0 +1,147 @@
+"""append-only status and notification history
+
+Revision ID: 002_history_events
+Revises: 001_initial
+Create Date: 2025-03-01 00:00:00.000000
+
+PostgreSQLでは `alembic -x partition_events=true upgrade head` で
+履歴テーブルを作成日時のRANGEで年ごとにパーティション分割できる。
+パーティションは `partition_events_from`（既定は今年）から
+`partition_events_years` 年分（既定3）と、範囲外を受けるDEFAULTを作成する。
+翌年以降の分は次のように追加する（DEFAULTに行がある期間は追加できないため、
+その年が始まる前に作成する）::
+
+    CREATE TABLE workflow_status_events_2028 PARTITION OF workflow_status_events
+        FOR VALUES FROM ('2028-01-01') TO ('2029-01-01');
+
+"""
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '002_history_events'
+down_revision: Union[str, None] = '001_initial'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PROGRESS_STATUSES = (
+    'DISCOVERED',
+    'PURCHASED',
+    'MANUSCRIPT_REQUESTED',
+    'MANUSCRIPT_RECEIVED',
+    'FIRST_PROOF',
+    'SECOND_PROOF',
+    'COMPLETED',
+)
+EVENT_TYPES = (
+    'STATUS_CHANGE',
+    'WEBHOOK_RECEIVED',
+    'NOTIFICATION_SENT',
+    'ERROR_OCCURRED',
+    'MANUAL_UPDATE',
+    'SYSTEM_UPDATE',
+)
+WEBHOOK_SOURCES = ('TECH', 'TECHZIP', 'MANUAL', 'SYSTEM')
+NOTIFICATION_STATUSES = ('PENDING', 'SENT', 'FAILED', 'RETRYING')
+
+TABLES = ('workflow_status_events', 'notification_events')
+
+
+def _enum(*values: str, name: str, existing: bool = False) -> sa.Enum:
+    if op.get_bind().dialect.name == 'postgresql':
+        return postgresql.ENUM(*values, name=name, create_type=not existing)
+    return sa.Enum(*values, name=name)
+
+
+def _partitioned() -> bool:
+    if op.get_bind().dialect.name != 'postgresql':
+        return False
+    return context.get_x_argument(as_dictionary=True).get('partition_events', '').lower() in ('1', 'true', 'yes')
+
+
+def _history_table(name: str, *columns: sa.Column, partitioned: bool) -> None:
+    """履歴テーブルを作成（パーティション分割時は主キーに作成日時を含める）"""
+    op.create_table(
+        name,
+        sa.Column('id', sa.BigInteger().with_variant(sa.Integer(), 'sqlite'), autoincrement=True, nullable=False),
+        sa.Column('n_number', sa.String(length=20), nullable=False),
+        *columns,
+        sa.Column(
+            'event_metadata',
+            sa.JSON().with_variant(postgresql.JSONB(), 'postgresql'),
+            nullable=False,
+        ),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+        sa.PrimaryKeyConstraint('id', 'created_at') if partitioned else sa.PrimaryKeyConstraint('id'),
+        **({'postgresql_partition_by': 'RANGE (created_at)'} if partitioned else {}),
+    )
+    # N番号ごとの履歴（新しい順）用の複合インデックス（親テーブルに作成すると各パーティションにも作られる）
+    op.create_index(
+        f'ix_{name}_n_number_created_at',
+        name,
+        ['n_number', sa.text('created_at DESC'), sa.text('id DESC')],
+    )
+
+
+def _create_partitions(name: str) -> None:
+    args = context.get_x_argument(as_dictionary=True)
+    first_year = int(args.get('partition_events_from', date.today().year))
+    years = int(args.get('partition_events_years', 3))
+    for year in range(first_year, first_year + years):
+        op.execute(
+            f"CREATE TABLE {name}_{year} PARTITION OF {name} "
+            f"FOR VALUES FROM ('{year}-01-01') TO ('{year + 1}-01-01')"
+        )
+    op.execute(f"CREATE TABLE {name}_default PARTITION OF {name} DEFAULT")
+
+
+def upgrade() -> None:
+    partitioned = _partitioned()
+    progress_status = _enum(*PROGRESS_STATUSES, name='progressstatus', existing=True)
+    event_type = _enum(*EVENT_TYPES, name='eventtype')
+    webhook_source = _enum(*WEBHOOK_SOURCES, name='webhooksource')
+
+    _history_table(
+        'workflow_status_events',
+        sa.Column('event_type', event_type, nullable=False),
+        sa.Column('source', webhook_source, nullable=False),
+        sa.Column('old_status', progress_status, nullable=True),
+        sa.Column('new_status', progress_status, nullable=False),
+        sa.Column('changed_by', sa.String(length=100), nullable=True),
+        sa.Column('comment', sa.Text(), nullable=True),
+        partitioned=partitioned,
+    )
+
+    # 型は最初のテーブルで作成済み
+    if op.get_bind().dialect.name == 'postgresql':
+        event_type = _enum(*EVENT_TYPES, name='eventtype', existing=True)
+        webhook_source = _enum(*WEBHOOK_SOURCES, name='webhooksource', existing=True)
+
+    _history_table(
+        'notification_events',
+        sa.Column('event_type', event_type, nullable=False),
+        sa.Column('source', webhook_source, nullable=False),
+        sa.Column('channel', sa.String(length=100), nullable=True),
+        sa.Column('status', _enum(*NOTIFICATION_STATUSES, name='notificationstatus'), nullable=False),
+        sa.Column('workflow_status', progress_status, nullable=True),
+        sa.Column('error_message', sa.Text(), nullable=True),
+        partitioned=partitioned,
+    )
+
+    if partitioned:
+        for name in TABLES:
+            _create_partitions(name)
+
+
+def downgrade() -> None:
+    for name in reversed(TABLES):
+        op.drop_index(f'ix_{name}_n_number_created_at', table_name=name)
+        # パーティションは親テーブルと一緒に削除される
+        op.drop_table(name)
+    bind = op.get_bind()
+    for name in ('notificationstatus', 'webhooksource', 'eventtype'):
+        sa.Enum(name=name).drop(bind, checkfirst=True)
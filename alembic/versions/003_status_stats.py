@@ -0,0 +1,178 @@
+"""aggregate counters per status and editor
+
+Revision ID: 003_status_stats
+Revises: 002_history_events
+Create Date: 2025-03-15 00:00:00.000000
+
+workflow_status_statsはworkflow_itemsのトリガーで増減する。
+件数は既存のアイテムから作成し、平均滞在時間はこのリビジョン以降に
+ステータスを抜けたアイテムから集計される。
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '003_status_stats'
+down_revision: Union[str, None] = '002_history_events'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PROGRESS_STATUSES = (
+    'DISCOVERED',
+    'PURCHASED',
+    'MANUSCRIPT_REQUESTED',
+    'MANUSCRIPT_RECEIVED',
+    'FIRST_PROOF',
+    'SECOND_PROOF',
+    'COMPLETED',
+)
+
+# このリビジョン時点のトリガー（以降のモデルの変更に影響されないよう定義を固定する）
+SQLITE_STATS_UPSERT = """
+    INSERT INTO workflow_status_stats (status, assigned_editor, item_count, exit_count, total_seconds)
+    VALUES ({values})
+    ON CONFLICT (status, assigned_editor) DO UPDATE SET
+        item_count = item_count + excluded.item_count,
+        exit_count = exit_count + excluded.exit_count,
+        total_seconds = total_seconds + excluded.total_seconds;
+"""
+
+STATS_TRIGGERS = {
+    'sqlite': [
+        """
+        CREATE TRIGGER IF NOT EXISTS workflow_items_stats_insert AFTER INSERT ON workflow_items
+        BEGIN
+        """ + SQLITE_STATS_UPSERT.format(values="NEW.status, COALESCE(NEW.assigned_editor, ''), 1, 0, 0") + """
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS workflow_items_stats_delete AFTER DELETE ON workflow_items
+        BEGIN
+        """ + SQLITE_STATS_UPSERT.format(values="OLD.status, COALESCE(OLD.assigned_editor, ''), -1, 0, 0") + """
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS workflow_items_stats_update
+        AFTER UPDATE OF status, assigned_editor ON workflow_items
+        WHEN OLD.status IS NOT NEW.status OR OLD.assigned_editor IS NOT NEW.assigned_editor
+        BEGIN
+        """ + SQLITE_STATS_UPSERT.format(values="""
+            OLD.status, COALESCE(OLD.assigned_editor, ''), -1,
+            CASE WHEN OLD.status IS NOT NEW.status THEN 1 ELSE 0 END,
+            CASE WHEN OLD.status IS NOT NEW.status
+                THEN (julianday('now') - julianday(OLD.status_changed_at)) * 86400.0 ELSE 0 END
+        """) + SQLITE_STATS_UPSERT.format(values="NEW.status, COALESCE(NEW.assigned_editor, ''), 1, 0, 0") + """
+            UPDATE workflow_items SET status_changed_at = CURRENT_TIMESTAMP
+            WHERE id = NEW.id AND OLD.status IS NOT NEW.status;
+        END
+        """,
+    ],
+    'postgresql': [
+        """
+        CREATE OR REPLACE FUNCTION workflow_items_track_status() RETURNS trigger AS $$
+        BEGIN
+            IF NEW.status IS DISTINCT FROM OLD.status THEN
+                NEW.status_changed_at := now();
+            END IF;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+        """,
+        """
+        CREATE OR REPLACE FUNCTION workflow_items_update_stats() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO workflow_status_stats AS s (status, assigned_editor, item_count, exit_count, total_seconds)
+            SELECT * FROM (
+                SELECT OLD.status, COALESCE(OLD.assigned_editor, ''), -1,
+                       CASE WHEN TG_OP = 'UPDATE' AND NEW.status <> OLD.status THEN 1 ELSE 0 END,
+                       CASE WHEN TG_OP = 'UPDATE' AND NEW.status <> OLD.status
+                            THEN EXTRACT(EPOCH FROM now() - OLD.status_changed_at) ELSE 0 END
+                WHERE TG_OP <> 'INSERT'
+                UNION ALL
+                SELECT NEW.status, COALESCE(NEW.assigned_editor, ''), 1, 0, 0
+                WHERE TG_OP <> 'DELETE'
+            ) AS delta (status, assigned_editor, item_count, exit_count, total_seconds)
+            ORDER BY status, assigned_editor
+            ON CONFLICT (status, assigned_editor) DO UPDATE SET
+                item_count = s.item_count + EXCLUDED.item_count,
+                exit_count = s.exit_count + EXCLUDED.exit_count,
+                total_seconds = s.total_seconds + EXCLUDED.total_seconds;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """,
+        'DROP TRIGGER IF EXISTS workflow_items_track_status ON workflow_items',
+        """
+        CREATE TRIGGER workflow_items_track_status BEFORE UPDATE OF status ON workflow_items
+        FOR EACH ROW EXECUTE FUNCTION workflow_items_track_status()
+        """,
+        'DROP TRIGGER IF EXISTS workflow_items_stats_insert_delete ON workflow_items',
+        """
+        CREATE TRIGGER workflow_items_stats_insert_delete AFTER INSERT OR DELETE ON workflow_items
+        FOR EACH ROW EXECUTE FUNCTION workflow_items_update_stats()
+        """,
+        'DROP TRIGGER IF EXISTS workflow_items_stats_update ON workflow_items',
+        """
+        CREATE TRIGGER workflow_items_stats_update AFTER UPDATE OF status, assigned_editor ON workflow_items
+        FOR EACH ROW
+        WHEN (OLD.status IS DISTINCT FROM NEW.status OR OLD.assigned_editor IS DISTINCT FROM NEW.assigned_editor)
+        EXECUTE FUNCTION workflow_items_update_stats()
+        """,
+    ],
+}
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+
+    op.add_column(
+        'workflow_items',
+        sa.Column(
+            'status_changed_at',
+            sa.DateTime(timezone=True),
+            server_default=sa.text('(CURRENT_TIMESTAMP)'),
+            nullable=False,
+        ),
+    )
+    # 変更日時が分からない既存アイテムは最終更新日時から数える
+    op.execute('UPDATE workflow_items SET status_changed_at = updated_at')
+
+    if dialect == 'postgresql':
+        status_type = postgresql.ENUM(*PROGRESS_STATUSES, name='progressstatus', create_type=False)
+    else:
+        status_type = sa.Enum(*PROGRESS_STATUSES, name='progressstatus')
+    op.create_table(
+        'workflow_status_stats',
+        sa.Column('status', status_type, nullable=False),
+        sa.Column('assigned_editor', sa.String(length=50), nullable=False),
+        sa.Column('item_count', sa.Integer(), nullable=False),
+        sa.Column('exit_count', sa.Integer(), nullable=False),
+        sa.Column('total_seconds', sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint('status', 'assigned_editor'),
+    )
+    op.execute(
+        "INSERT INTO workflow_status_stats (status, assigned_editor, item_count, exit_count, total_seconds) "
+        "SELECT status, COALESCE(assigned_editor, ''), COUNT(*), 0, 0 FROM workflow_items "
+        "GROUP BY status, COALESCE(assigned_editor, '')"
+    )
+
+    for statement in STATS_TRIGGERS.get(dialect, []):
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        op.execute('DROP TRIGGER IF EXISTS workflow_items_stats_update ON workflow_items')
+        op.execute('DROP TRIGGER IF EXISTS workflow_items_stats_insert_delete ON workflow_items')
+        op.execute('DROP TRIGGER IF EXISTS workflow_items_track_status ON workflow_items')
+        op.execute('DROP FUNCTION IF EXISTS workflow_items_update_stats()')
+        op.execute('DROP FUNCTION IF EXISTS workflow_items_track_status()')
+    else:
+        for name in ('workflow_items_stats_update', 'workflow_items_stats_delete', 'workflow_items_stats_insert'):
+            op.execute(f'DROP TRIGGER IF EXISTS {name}')
+    op.drop_table('workflow_status_stats')
+    op.drop_column('workflow_items', 'status_changed_at')
@@ -0,0 +1,56 @@
+"""delay alert deadline per workflow item
+
+Revision ID: 004_delay_alert_due_at
+Revises: 003_status_stats
+Create Date: 2025-04-01 00:00:00.000000
+
+既存アイテムの期限はこのリビジョン時点のDELAY_ALERT_SLA_HOURSの
+既定値とstatus_changed_atから計算する。すでに期限を過ぎているアイテムには
+スケジューラの最初の周期でアラートが一度ずつ送られる。
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '004_delay_alert_due_at'
+down_revision: Union[str, None] = '003_status_stats'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# ステータスごとのSLA（時間）
+SLA_HOURS = {
+    'PURCHASED': 72,
+    'MANUSCRIPT_REQUESTED': 24 * 14,
+    'MANUSCRIPT_RECEIVED': 72,
+    'FIRST_PROOF': 24 * 7,
+    'SECOND_PROOF': 24 * 7,
+}
+
+
+def upgrade() -> None:
+    op.add_column('workflow_items', sa.Column('due_at', sa.DateTime(timezone=True), nullable=True))
+    op.create_index(
+        'ix_workflow_items_due_at',
+        'workflow_items',
+        ['due_at'],
+        postgresql_where=sa.text('due_at IS NOT NULL'),
+        sqlite_where=sa.text('due_at IS NOT NULL'),
+    )
+
+    if op.get_bind().dialect.name == 'postgresql':
+        deadline = "status_changed_at + make_interval(secs => :seconds)"
+    else:
+        deadline = "datetime(status_changed_at, '+' || :seconds || ' seconds')"
+    for status, hours in SLA_HOURS.items():
+        op.execute(
+            sa.text(f"UPDATE workflow_items SET due_at = {deadline} WHERE status = :status").bindparams(
+                seconds=float(hours) * 3600, status=status
+            )
+        )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_workflow_items_due_at', table_name='workflow_items')
+    op.drop_column('workflow_items', 'due_at')
@@ -1,6 +1,6 @@
 """Health check endpoints."""
 
-from typing import Dict
+from typing import Any, Dict
 
 from fastapi import APIRouter, Depends
 from sqlalchemy import text
@@ -8,6 +8,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
 from app.core.redis import get_redis
+from app.services.workflow_cache import workflow_cache
 
 router = APIRouter()
 
@@ -44,4 +45,10 @@ async def readiness_check(
         "status": status,
         "database": db_status,
         "redis": redis_status,
-    }
\ No newline at end of file
+    }
+
+
+@router.get("/cache")
+async def cache_stats() -> Dict[str, Any]:
+    """Workflow item cache hit/miss counters (this worker only)."""
+    return {"workflow_items": workflow_cache.stats()}
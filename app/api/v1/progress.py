@@ -2,39 +2,403 @@
 TechBridge 進捗管理API
 """
 
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
+import csv
+import hashlib
+import io
+import json
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Literal, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 import structlog
 
+from app.core.config import settings
 from app.core.database import get_db
-from app.core.deps import get_current_user
+from app.core.deps import get_current_user, get_slack_service
 from app.core.exceptions import NotFoundError, ValidationError
-from app.models.enums import ProgressStatus
+from app.models.enums import NotificationStatus, ProgressStatus, WebhookSource
 from app.schemas.progress import (
-    ProgressResponse,
+    BulkEditorAssignment,
+    BulkRejection,
+    BulkSelection,
+    BulkStatusUpdate,
+    BulkUpdateResponse,
     ProgressListResponse,
+    ProgressStatsResponse,
     StatusUpdateRequest,
     StatusUpdateResponse,
     WorkflowItemResponse
 )
 from app.crud import workflow as workflow_crud
+from app.services.slack import SlackService
+from app.services.workflow import BulkUpdateResult, WorkflowService
+from app.services.workflow_cache import workflow_cache
+from app.services.workflow_events import workflow_events
 from app.services.workflow_manager import WorkflowManager
 
 logger = structlog.get_logger(__name__)
 router = APIRouter()
 
 
-@router.get("/{n_number}", response_model=ProgressResponse)
+def make_etag(version: Optional[str], *parts: Any) -> Optional[str]:
+    """変更バージョンとリクエスト内容からETagを生成
+
+    共有の変更バージョンがない場合（Redisなし・接続できない）はNoneを返し、
+    ETagも304も返さない（他のワーカーでの更新を検知できないため）。
+    """
+    if version is None:
+        return None
+    digest = hashlib.sha1(repr((version, parts)).encode("utf-8")).hexdigest()[:20]
+    return f'"{digest}"'
+
+
+def is_not_modified(request: Request, etag: Optional[str]) -> bool:
+    """If-None-MatchがETagに一致するか（GETなので弱い比較）"""
+    header = request.headers.get("if-none-match")
+    if etag is None or not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return etag in (tag.strip().removeprefix("W/") for tag in header.split(","))
+
+
+def cache_headers(etag: Optional[str]) -> Dict[str, str]:
+    """ETag（あれば）と再検証を求めるCache-Control"""
+    headers = {"Cache-Control": "no-cache"}
+    if etag is not None:
+        headers["ETag"] = etag
+    return headers
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers=cache_headers(etag))
+
+
+EXPORT_COLUMNS = list(WorkflowItemResponse.model_fields)
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+async def export_ndjson(batches: AsyncIterator[List[Any]]) -> AsyncIterator[str]:
+    """1行1アイテムのJSON（一覧APIのアイテムと同じ形式）"""
+    async for items in batches:
+        yield "".join(WorkflowItemResponse.model_validate(item).model_dump_json() + "\n" for item in items)
+
+
+async def export_csv(batches: AsyncIterator[List[Any]]) -> AsyncIterator[str]:
+    """ヘッダー付きCSV（メタデータはJSON文字列）"""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS)
+    # Excelで開いても文字化けしないようにBOMを付ける
+    buffer.write("\ufeff")
+    writer.writeheader()
+    yield buffer.getvalue()
+
+    async for items in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        for item in items:
+            row = WorkflowItemResponse.model_validate(item).model_dump(mode="json")
+            row["workflow_metadata"] = json.dumps(row["workflow_metadata"], ensure_ascii=False)
+            writer.writerow(row)
+        yield buffer.getvalue()
+
+
+EXPORT_WRITERS = {
+    "ndjson": export_ndjson,
+    "csv": export_csv,
+}
+
+
+@router.get("/stream")
+async def stream_progress(
+    request: Request,
+    status: Optional[ProgressStatus] = Query(None, description="ステータスでフィルタ"),
+    assigned_editor: Optional[str] = Query(None, description="担当編集者でフィルタ"),
+    last_event_id: Optional[str] = Query(None, description="再開位置（Last-Event-IDヘッダーが優先）"),
+    last_event_id_header: Optional[str] = Header(None, alias="Last-Event-ID")
+) -> StreamingResponse:
+    """
+    進捗の変更をServer-Sent Eventsで配信
+    
+    作成・更新は updated（作成APIのみ created）、削除は deleted イベントとして
+    変更後のアイテムを送る。フィルタは変更後の値（分かる場合は変更前の値も）で
+    判定するため、フィルタ条件から外れたアイテムの変更も届く。
+    再接続時はLast-Event-ID以降のイベントを再送し、再送できない場合は
+    reset イベントを送る（一覧を再取得すること）。
+    
+    Args:
+        request: リクエスト（切断の検知）
+        status: フィルタするステータス
+        assigned_editor: フィルタする担当編集者
+        last_event_id: 再開位置（ヘッダーを付けられないクライアント用）
+        last_event_id_header: 再開位置（EventSourceが再接続時に付与）
+        
+    Returns:
+        text/event-streamのレスポンス
+    """
+    logger.info(
+        "Opening progress stream",
+        status=status,
+        assigned_editor=assigned_editor,
+        last_event_id=last_event_id_header or last_event_id
+    )
+    
+    events = workflow_events.stream(
+        last_event_id=last_event_id_header or last_event_id,
+        status=status.value if status else None,
+        assigned_editor=assigned_editor,
+        heartbeat_seconds=settings.WORKFLOW_EVENTS_HEARTBEAT_SECONDS,
+        is_disconnected=request.is_disconnected
+    )
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.get("/stats", response_model=ProgressStatsResponse)
+async def get_progress_stats(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db)
+) -> Any:
+    """
+    進捗の集計（全体ダッシュボード・統計レポート用）
+    
+    ステータス別・担当編集者別・ステータス×担当編集者別の件数と、
+    ステータスごとの平均滞在時間を返す。workflow_itemsの変更のたびに
+    トリガーで増減する集計テーブルを読むため、アイテム数によらず一定の
+    時間で返る。
+    
+    Args:
+        request: リクエスト（If-None-Match）
+        response: レスポンス（ETagヘッダー）
+        db: データベースセッション
+    
+    Returns:
+        集計結果
+    """
+    etag = make_etag(await workflow_cache.version(), "stats")
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+
+    stats = await workflow_crud.get_status_stats(db)
+    logger.info("Progress stats retrieved", total=stats["total"])
+
+    response.headers.update(cache_headers(etag))
+    return stats
+
+
+@router.get("/export")
+async def export_progress(
+    export_format: Literal["ndjson", "csv"] = Query("ndjson", alias="format", description="出力形式（ndjson, csv）"),
+    status: Optional[ProgressStatus] = Query(None, description="ステータスでフィルタ"),
+    assigned_editor: Optional[str] = Query(None, description="担当編集者でフィルタ"),
+    db: AsyncSession = Depends(get_db)
+) -> StreamingResponse:
+    """
+    進捗情報を一括エクスポート（統計レポート用）
+    
+    一覧APIと同じフィルタ・並び順（updated_atの降順）で全件を返す。
+    サーバーサイドカーソルから読んだ行をそのままストリーミングで送るため、
+    件数によらずメモリ使用量は一定で、ページングや総件数の取得も行わない。
+    
+    Args:
+        export_format: 出力形式
+        status: フィルタするステータス
+        assigned_editor: フィルタする担当編集者
+        db: データベースセッション（レスポンスの送信完了まで使用）
+        
+    Returns:
+        NDJSONまたはCSVのストリーミングレスポンス
+    """
+    logger.info(
+        "Exporting progress",
+        format=export_format,
+        status=status,
+        assigned_editor=assigned_editor
+    )
+    
+    batches = workflow_crud.stream_workflow_items(db, status=status, assigned_editor=assigned_editor)
+    filename = f"workflow_items_{datetime.utcnow():%Y%m%d%H%M%S}.{export_format}"
+    return StreamingResponse(
+        EXPORT_WRITERS[export_format](batches),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+def bulk_targets(request: BulkSelection) -> Dict[str, Any]:
+    """一括更新リクエストの対象指定をWorkflowServiceの引数に変換"""
+    if (request.n_numbers is None) == (request.filter is None):
+        raise ValidationError("n_numbersとfilterのどちらか一方を指定してください", field="n_numbers")
+    
+    targets: Dict[str, Any] = {"limit": settings.BULK_UPDATE_MAX_ITEMS}
+    if request.n_numbers is not None:
+        # N番号の形式チェックと正規化
+        for n_number in request.n_numbers:
+            if not n_number.upper().startswith('N'):
+                raise ValidationError("N番号は'N'で始まる必要があります", field="n_numbers")
+        targets["n_numbers"] = [n_number.upper() for n_number in request.n_numbers]
+    else:
+        # 条件なしのフィルタで全件を更新しない
+        if request.filter.status is None and request.filter.assigned_editor is None:
+            raise ValidationError("filterには1つ以上の条件を指定してください", field="filter")
+        targets["filter_status"] = request.filter.status
+        targets["assigned_editor"] = request.filter.assigned_editor
+    return targets
+
+
+def bulk_update_response(result: BulkUpdateResult, notified: Optional[int] = None) -> BulkUpdateResponse:
+    return BulkUpdateResponse(
+        updated=[item.n_number for item in result.items],
+        unchanged=result.unchanged,
+        rejected=[BulkRejection(n_number=n_number, status=status) for n_number, status in result.rejected],
+        not_found=result.not_found,
+        notified=notified
+    )
+
+
+async def notify_bulk_status_update(
+    db: AsyncSession,
+    slack_service: SlackService,
+    result: BulkUpdateResult
+) -> int:
+    """一括更新したアイテムのステータス通知をまとめて送信し、通知履歴を1回のコミットで記録"""
+    if not result.items:
+        return 0
+    
+    try:
+        sent = await slack_service.send_status_updates([
+            (item.slack_channel, item.n_number, item.title, result.before[item.n_number].status, item.status)
+            for item in result.items
+        ])
+    except Exception as e:
+        logger.error("Failed to send bulk status notifications", items=len(result.items), error=str(e))
+        sent = {}
+    
+    try:
+        for item in result.items:
+            workflow_crud.add_notification_event(
+                db,
+                item.n_number,
+                item.slack_channel,
+                NotificationStatus.from_delivery(sent.get(item.n_number, False)),
+                source=WebhookSource.MANUAL,
+                workflow_status=item.status,
+                metadata={"bulk": True}
+            )
+        await db.commit()
+    except Exception as e:
+        await db.rollback()
+        logger.error("Failed to record bulk notifications", items=len(result.items), error=str(e))
+    
+    return sum(1 for notified in sent.values() if notified)
+
+
+@router.post("/bulk/status", response_model=BulkUpdateResponse)
+async def bulk_update_status(
+    request: BulkStatusUpdate,
+    db: AsyncSession = Depends(get_db),
+    slack_service: SlackService = Depends(get_slack_service),
+    current_user: dict = Depends(get_current_user)
+) -> BulkUpdateResponse:
+    """
+    複数アイテムのステータスを一括更新
+    
+    対象はN番号のリストまたはフィルタ（ステータス・担当編集者）で指定する。
+    遷移できないアイテム（後退）は更新せずrejectedとして返し、遷移できる
+    アイテムだけを1文のUPDATEで更新する。Slack通知はチャンネルごとに
+    まとめて（複数ならダイジェストとして）送信する。
+    
+    Args:
+        request: 一括ステータス更新リクエスト
+        db: データベースセッション
+        slack_service: Slackサービス
+        current_user: 現在のユーザー
+        
+    Returns:
+        N番号ごとの更新結果
+        
+    Raises:
+        ValidationError: N番号の形式が不正な場合、または対象が上限を超える場合
+    """
+    updated_by = current_user.get("sub", "unknown")
+    logger.info(
+        "Bulk updating status",
+        new_status=request.status,
+        n_numbers=len(request.n_numbers) if request.n_numbers else None,
+        filter=request.filter.model_dump() if request.filter else None,
+        updated_by=updated_by
+    )
+    
+    result = await WorkflowService(db).bulk_update_status(
+        request.status,
+        **bulk_targets(request),
+        source=WebhookSource.MANUAL,
+        changed_by=updated_by
+    )
+    notified = await notify_bulk_status_update(db, slack_service, result)
+    
+    return bulk_update_response(result, notified)
+
+
+@router.post("/bulk/editor", response_model=BulkUpdateResponse)
+async def bulk_assign_editor(
+    request: BulkEditorAssignment,
+    db: AsyncSession = Depends(get_db),
+    current_user: dict = Depends(get_current_user)
+) -> BulkUpdateResponse:
+    """
+    複数アイテムに担当編集者を一括割り当て
+    
+    対象の指定方法はステータスの一括更新と同じ。
+    
+    Args:
+        request: 一括割り当てリクエスト
+        db: データベースセッション
+        current_user: 現在のユーザー
+        
+    Returns:
+        N番号ごとの更新結果
+        
+    Raises:
+        ValidationError: N番号の形式が不正な場合、または対象が上限を超える場合
+    """
+    logger.info(
+        "Bulk assigning editor",
+        editor=request.editor,
+        n_numbers=len(request.n_numbers) if request.n_numbers else None,
+        filter=request.filter.model_dump() if request.filter else None,
+        updated_by=current_user.get("sub", "unknown")
+    )
+    
+    result = await WorkflowService(db).bulk_assign_editor(request.editor, **bulk_targets(request))
+    
+    return bulk_update_response(result)
+
+
+@router.get("/{n_number}", response_model=WorkflowItemResponse)
 async def get_progress(
     n_number: str,
+    request: Request,
     db: AsyncSession = Depends(get_db)
-) -> ProgressResponse:
+) -> Response:
     """
     指定されたN番号の進捗情報を取得
     
+    シリアライズ済みのレスポンスをキャッシュから返し、キャッシュにない
+    場合のみデータベースから読み込む。If-None-MatchがETagに一致する
+    場合は304を返す。
+    
     Args:
         n_number: N番号（例: N02345）
+        request: リクエスト（If-None-Match）
         db: データベースセッション
         
     Returns:
@@ -52,32 +416,55 @@ async def get_progress(
     # 正規化
     n_number = n_number.upper()
     
-    # データベースから取得
-    workflow_item = await workflow_crud.get_workflow_item_by_n_number(db, n_number)
-    if not workflow_item:
+    # 前回から変更がなければ304（取得もシリアライズもしない）
+    etag = make_etag(await workflow_cache.version(), n_number)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    
+    # キャッシュ（なければデータベース）から取得
+    payload = await workflow_cache.get_or_load(
+        n_number, lambda: workflow_crud.get_workflow_item_by_n_number(db, n_number)
+    )
+    if payload is None:
         raise NotFoundError("WorkflowItem", n_number)
     
-    logger.info("Progress retrieved successfully", n_number=n_number, status=workflow_item.status)
+    logger.info("Progress retrieved successfully", n_number=n_number)
     
-    return WorkflowItemResponse.model_validate(workflow_item)
+    return Response(
+        content=payload,
+        media_type="application/json",
+        headers=cache_headers(etag)
+    )
 
 
 @router.get("/", response_model=ProgressListResponse)
 async def list_progress(
+    request: Request,
+    response: Response,
     status: Optional[ProgressStatus] = Query(None, description="ステータスでフィルタ"),
     assigned_editor: Optional[str] = Query(None, description="担当編集者でフィルタ"),
     limit: int = Query(100, ge=1, le=1000, description="取得件数制限"),
     offset: int = Query(0, ge=0, description="オフセット"),
+    cursor: Optional[str] = Query(None, description="次ページのカーソル（指定時はoffsetを無視）"),
+    include_total: bool = Query(True, description="総件数を含めるか"),
     db: AsyncSession = Depends(get_db)
 ) -> ProgressListResponse:
     """
     進捗情報のリストを取得
     
+    updated_atの降順で返す。深いページはoffsetではなく、レスポンスの
+    next_cursorをcursorに指定して取得する（キーセットページネーション）。
+    If-None-MatchがETagに一致する場合は304を返す。
+    
     Args:
+        request: リクエスト（If-None-Match）
+        response: レスポンス（ETagを設定）
         status: フィルタするステータス
         assigned_editor: フィルタする担当編集者
         limit: 取得件数制限
         offset: オフセット
+        cursor: 前ページのnext_cursor
+        include_total: 総件数（COUNT）を含めるか
         db: データベースセッション
         
     Returns:
@@ -88,17 +475,46 @@ async def list_progress(
         status=status,
         assigned_editor=assigned_editor,
         limit=limit,
-        offset=offset
+        offset=offset,
+        cursor=cursor
     )
     
-    # データベースから取得
-    workflow_items, total = await workflow_crud.get_multi_with_filters(
-        db,
-        skip=offset,
-        limit=limit,
-        status=status,
-        assigned_editor=assigned_editor
+    # 前回から変更がなければ304（取得もシリアライズもしない）
+    etag = make_etag(
+        await workflow_cache.version(),
+        status, assigned_editor, limit, offset, cursor, include_total
     )
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    response.headers.update(cache_headers(etag))
+    
+    # データベースから取得
+    if cursor is not None or offset == 0:
+        workflow_items, next_cursor = await workflow_crud.get_workflow_items_by_cursor(
+            db,
+            limit=limit,
+            cursor=cursor,
+            status=status,
+            assigned_editor=assigned_editor
+        )
+        offset = 0
+    else:
+        workflow_items, _ = await workflow_crud.get_multi_with_filters(
+            db,
+            skip=offset,
+            limit=limit,
+            status=status,
+            assigned_editor=assigned_editor,
+            include_total=False
+        )
+        next_cursor = (
+            workflow_crud.encode_cursor(workflow_items[-1])
+            if len(workflow_items) == limit else None
+        )
+    
+    total = None
+    if include_total:
+        total = await workflow_crud.count_workflow_items(db, status=status, assigned_editor=assigned_editor)
     
     # レスポンス形式に変換
     items = [WorkflowItemResponse.model_validate(item) for item in workflow_items]
@@ -109,7 +525,8 @@ async def list_progress(
         items=items,
         total=total,
         limit=limit,
-        offset=offset
+        offset=offset,
+        next_cursor=next_cursor
     )
 
 
@@ -134,11 +551,12 @@ async def update_status(
     Raises:
         HTTPException: N番号が見つからない場合、または無効な遷移の場合
     """
+    updated_by = current_user.get("sub", "unknown")
     logger.info(
         "Updating status",
         n_number=n_number,
         new_status=request.status,
-        updated_by=request.updated_by
+        updated_by=updated_by
     )
     
     # N番号の形式チェック
@@ -160,30 +578,35 @@ async def update_status(
             field="status"
         )
     
-    # ワークフローマネージャーを使用して更新
-    workflow_manager = WorkflowManager()
+    old_status = workflow_item.status
+    
+    # ワークフローマネージャーを使用して更新（ステータス履歴も同じトランザクションで記録）
+    workflow_manager = WorkflowManager(db)
     
     try:
-        updated_item = await workflow_manager.update_status(
+        await workflow_manager.update_status(
             n_number=n_number,
-            new_status=request.status,
-            updated_by=request.updated_by or current_user.get("sub", "unknown"),
-            comment=request.comment,
-            db=db
+            status=request.status,
+            workflow_metadata=request.workflow_metadata,
+            source=WebhookSource.MANUAL,
+            changed_by=updated_by
         )
         
         logger.info(
             "Status updated successfully",
             n_number=n_number,
-            old_status=workflow_item.status,
+            old_status=old_status,
             new_status=request.status
         )
         
         return StatusUpdateResponse(
-            n_number=n_number,
-            old_status=workflow_item.status,
-            new_status=request.status,
-            message="ステータスを正常に更新しました"
+            success=True,
+            message="ステータスを正常に更新しました",
+            data={
+                "n_number": n_number,
+                "old_status": old_status.value,
+                "new_status": request.status.value
+            }
         )
         
     except Exception as e:
@@ -12,11 +12,14 @@ from sqlalchemy.ext.asyncio import AsyncSession
 import structlog
 
 from app.core.config import settings
-from app.core.deps import get_db
+from app.core.deps import get_command_responder, get_db, get_slack_service
 from app.core.logging import log_slack_command
 from app.services.workflow import WorkflowService
 from app.services.slack import SlackService
-from app.models.enums import ProgressStatus as WorkflowStatus
+from app.services.slack_responder import CommandJob, SlackCommandResponder, is_response_url
+from app.services.slack_templates import status_label
+from app.services.workflow_cache import workflow_cache
+from app.models.enums import ProgressStatus as WorkflowStatus, WebhookSource
 
 logger = structlog.get_logger(__name__)
 router = APIRouter()
@@ -85,10 +88,31 @@ async def parse_slack_command(request: Request) -> Dict[str, Any]:
     }
 
 
+def should_defer(command_data: Dict[str, Any]) -> bool:
+    """遅延応答モードで処理するか（有効かつresponse_urlがある場合）"""
+    return settings.SLACK_COMMAND_DEFERRED_RESPONSE and is_response_url(command_data["response_url"])
+
+
+async def defer_command(
+    responder: SlackCommandResponder,
+    command_data: Dict[str, Any],
+    job: CommandJob
+) -> JSONResponse:
+    """処理をバックグラウンドに回し、「処理中」の応答を即座に返す"""
+    await responder.submit(command_data["response_url"], job)
+    return JSONResponse(
+        content={
+            "response_type": "ephemeral",
+            "text": "⏳ 処理中です…結果はこのあと投稿されます。"
+        }
+    )
+
+
 @router.post("/commands/status")
 async def handle_status_command(
     request: Request,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    responder: SlackCommandResponder = Depends(get_command_responder)
 ) -> JSONResponse:
     """Slack /statusコマンドを処理"""
     # コマンドをパース
@@ -101,20 +125,28 @@ async def handle_status_command(
         text=command_data["text"]
     )
     
+    if should_defer(command_data):
+        return await defer_command(
+            responder, command_data, lambda session: run_status_command(session, command_data)
+        )
+    
+    return JSONResponse(content=await run_status_command(db, command_data))
+
+
+async def run_status_command(db: AsyncSession, command_data: Dict[str, Any]) -> Dict[str, Any]:
+    """/statusコマンドを実行して応答メッセージを返す"""
     try:
         # N番号を抽出
         n_number = command_data["text"].strip().upper()
         if not n_number:
-            return JSONResponse(
-                content={
-                    "response_type": "ephemeral",
-                    "text": "使用方法: `/status N番号`\n例: `/status N12345`"
-                }
-            )
+            return {
+                "response_type": "ephemeral",
+                "text": "使用方法: `/status N番号`\n例: `/status N12345`"
+            }
         
-        # ワークフローサービスを使用して取得
+        # キャッシュ（なければワークフローサービス）から取得
         workflow_service = WorkflowService(db)
-        item = await workflow_service.get_by_n_number(n_number)
+        item = await workflow_cache.get_item(n_number, lambda: workflow_service.get_by_n_number(n_number))
         
         if not item:
             log_slack_command(
@@ -125,29 +157,16 @@ async def handle_status_command(
                 error="Not found"
             )
             
-            return JSONResponse(
-                content={
-                    "response_type": "ephemeral",
-                    "text": f"❌ {n_number} の進捗情報が見つかりませんでした。"
-                }
-            )
-        
-        # ステータスを日本語に変換
-        status_ja = {
-            WorkflowStatus.DISCOVERED: "🔍 発見",
-            WorkflowStatus.PURCHASED: "💰 購入完了",
-            WorkflowStatus.MANUSCRIPT_REQUESTED: "✍️ 原稿依頼",
-            WorkflowStatus.MANUSCRIPT_RECEIVED: "📄 原稿受領",
-            WorkflowStatus.FIRST_PROOF: "📝 初校",
-            WorkflowStatus.SECOND_PROOF: "✏️ 再校",
-            WorkflowStatus.COMPLETED: "✅ 完成"
-        }
+            return {
+                "response_type": "ephemeral",
+                "text": f"❌ {n_number} の進捗情報が見つかりませんでした。"
+            }
         
         # レスポンスを構築
         response_text = f"""📊 *{n_number}の進捗*
 📖 タイトル: {item.title}
 ✍️ 著者: {item.author}
-📅 ステータス: {status_ja.get(item.status, item.status.value)}
+📅 ステータス: {status_label(item.status)}
 🕐 更新日時: {item.updated_at.strftime('%Y-%m-%d %H:%M')}"""
         
         if item.assigned_editor:
@@ -161,12 +180,10 @@ async def handle_status_command(
             n_number=n_number
         )
         
-        return JSONResponse(
-            content={
-                "response_type": "in_channel",
-                "text": response_text
-            }
-        )
+        return {
+            "response_type": "in_channel",
+            "text": response_text
+        }
         
     except Exception as e:
         logger.error(
@@ -183,18 +200,18 @@ async def handle_status_command(
             error=str(e)
         )
         
-        return JSONResponse(
-            content={
-                "response_type": "ephemeral",
-                "text": f"❌ エラーが発生しました: {str(e)}"
-            }
-        )
+        return {
+            "response_type": "ephemeral",
+            "text": f"❌ エラーが発生しました: {str(e)}"
+        }
 
 
 @router.post("/commands/update")
 async def handle_update_command(
     request: Request,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    slack_service: SlackService = Depends(get_slack_service),
+    responder: SlackCommandResponder = Depends(get_command_responder)
 ) -> JSONResponse:
     """Slack /updateコマンドを処理"""
     # コマンドをパース
@@ -207,16 +224,28 @@ async def handle_update_command(
         text=command_data["text"]
     )
     
+    if should_defer(command_data):
+        return await defer_command(
+            responder, command_data, lambda session: run_update_command(session, slack_service, command_data)
+        )
+    
+    return JSONResponse(content=await run_update_command(db, slack_service, command_data))
+
+
+async def run_update_command(
+    db: AsyncSession,
+    slack_service: SlackService,
+    command_data: Dict[str, Any]
+) -> Dict[str, Any]:
+    """/updateコマンドを実行して応答メッセージを返す"""
     try:
         # 引数をパース
         parts = command_data["text"].strip().split()
         if len(parts) < 2:
-            return JSONResponse(
-                content={
-                    "response_type": "ephemeral",
-                    "text": "使用方法: `/update N番号 ステータス`\n例: `/update N12345 first_proof`\n\n利用可能なステータス:\n- discovered (発見)\n- purchased (購入完了)\n- manuscript_requested (原稿依頼)\n- manuscript_received (原稿受領)\n- first_proof (初校)\n- second_proof (再校)\n- completed (完成)"
-                }
-            )
+            return {
+                "response_type": "ephemeral",
+                "text": "使用方法: `/update N番号 ステータス`\n例: `/update N12345 first_proof`\n\n利用可能なステータス:\n- discovered (発見)\n- purchased (購入完了)\n- manuscript_requested (原稿依頼)\n- manuscript_received (原稿受領)\n- first_proof (初校)\n- second_proof (再校)\n- completed (完成)"
+            }
         
         n_number = parts[0].upper()
         status_str = parts[1].lower()
@@ -225,12 +254,10 @@ async def handle_update_command(
         try:
             new_status = WorkflowStatus[status_str.upper()]
         except KeyError:
-            return JSONResponse(
-                content={
-                    "response_type": "ephemeral",
-                    "text": f"❌ 無効なステータス: {status_str}\n\n利用可能なステータス:\n- discovered\n- purchased\n- manuscript_requested\n- manuscript_received\n- first_proof\n- second_proof\n- completed"
-                }
-            )
+            return {
+                "response_type": "ephemeral",
+                "text": f"❌ 無効なステータス: {status_str}\n\n利用可能なステータス:\n- discovered\n- purchased\n- manuscript_requested\n- manuscript_received\n- first_proof\n- second_proof\n- completed"
+            }
         
         # ワークフローサービスを使用して更新
         workflow_service = WorkflowService(db)
@@ -238,12 +265,10 @@ async def handle_update_command(
         # 既存のアイテムを取得
         item = await workflow_service.get_by_n_number(n_number)
         if not item:
-            return JSONResponse(
-                content={
-                    "response_type": "ephemeral",
-                    "text": f"❌ {n_number} の進捗情報が見つかりませんでした。"
-                }
-            )
+            return {
+                "response_type": "ephemeral",
+                "text": f"❌ {n_number} の進捗情報が見つかりませんでした。"
+            }
         
         old_status = item.status
         
@@ -251,11 +276,12 @@ async def handle_update_command(
         item = await workflow_service.update_status(
             n_number=n_number,
             status=new_status,
-            metadata={"updated_by": command_data["user_name"]}
+            workflow_metadata={"updated_by": command_data["user_name"]},
+            source=WebhookSource.MANUAL,
+            changed_by=command_data["user_name"]
         )
         
         # Slack通知を送信
-        slack_service = SlackService(settings.SLACK_BOT_TOKEN)
         await slack_service.send_status_update(
             channel=item.slack_channel,
             n_number=n_number,
@@ -264,17 +290,6 @@ async def handle_update_command(
             new_status=new_status
         )
         
-        # ステータスを日本語に変換
-        status_ja = {
-            WorkflowStatus.DISCOVERED: "発見",
-            WorkflowStatus.PURCHASED: "購入完了",
-            WorkflowStatus.MANUSCRIPT_REQUESTED: "原稿依頼",
-            WorkflowStatus.MANUSCRIPT_RECEIVED: "原稿受領",
-            WorkflowStatus.FIRST_PROOF: "初校",
-            WorkflowStatus.SECOND_PROOF: "再校",
-            WorkflowStatus.COMPLETED: "完成"
-        }
-        
         log_slack_command(
             command="/update",
             user=command_data["user_name"],
@@ -284,12 +299,10 @@ async def handle_update_command(
             new_status=new_status.value
         )
         
-        return JSONResponse(
-            content={
-                "response_type": "in_channel",
-                "text": f"✅ {n_number} のステータスを「{status_ja.get(new_status, new_status.value)}」に更新しました。"
-            }
-        )
+        return {
+            "response_type": "in_channel",
+            "text": f"✅ {n_number} のステータスを「{WorkflowStatus.get_display_name(new_status)}」に更新しました。"
+        }
         
     except Exception as e:
         logger.error(
@@ -306,9 +319,7 @@ async def handle_update_command(
             error=str(e)
         )
         
-        return JSONResponse(
-            content={
-                "response_type": "ephemeral",
-                "text": f"❌ エラーが発生しました: {str(e)}"
-            }
-        )
\ No newline at end of file
+        return {
+            "response_type": "ephemeral",
+            "text": f"❌ エラーが発生しました: {str(e)}"
+        }
\ No newline at end of file
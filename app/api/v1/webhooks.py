@@ -3,18 +3,31 @@
 import hmac
 import hashlib
 import json
-from typing import Dict, Any
+from typing import Any, Dict, List, Optional, Tuple
 
-from fastapi import APIRouter, Request, HTTPException, Depends, status
+from fastapi import APIRouter, Request, Response, HTTPException, Depends, status
 from sqlalchemy.ext.asyncio import AsyncSession
 import structlog
 
 from app.core.config import settings
-from app.core.deps import get_db
-from app.core.logging import log_webhook_event
-from app.services.workflow import WorkflowService
+from app.core.deps import get_db, get_slack_service
+from app.core.exceptions import NotFoundError, ValidationError
 from app.services.slack import SlackService
-from app.models.enums import ProgressStatus as WorkflowStatus
+from app.services.webhook_processor import (
+    WEBHOOK_PROCESSORS,
+    parse_tech_status,
+    process_tech_status_batch,
+)
+from app.services.webhook_idempotency import (
+    DELIVERY_ID_HEADER,
+    claim_webhook,
+    forget_webhook,
+    get_idempotency_store,
+    idempotency_key,
+    remember_webhook,
+)
+from app.services.webhook_queue import enqueue_webhook
+from app.models.enums import WebhookSource
 
 logger = structlog.get_logger(__name__)
 router = APIRouter()
@@ -35,12 +48,8 @@ def verify_webhook_signature(
     return hmac.compare_digest(expected_signature, signature)
 
 
-@router.post("/tech/status-change")
-async def handle_tech_webhook(
-    request: Request,
-    db: AsyncSession = Depends(get_db)
-) -> Dict[str, Any]:
-    """[tech]からのステータス変更Webhookを処理"""
+async def read_signed_payload(request: Request, secret: str) -> Dict[str, Any]:
+    """署名を検証してJSONペイロードを取得"""
     # 署名を取得
     signature = request.headers.get("X-Webhook-Signature")
     if not signature:
@@ -53,7 +62,7 @@ async def handle_tech_webhook(
     body = await request.body()
     
     # 署名を検証
-    if not verify_webhook_signature(body, signature, settings.TECH_WEBHOOK_SECRET):
+    if not verify_webhook_signature(body, signature, secret):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid signature"
@@ -61,194 +70,224 @@ async def handle_tech_webhook(
     
     # JSONをパース
     try:
-        payload = json.loads(body)
+        return json.loads(body)
     except json.JSONDecodeError:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid JSON"
         )
-    
-    logger.info(
-        "Received tech webhook",
-        event=payload.get("event"),
-        n_number=payload.get("n_number"),
-        status=payload.get("status")
-    )
+
+
+async def dispatch_webhook(
+    source: WebhookSource,
+    payload: Dict[str, Any],
+    db: AsyncSession,
+    slack_service: SlackService
+) -> Tuple[int, Dict[str, Any]]:
+    """キューに投入して202を返す（キューが使えない場合はリクエスト内で処理）"""
+    if settings.WEBHOOK_ASYNC_PROCESSING:
+        event_id = await enqueue_webhook(source, payload)
+        if event_id:
+            return status.HTTP_202_ACCEPTED, {
+                "status": "accepted",
+                "n_number": payload.get("n_number"),
+                "event_id": event_id,
+                "message": "Webhook queued for processing"
+            }
     
     try:
-        # ワークフローサービスを使用して更新
-        workflow_service = WorkflowService(db)
-        
-        # ステータスをEnumに変換
-        status_str = payload.get("status", "").upper()
-        try:
-            new_status = WorkflowStatus[status_str]
-        except KeyError:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Invalid status: {status_str}"
-            )
-        
-        # ワークフローアイテムを作成または更新
-        item = await workflow_service.create_or_update(
-            n_number=payload.get("n_number"),
-            book_id=payload.get("book_id"),
-            title=payload.get("title"),
-            author=payload.get("author"),
-            status=new_status,
-            repository_name=f"n{payload.get('n_number', '').lower()}-{payload.get('title', '').replace(' ', '-').lower()[:30]}",
-            slack_channel="#general",  # TODO: Google Sheetsから取得
-            workflow_metadata=payload.get("metadata", {})
-        )
-        
-        # Slack通知を送信
-        slack_service = SlackService(settings.SLACK_BOT_TOKEN)
-        await slack_service.send_status_update(
-            channel=item.slack_channel,
-            n_number=item.n_number,
-            title=item.title,
-            old_status=None,  # 新規の場合
-            new_status=new_status
+        item = await WEBHOOK_PROCESSORS[source](db, slack_service, payload)
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=e.message
         )
-        
-        # ログを記録
-        log_webhook_event(
-            event_type="status_change",
-            source="tech",
-            n_number=item.n_number,
-            success=True,
-            status=new_status.value
+    except NotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Workflow item not found: {payload.get('n_number')}"
         )
-        
-        return {
-            "status": "success",
-            "n_number": item.n_number,
-            "message": f"Status updated to {new_status.value}"
-        }
-        
     except Exception as e:
-        logger.error(
-            "Failed to process tech webhook",
-            error=str(e),
-            n_number=payload.get("n_number")
-        )
-        
-        log_webhook_event(
-            event_type="status_change",
-            source="tech",
-            n_number=payload.get("n_number", "unknown"),
-            success=False,
-            error=str(e)
-        )
-        
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to process webhook: {str(e)}"
         )
+    
+    return status.HTTP_200_OK, {
+        "status": "success",
+        "n_number": item.n_number,
+        "message": (
+            f"Status updated to {item.status.value}"
+            if source == WebhookSource.TECH
+            else "Completion notification processed"
+        )
+    }
 
 
-@router.post("/techzip/completion")
-async def handle_techzip_webhook(
+async def accept_or_process(
+    source: WebhookSource,
+    payload: Dict[str, Any],
     request: Request,
-    db: AsyncSession = Depends(get_db)
+    response: Response,
+    db: AsyncSession,
+    slack_service: SlackService
 ) -> Dict[str, Any]:
-    """[techzip]からの完了通知Webhookを処理"""
-    # 署名を取得
-    signature = request.headers.get("X-Webhook-Signature")
-    if not signature:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Missing signature"
-        )
-    
-    # ボディを取得
-    body = await request.body()
+    """重複配信を排除してからWebhookを処理"""
+    store = await get_idempotency_store()
+    key = idempotency_key(source, payload, request.headers.get(DELIVERY_ID_HEADER))
     
-    # 署名を検証
-    if not verify_webhook_signature(body, signature, settings.TECHZIP_WEBHOOK_SECRET):
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid signature"
+    # 再送された重複イベントは保存済みのレスポンスを返す
+    cached = await claim_webhook(store, key)
+    if cached is not None:
+        logger.info(
+            "Duplicate webhook skipped",
+            source=source.value,
+            n_number=payload.get("n_number"),
+            pending=cached.get("pending", False)
         )
+        response.headers["X-Idempotent-Replay"] = "true"
+        if cached.get("pending"):
+            response.status_code = status.HTTP_202_ACCEPTED
+            return {
+                "status": "processing",
+                "n_number": payload.get("n_number"),
+                "message": "Duplicate webhook is already being processed"
+            }
+        response.status_code = cached["status_code"]
+        return cached["body"]
     
-    # JSONをパース
     try:
-        payload = json.loads(body)
-    except json.JSONDecodeError:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid JSON"
-        )
+        status_code, body = await dispatch_webhook(source, payload, db, slack_service)
+    except Exception:
+        await forget_webhook(store, key)
+        raise
+    
+    await remember_webhook(store, key, status_code, body)
+    response.status_code = status_code
+    return body
+
+
+@router.post("/tech/status-change")
+async def handle_tech_webhook(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+    slack_service: SlackService = Depends(get_slack_service)
+) -> Dict[str, Any]:
+    """[tech]からのステータス変更Webhookを処理"""
+    payload = await read_signed_payload(request, settings.TECH_WEBHOOK_SECRET)
     
     logger.info(
-        "Received techzip webhook",
-        event=payload.get("event"),
+        "Received tech webhook",
+        webhook_event=payload.get("event"),
         n_number=payload.get("n_number"),
-        repository_name=payload.get("repository_name")
+        status=payload.get("status")
     )
     
+    # 不正なステータスはキュー投入前に弾く
     try:
-        # ワークフローサービスを使用して更新
-        workflow_service = WorkflowService(db)
-        
-        # 既存のアイテムを取得
-        item = await workflow_service.get_by_n_number(payload.get("n_number"))
-        if not item:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Workflow item not found: {payload.get('n_number')}"
-            )
-        
-        # ステータスを更新
-        old_status = item.status
-        item = await workflow_service.update_status(
-            n_number=payload.get("n_number"),
-            status=WorkflowStatus.COMPLETED,
-            workflow_metadata=payload.get("metadata", {})
+        parse_tech_status(payload)
+    except ValidationError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid status: {payload.get('status', '').upper()}"
         )
-        
-        # Slack通知を送信
-        slack_service = SlackService(settings.SLACK_BOT_TOKEN)
-        await slack_service.send_completion_notification(
-            channel=item.slack_channel,
-            n_number=item.n_number,
-            repository_name=payload.get("repository_name"),
-            workflow_metadata=payload.get("metadata", {})
+    
+    return await accept_or_process(WebhookSource.TECH, payload, request, response, db, slack_service)
+
+
+@router.post("/tech/status-change/batch")
+async def handle_tech_webhook_batch(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    slack_service: SlackService = Depends(get_slack_service)
+) -> Dict[str, Any]:
+    """[tech]からの複数のステータス変更Webhookをまとめて処理
+
+    各イベントは単体のエンドポイントと同じ冪等キーで確保し、処理中または
+    処理済みのイベントは"duplicate"として結果に含めて処理しない。
+    """
+    payload = await read_signed_payload(request, settings.TECH_WEBHOOK_SECRET)
+    
+    events = payload.get("events") if isinstance(payload, dict) else None
+    if not isinstance(events, list) or not events:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="events must be a non-empty array"
         )
-        
-        # ログを記録
-        log_webhook_event(
-            event_type="completion",
-            source="techzip",
-            n_number=item.n_number,
-            success=True,
-            repository_name=payload.get("repository_name")
+    if len(events) > settings.WEBHOOK_BATCH_MAX_EVENTS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Too many events (max {settings.WEBHOOK_BATCH_MAX_EVENTS})"
         )
-        
-        return {
-            "status": "success",
-            "n_number": item.n_number,
-            "message": "Completion notification processed"
-        }
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(
-            "Failed to process techzip webhook",
-            error=str(e),
-            n_number=payload.get("n_number")
+    
+    logger.info("Received tech webhook batch", events=len(events))
+    
+    # 単体のエンドポイントと同じキーでイベントごとに重複配信を排除する
+    store = await get_idempotency_store()
+    results: List[Optional[Dict[str, Any]]] = [None] * len(events)
+    claimed: List[Tuple[int, str]] = []
+    for index, event in enumerate(events):
+        key = idempotency_key(WebhookSource.TECH, event)
+        cached = await claim_webhook(store, key)
+        if cached is None:
+            claimed.append((index, key))
+            continue
+        n_number = event.get("n_number") if isinstance(event, dict) else None
+        logger.info(
+            "Duplicate webhook skipped",
+            source=WebhookSource.TECH.value,
+            n_number=n_number,
+            pending=cached.get("pending", False)
         )
-        
-        log_webhook_event(
-            event_type="completion",
-            source="techzip",
-            n_number=payload.get("n_number", "unknown"),
-            success=False,
-            error=str(e)
+        results[index] = {"index": index, "n_number": n_number, "status": "duplicate"}
+    
+    try:
+        processed = await process_tech_status_batch(
+            db, slack_service, [events[index] for index, _ in claimed], settings.WEBHOOK_BATCH_NOTIFY_CONCURRENCY
         )
-        
+    except Exception as e:
+        logger.error("Failed to process tech webhook batch", error=str(e), events=len(events))
+        for _, key in claimed:
+            await forget_webhook(store, key)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to process webhook: {str(e)}"
-        )
\ No newline at end of file
+            detail=f"Failed to process webhook batch: {str(e)}"
+        )
+    
+    for (index, key), result in zip(claimed, processed):
+        result["index"] = index
+        results[index] = result
+        if result["status"] == "error":
+            await forget_webhook(store, key)
+        else:
+            await remember_webhook(store, key, status.HTTP_200_OK, result)
+    
+    failed = sum(1 for result in results if result["status"] == "error")
+    return {
+        "status": "success" if failed == 0 else "partial",
+        "total": len(results),
+        "failed": failed,
+        "duplicates": len(events) - len(claimed),
+        "results": results
+    }
+
+
+@router.post("/techzip/completion")
+async def handle_techzip_webhook(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+    slack_service: SlackService = Depends(get_slack_service)
+) -> Dict[str, Any]:
+    """[techzip]からの完了通知Webhookを処理"""
+    payload = await read_signed_payload(request, settings.TECHZIP_WEBHOOK_SECRET)
+    
+    logger.info(
+        "Received techzip webhook",
+        webhook_event=payload.get("event"),
+        n_number=payload.get("n_number"),
+        repository_name=payload.get("repository_name")
+    )
+    
+    return await accept_or_process(WebhookSource.TECHZIP, payload, request, response, db, slack_service)
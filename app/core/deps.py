@@ -7,6 +7,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.auth import api_key_auth, auth_service
 from app.core.database import AsyncSessionLocal
+from app.services.registry import services
+from app.services.slack import SlackService
+from app.services.slack_responder import SlackCommandResponder, command_responder
 
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
@@ -18,6 +21,16 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+def get_slack_service() -> SlackService:
+    """共有SlackServiceを取得"""
+    return services.get_slack_service()
+
+
+def get_command_responder() -> SlackCommandResponder:
+    """スラッシュコマンドの遅延応答レスポンダを取得"""
+    return command_responder
+
+
 async def get_current_user(token_data: dict = Depends(auth_service.verify_token)) -> dict:
     """現在のユーザーを取得"""
     return token_data
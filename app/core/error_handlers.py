@@ -107,8 +107,8 @@ def register_error_handlers(app: FastAPI) -> None:
         logger.warning(
             "Validation error",
             message=str(exc),
-            field=exc.field,
-            value=exc.value,
+            field=exc.details.get("field"),
+            value=exc.details.get("value"),
             path=request.url.path
         )
         
@@ -116,7 +116,7 @@ def register_error_handlers(app: FastAPI) -> None:
             error="ValidationError",
             message=str(exc),
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            details={"field": exc.field, "value": exc.value},
+            details={"field": exc.details.get("field"), "value": exc.details.get("value")},
             request_id=getattr(request.state, "request_id", None)
         )
     
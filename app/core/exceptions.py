@@ -92,6 +92,8 @@ class NotFoundError(TechBridgeException):
     """リソース未発見エラー"""
     
     def __init__(self, resource: str, identifier: str, details: Optional[Dict[str, Any]] = None):
+        self.resource = resource
+        self.identifier = identifier
         message = f"{resource} not found: {identifier}"
         error_details = details or {}
         error_details.update({"resource": resource, "identifier": identifier})
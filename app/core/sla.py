@@ -0,0 +1,27 @@
+"""ステータスごとのSLAと遅延アラートの期限
+
+CRUD・サービス・スケジューラのどこからでも使えるよう、設定と列挙型以外に
+依存しない。
+"""
+
+from datetime import datetime, timedelta
+from typing import Optional
+
+from app.core.config import settings
+from app.models.enums import ProgressStatus
+
+
+def status_sla(status: ProgressStatus) -> Optional[timedelta]:
+    """ステータスのSLA（設定がなければNone）"""
+    hours = settings.DELAY_ALERT_SLA_HOURS.get(status.value)
+    if not hours or hours <= 0:
+        return None
+    return timedelta(hours=hours)
+
+
+def due_at_for(status: ProgressStatus, changed_at: Optional[datetime] = None) -> Optional[datetime]:
+    """ステータスになった日時からアラートの期限を計算"""
+    sla = status_sla(status)
+    if sla is None:
+        return None
+    return (changed_at or datetime.utcnow()) + sla
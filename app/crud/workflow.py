@@ -1,12 +1,20 @@
 """Workflow CRUD operations."""
 
-from typing import List, Optional, Tuple, Dict, Any
-from sqlalchemy import select, and_
+import base64
+from datetime import datetime
+from typing import AsyncIterator, List, Optional, Tuple, Dict, Any
+from sqlalchemy import insert, select, update, and_, func, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.exceptions import ValidationError
+from app.core.sla import due_at_for
+from app.models.events import NotificationEvent, WorkflowStatusEvent
+from app.models.stats import UNASSIGNED, WorkflowStatusStats
 from app.models.workflow import WorkflowItem
-from app.models.enums import ProgressStatus as WorkflowStatus
+from app.models.enums import EventType, NotificationStatus, ProgressStatus as WorkflowStatus, WebhookSource
 from app.schemas.progress import WorkflowItemCreate, WorkflowItemUpdate
+from app.services.workflow_cache import workflow_cache
+from app.services.workflow_events import snapshot, workflow_events
 
 
 async def get_workflow_item(
@@ -31,50 +39,145 @@ async def get_workflow_item_by_n_number(
     return result.scalar_one_or_none()
 
 
-async def get_workflow_items(
-    db: AsyncSession, 
-    skip: int = 0, 
-    limit: int = 100,
+def _filter_conditions(
     status: Optional[WorkflowStatus] = None,
     assigned_editor: Optional[str] = None
-) -> Tuple[List[WorkflowItem], int]:
-    """Get workflow items with filters."""
-    # Build query
-    query = select(WorkflowItem)
-    count_query = select(WorkflowItem)
-    
-    # Apply filters
+) -> List[Any]:
+    """Build WHERE conditions for list queries."""
     conditions = []
     if status is not None:
         conditions.append(WorkflowItem.status == status)
     if assigned_editor is not None:
         conditions.append(WorkflowItem.assigned_editor == assigned_editor)
+    return conditions
+
+
+def encode_cursor(item: WorkflowItem) -> str:
+    """Encode the keyset position (updated_at, id) of an item as an opaque cursor."""
+    raw = f"{item.updated_at.isoformat()}|{item.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decode a cursor produced by encode_cursor."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        updated_at, item_id = base64.urlsafe_b64decode(padded.encode()).decode().rsplit("|", 1)
+        return datetime.fromisoformat(updated_at), int(item_id)
+    except (ValueError, UnicodeDecodeError):
+        raise ValidationError("Invalid cursor", field="cursor")
+
+
+async def count_workflow_items(
+    db: AsyncSession,
+    status: Optional[WorkflowStatus] = None,
+    assigned_editor: Optional[str] = None
+) -> int:
+    """Count workflow items with SELECT count(*)."""
+    query = select(func.count()).select_from(WorkflowItem)
+    conditions = _filter_conditions(status, assigned_editor)
+    if conditions:
+        query = query.where(and_(*conditions))
     
+    result = await db.execute(query)
+    return result.scalar_one()
+
+
+async def get_workflow_items(
+    db: AsyncSession, 
+    skip: int = 0, 
+    limit: int = 100,
+    status: Optional[WorkflowStatus] = None,
+    assigned_editor: Optional[str] = None,
+    include_total: bool = True
+) -> Tuple[List[WorkflowItem], Optional[int]]:
+    """Get workflow items with filters."""
+    # Build query
+    query = select(WorkflowItem)
+    conditions = _filter_conditions(status, assigned_editor)
     if conditions:
         query = query.where(and_(*conditions))
-        count_query = count_query.where(and_(*conditions))
     
     # Get total count
-    count_result = await db.execute(count_query)
-    total = len(count_result.scalars().all())
+    total = await count_workflow_items(db, status, assigned_editor) if include_total else None
     
     # Get items with pagination
-    query = query.order_by(WorkflowItem.updated_at.desc()).offset(skip).limit(limit)
+    query = query.order_by(WorkflowItem.updated_at.desc(), WorkflowItem.id.desc()).offset(skip).limit(limit)
     result = await db.execute(query)
     items = result.scalars().all()
     
     return items, total
 
 
+async def get_workflow_items_by_cursor(
+    db: AsyncSession,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    status: Optional[WorkflowStatus] = None,
+    assigned_editor: Optional[str] = None
+) -> Tuple[List[WorkflowItem], Optional[str]]:
+    """Get workflow items with keyset pagination on (updated_at, id).
+    
+    Returns the page and the cursor of the next page (None on the last page).
+    """
+    query = select(WorkflowItem)
+    conditions = _filter_conditions(status, assigned_editor)
+    if cursor is not None:
+        updated_at, item_id = decode_cursor(cursor)
+        conditions.append(
+            tuple_(WorkflowItem.updated_at, WorkflowItem.id) < tuple_(updated_at, item_id)
+        )
+    if conditions:
+        query = query.where(and_(*conditions))
+    
+    # Fetch one extra row to know whether a next page exists
+    query = query.order_by(WorkflowItem.updated_at.desc(), WorkflowItem.id.desc()).limit(limit + 1)
+    result = await db.execute(query)
+    items = list(result.scalars().all())
+    
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = encode_cursor(items[-1])
+    
+    return items, next_cursor
+
+
+async def stream_workflow_items(
+    db: AsyncSession,
+    status: Optional[WorkflowStatus] = None,
+    assigned_editor: Optional[str] = None,
+    batch_size: int = 500
+) -> AsyncIterator[List[WorkflowItem]]:
+    """Stream all matching workflow items in list order, batch_size rows at a time.
+    
+    Uses a server-side cursor (stream_scalars with yield_per), so only one
+    batch is held in memory and no COUNT is issued.
+    """
+    query = select(WorkflowItem)
+    conditions = _filter_conditions(status, assigned_editor)
+    if conditions:
+        query = query.where(and_(*conditions))
+    query = query.order_by(WorkflowItem.updated_at.desc(), WorkflowItem.id.desc())
+    
+    result = await db.stream_scalars(query.execution_options(yield_per=batch_size))
+    async for items in result.partitions():
+        yield items
+
+
 async def create_workflow_item(
     db: AsyncSession, 
     workflow: WorkflowItemCreate
 ) -> WorkflowItem:
     """Create new workflow item."""
     db_workflow = WorkflowItem(**workflow.model_dump())
+    db_workflow.due_at = due_at_for(db_workflow.status)
     db.add(db_workflow)
+    add_status_event(db, db_workflow.n_number, None, db_workflow.status)
     await db.commit()
     await db.refresh(db_workflow)
+    await workflow_cache.invalidate(db_workflow.n_number)
+    await workflow_events.publish_items("created", [db_workflow])
     return db_workflow
 
 
@@ -88,12 +191,19 @@ async def update_workflow_item(
     if not db_workflow:
         return None
     
+    previous = snapshot(db_workflow)
+    old_status = db_workflow.status
     update_data = workflow_update.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(db_workflow, field, value)
+    if db_workflow.status != old_status:
+        add_status_event(db, db_workflow.n_number, old_status, db_workflow.status)
+        db_workflow.due_at = due_at_for(db_workflow.status)
     
     await db.commit()
     await db.refresh(db_workflow)
+    await workflow_cache.invalidate(db_workflow.n_number)
+    await workflow_events.publish_items("updated", [db_workflow], previous)
     return db_workflow
 
 
@@ -101,13 +211,27 @@ async def update_workflow_status(
     db: AsyncSession,
     n_number: str,
     status: WorkflowStatus,
-    workflow_metadata: Optional[Dict[str, Any]] = None
+    workflow_metadata: Optional[Dict[str, Any]] = None,
+    source: WebhookSource = WebhookSource.SYSTEM,
+    changed_by: Optional[str] = None,
+    comment: Optional[str] = None
 ) -> Optional[WorkflowItem]:
-    """Update workflow status by N number."""
+    """Update workflow status by N number.
+    
+    The status event is staged on the session so that it is written in the
+    same flush and transaction as the update.
+    """
     db_workflow = await get_workflow_item_by_n_number(db, n_number)
     if not db_workflow:
         return None
     
+    previous = snapshot(db_workflow)
+    if db_workflow.status != status:
+        add_status_event(
+            db, n_number, db_workflow.status, status,
+            source=source, changed_by=changed_by, comment=comment
+        )
+        db_workflow.due_at = due_at_for(status)
     db_workflow.status = status
     if workflow_metadata:
         if db_workflow.workflow_metadata:
@@ -117,6 +241,8 @@ async def update_workflow_status(
     
     await db.commit()
     await db.refresh(db_workflow)
+    await workflow_cache.invalidate(n_number)
+    await workflow_events.publish_items("updated", [db_workflow], previous)
     return db_workflow
 
 
@@ -130,9 +256,12 @@ async def assign_editor(
     if not db_workflow:
         return None
     
+    previous = snapshot(db_workflow)
     db_workflow.assigned_editor = editor
     await db.commit()
     await db.refresh(db_workflow)
+    await workflow_cache.invalidate(n_number)
+    await workflow_events.publish_items("updated", [db_workflow], previous)
     return db_workflow
 
 
@@ -141,10 +270,11 @@ async def get_multi_with_filters(
     skip: int = 0, 
     limit: int = 100,
     status: Optional[WorkflowStatus] = None,
-    assigned_editor: Optional[str] = None
-) -> Tuple[List[WorkflowItem], int]:
+    assigned_editor: Optional[str] = None,
+    include_total: bool = True
+) -> Tuple[List[WorkflowItem], Optional[int]]:
     """Get workflow items with filters (alias for get_workflow_items)."""
-    return await get_workflow_items(db, skip, limit, status, assigned_editor)
+    return await get_workflow_items(db, skip, limit, status, assigned_editor, include_total)
 
 
 async def delete_workflow_item(
@@ -158,4 +288,202 @@ async def delete_workflow_item(
     
     await db.delete(db_workflow)
     await db.commit()
-    return True
\ No newline at end of file
+    await workflow_cache.invalidate(db_workflow.n_number)
+    await workflow_events.publish_items("deleted", [db_workflow])
+    return True
+
+
+async def pop_overdue_items(
+    db: AsyncSession,
+    now: datetime,
+    limit: int
+) -> List[WorkflowItem]:
+    """Clear due_at of up to `limit` overdue items (earliest due first) and return them.
+
+    Walks the partial due_at index, so the cost depends on the number of overdue
+    items rather than the table size. On PostgreSQL, rows locked by another
+    scheduler are skipped; the change is committed by the caller.
+    """
+    overdue = (
+        select(WorkflowItem.id)
+        .where(WorkflowItem.due_at.isnot(None), WorkflowItem.due_at <= now)
+        .order_by(WorkflowItem.due_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    result = await db.execute(
+        update(WorkflowItem)
+        .where(WorkflowItem.id.in_(overdue.scalar_subquery()))
+        # アラート送信は更新扱いにしない（一覧の並び順を変えない）
+        .values(due_at=None, updated_at=WorkflowItem.updated_at)
+        .returning(WorkflowItem),
+        execution_options={"synchronize_session": False}
+    )
+    return list(result.scalars().all())
+
+
+async def reschedule_due_at(
+    db: AsyncSession,
+    item_ids: List[int],
+    due_at: datetime
+) -> None:
+    """Set due_at of the given items again (e.g. to retry a failed delay alert).
+
+    Like pop_overdue_items, this does not count as an update of the item.
+    """
+    if not item_ids:
+        return
+    await db.execute(
+        update(WorkflowItem)
+        .where(WorkflowItem.id.in_(item_ids))
+        .values(due_at=due_at, updated_at=WorkflowItem.updated_at),
+        execution_options={"synchronize_session": False}
+    )
+
+
+def add_status_event(
+    db: AsyncSession,
+    n_number: str,
+    old_status: Optional[WorkflowStatus],
+    new_status: WorkflowStatus,
+    source: WebhookSource = WebhookSource.SYSTEM,
+    changed_by: Optional[str] = None,
+    comment: Optional[str] = None,
+    event_type: EventType = EventType.STATUS_CHANGE
+) -> WorkflowStatusEvent:
+    """Stage a status transition event (written on the caller's next commit)."""
+    event = WorkflowStatusEvent(
+        n_number=n_number,
+        event_type=event_type,
+        source=source,
+        old_status=old_status,
+        new_status=new_status,
+        changed_by=changed_by,
+        comment=comment,
+        event_metadata={},
+    )
+    db.add(event)
+    return event
+
+
+async def add_status_transitions(
+    db: AsyncSession,
+    transitions: List[Tuple[str, Optional[WorkflowStatus], WorkflowStatus]],
+    source: WebhookSource = WebhookSource.SYSTEM,
+    changed_by: Optional[str] = None
+) -> None:
+    """Append status events for (n_number, old_status, new_status) transitions.
+
+    The caller passes the previous status it read in the same transaction, so
+    items created before the history tables existed get their real previous
+    status. All events are written with a single executemany INSERT.
+    """
+    rows = [
+        {
+            "n_number": n_number,
+            "event_type": EventType.STATUS_CHANGE,
+            "source": source,
+            "old_status": old_status,
+            "new_status": new_status,
+            "changed_by": changed_by,
+            "event_metadata": {},
+        }
+        for n_number, old_status, new_status in transitions
+        if old_status != new_status
+    ]
+    if rows:
+        await db.execute(insert(WorkflowStatusEvent), rows)
+
+
+def add_notification_event(
+    db: AsyncSession,
+    n_number: str,
+    channel: Optional[str],
+    status: NotificationStatus,
+    source: WebhookSource = WebhookSource.SYSTEM,
+    workflow_status: Optional[WorkflowStatus] = None,
+    error_message: Optional[str] = None,
+    metadata: Optional[Dict[str, Any]] = None
+) -> NotificationEvent:
+    """Stage a notification event (written on the caller's next commit)."""
+    event = NotificationEvent(
+        n_number=n_number,
+        event_type=EventType.NOTIFICATION_SENT if status != NotificationStatus.FAILED else EventType.ERROR_OCCURRED,
+        source=source,
+        channel=channel,
+        status=status,
+        workflow_status=workflow_status,
+        error_message=error_message,
+        event_metadata=metadata or {},
+    )
+    db.add(event)
+    return event
+
+
+async def get_status_history(
+    db: AsyncSession,
+    n_number: str,
+    limit: int = 50
+) -> List[WorkflowStatusEvent]:
+    """Get the latest status events of an item (newest first)."""
+    result = await db.execute(
+        select(WorkflowStatusEvent)
+        .where(WorkflowStatusEvent.n_number == n_number)
+        .order_by(WorkflowStatusEvent.created_at.desc(), WorkflowStatusEvent.id.desc())
+        .limit(limit)
+    )
+    return list(result.scalars().all())
+
+
+async def get_notification_history(
+    db: AsyncSession,
+    n_number: str,
+    limit: int = 50
+) -> List[NotificationEvent]:
+    """Get the latest notification events of an item (newest first)."""
+    result = await db.execute(
+        select(NotificationEvent)
+        .where(NotificationEvent.n_number == n_number)
+        .order_by(NotificationEvent.created_at.desc(), NotificationEvent.id.desc())
+        .limit(limit)
+    )
+    return list(result.scalars().all())
+
+
+async def get_status_stats(db: AsyncSession) -> Dict[str, Any]:
+    """Get item counts and average time-in-status from the aggregate counters.
+
+    Reads workflow_status_stats (at most statuses x editors rows), so the cost
+    does not depend on the number of workflow items.
+    """
+    result = await db.execute(select(WorkflowStatusStats))
+    by_status = {status.value: 0 for status in WorkflowStatus}
+    by_editor: Dict[Optional[str], int] = {}
+    by_status_editor = []
+    exits = {status.value: [0, 0.0] for status in WorkflowStatus}
+
+    for row in result.scalars():
+        editor = row.assigned_editor if row.assigned_editor != UNASSIGNED else None
+        exits[row.status.value][0] += row.exit_count
+        exits[row.status.value][1] += row.total_seconds
+        if row.item_count <= 0:
+            continue
+        by_status[row.status.value] += row.item_count
+        by_editor[editor] = by_editor.get(editor, 0) + row.item_count
+        by_status_editor.append({"status": row.status.value, "assigned_editor": editor, "count": row.item_count})
+
+    order = {status.value: index for index, status in enumerate(WorkflowStatus)}
+    by_status_editor.sort(key=lambda entry: (order[entry["status"]], entry["assigned_editor"] or ""))
+    return {
+        "total": sum(by_status.values()),
+        "by_status": by_status,
+        "by_editor": [
+            {"assigned_editor": editor, "count": count}
+            for editor, count in sorted(by_editor.items(), key=lambda entry: (entry[0] is None, entry[0] or ""))
+        ],
+        "by_status_editor": by_status_editor,
+        "average_seconds_in_status": {
+            status: round(total / count, 1) if count else None
+            for status, (count, total) in exits.items()
+        },
+    }
@@ -10,10 +10,15 @@ from app.api import health
 from app.api.v1 import api_router
 from app.core.config import settings
 from app.core.logging import setup_logging
+from app.core.redis import close_redis
 from app.core.error_handlers import register_error_handlers
-from app.middleware.request_id import RequestIDMiddleware
-from app.middleware.rate_limit import RateLimitMiddleware
-from app.middleware.logging import LoggingMiddleware
+from app.middleware.request_context import RequestContextMiddleware
+from app.services.delay_alerts import create_delay_alert_scheduler
+from app.services.registry import services
+from app.services.slack_channel_cache import channel_cache
+from app.services.slack_responder import command_responder
+from app.services.webhook_queue import create_worker_pool
+from app.services.workflow_events import workflow_events
 
 # Setup logging
 setup_logging()
@@ -24,10 +29,40 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     """Application lifespan events."""
     # Startup
     print(f"Starting TechBridge API v{settings.VERSION}")
+    channel_cache.load()
+    services.startup()
+    
+    # Slack送信ワーカーを起動
+    slack_service = services.get_slack_service()
+    slack_service.dispatcher.start()
+    command_responder.start()
+    
+    # 遅延アラートのスケジューラを起動
+    delay_alerts = None
+    if settings.DELAY_ALERT_ENABLED:
+        delay_alerts = create_delay_alert_scheduler(services.get_slack_service)
+        delay_alerts.start()
+    
+    # Webhookキューのワーカーを起動
+    webhook_workers = None
+    if settings.WEBHOOK_ASYNC_PROCESSING:
+        webhook_workers = create_worker_pool(services.get_slack_service)
+        webhook_workers.start()
     
     yield
     
     # Shutdown
+    if webhook_workers is not None:
+        await webhook_workers.stop()
+    if delay_alerts is not None:
+        await delay_alerts.stop()
+    await command_responder.stop()
+    await slack_service.flush_notifications()
+    await slack_service.dispatcher.stop()
+    await workflow_events.stop()
+    await close_redis()
+    services.shutdown()
+    channel_cache.save()
     print("Shutting down TechBridge API")
 
 
@@ -41,10 +76,8 @@ app = FastAPI(
 # Register error handlers
 register_error_handlers(app)
 
-# Add custom middleware (順序重要: RequestID → Logging → RateLimit)
-app.add_middleware(LoggingMiddleware)
-app.add_middleware(RequestIDMiddleware)
-app.add_middleware(RateLimitMiddleware, requests_per_minute=60, burst_size=10)
+# Add custom middleware (リクエストID → レート制限 → ロギングを1層で処理)
+app.add_middleware(RequestContextMiddleware)
 
 # CORS middleware
 app.add_middleware(
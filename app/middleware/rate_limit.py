@@ -1,103 +1,221 @@
-"""レート制限ミドルウェア"""
+"""レート制限
+
+GCRA（Generic Cell Rate Algorithm）で「1分あたりのリクエスト数」と
+「バースト数」を制限する。カウンタの保存先はバックエンドとして差し替え可能。
+
+- InMemoryRateLimitBackend: プロセス内。LRUで保持するクライアント数に上限を設ける
+- RedisRateLimitBackend: Luaスクリプトで原子的に判定し、複数ワーカー間で共有する
+
+ルート（パスのプレフィックス）ごと・APIキーごとにポリシーを設定でき、
+ポリシーごとに別の枠でカウントする（[tech]のWebhookとSlackコマンドが
+互いの枠を消費しない）。
+"""
 
 import time
-from typing import Dict, Tuple
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Iterable, Optional
 
-from fastapi import Request, Response, status
-from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
 import structlog
 
+from app.core.config import settings
+from app.core.redis import get_redis
+
 logger = structlog.get_logger(__name__)
 
+KEY_PREFIX = "techbridge:ratelimit"
+
+# KEYS[1]: カウンタのキー
+# ARGV[1]: 1リクエストあたりの間隔（ミリ秒）, ARGV[2]: バースト数
+# 戻り値: {許可(1/0), 再試行までのミリ秒, 残りリクエスト数}
+GCRA_SCRIPT = """
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) * 1000 + math.floor(tonumber(now_parts[2]) / 1000)
+local interval = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+
+local tat = tonumber(redis.call('GET', KEYS[1])) or now
+if tat < now then
+    tat = now
+end
+
+local new_tat = tat + interval
+local allow_at = new_tat - burst * interval
+if now < allow_at then
+    return {0, allow_at - now, 0}
+end
+
+redis.call('SET', KEYS[1], new_tat, 'PX', math.max(new_tat - now, 1))
+return {1, 0, math.floor((now - allow_at) / interval)}
+"""
+
+
+class RateLimitPolicy:
+    """レート制限ポリシー（1分あたりのリクエスト数とバースト数）"""
+
+    def __init__(self, name: str, requests_per_minute: int, burst_size: int):
+        self.name = name
+        self.requests_per_minute = requests_per_minute
+        self.burst_size = max(burst_size, 1)
+
+    @property
+    def interval(self) -> float:
+        """1リクエストあたりの間隔（秒）"""
+        return 60.0 / self.requests_per_minute
+
+    @classmethod
+    def parse(cls, name: str, spec: str) -> "RateLimitPolicy":
+        """"600/60"（1分あたりのリクエスト数/バースト数）形式からポリシーを生成"""
+        rate, _, burst = spec.partition("/")
+        return cls(name, int(rate), int(burst or rate))
+
+    def __repr__(self) -> str:
+        return f"<RateLimitPolicy({self.name}: {self.requests_per_minute}/min, burst={self.burst_size})>"
+
+
+class RateLimitResult:
+    """レート制限の判定結果"""
+
+    def __init__(self, allowed: bool, retry_after: float = 0.0, remaining: int = 0):
+        self.allowed = allowed
+        self.retry_after = retry_after
+        self.remaining = remaining
+
+
+class InMemoryRateLimitBackend:
+    """プロセス内のGCRAカウンタ（LRUで保持数に上限あり）"""
+
+    def __init__(self, max_clients: int = 10000, clock: Callable[[], float] = time.monotonic):
+        self.max_clients = max_clients
+        self.clock = clock
+        self._tats: "OrderedDict[str, float]" = OrderedDict()
+
+    async def hit(self, key: str, policy: RateLimitPolicy) -> RateLimitResult:
+        """1リクエスト分を消費"""
+        now = self.clock()
+        interval = policy.interval
+
+        tat = max(self._tats.get(key, now), now)
+        new_tat = tat + interval
+        allow_at = new_tat - policy.burst_size * interval
+        if now < allow_at:
+            return RateLimitResult(False, retry_after=allow_at - now)
+
+        self._tats[key] = new_tat
+        self._tats.move_to_end(key)
+        while len(self._tats) > self.max_clients:
+            self._tats.popitem(last=False)
+
+        return RateLimitResult(True, remaining=int((now - allow_at) / interval))
+
+
+class RedisRateLimitBackend:
+    """RedisのLuaスクリプトによるGCRAカウンタ（複数ワーカー間で共有）"""
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
-    """シンプルなレート制限ミドルウェア"""
-    
     def __init__(
         self,
-        app,
-        requests_per_minute: int = 60,
-        burst_size: int = 10
+        redis_factory: Callable[[], Awaitable[Redis]] = get_redis,
+        fallback: Optional[InMemoryRateLimitBackend] = None
     ):
-        super().__init__(app)
-        self.requests_per_minute = requests_per_minute
-        self.burst_size = burst_size
-        self.clients: Dict[str, Tuple[float, int]] = {}
-        
-    def _get_client_id(self, request: Request) -> str:
+        self.redis_factory = redis_factory
+        self.fallback = fallback or InMemoryRateLimitBackend()
+        self._script = None
+
+    async def hit(self, key: str, policy: RateLimitPolicy) -> RateLimitResult:
+        """1リクエスト分を消費（Redisが使えない場合はプロセス内で判定）"""
+        try:
+            if self._script is None:
+                redis = await self.redis_factory()
+                self._script = redis.register_script(GCRA_SCRIPT)
+
+            allowed, retry_after_ms, remaining = await self._script(
+                keys=[f"{KEY_PREFIX}:{key}"],
+                args=[int(policy.interval * 1000), policy.burst_size]
+            )
+        except (RedisError, OSError) as e:
+            logger.warning("Redis rate limiter unavailable, using in-process limiter", error=str(e))
+            return await self.fallback.hit(key, policy)
+
+        return RateLimitResult(bool(allowed), retry_after=int(retry_after_ms) / 1000, remaining=int(remaining))
+
+
+def _matches(path: str, prefix: str) -> bool:
+    """パスがプレフィックス（セグメント単位）に一致するか"""
+    return path == prefix or path.startswith(prefix.rstrip("/") + "/")
+
+
+class RateLimiter:
+    """ポリシーの選択とカウンタの消費"""
+
+    def __init__(
+        self,
+        default_policy: RateLimitPolicy,
+        backend=None,
+        route_policies: Optional[Dict[str, RateLimitPolicy]] = None,
+        api_key_policies: Optional[Dict[str, RateLimitPolicy]] = None,
+        exempt_paths: Iterable[str] = ("/health",)
+    ):
+        self.default_policy = default_policy
+        self.backend = backend or InMemoryRateLimitBackend()
+        # 長いプレフィックスを優先
+        self.route_policies = sorted(
+            (route_policies or {}).items(), key=lambda item: len(item[0]), reverse=True
+        )
+        self.api_key_policies = api_key_policies or {}
+        self.exempt_paths = tuple(exempt_paths)
+
+    @staticmethod
+    def client_id(api_key: Optional[str], client_host: Optional[str]) -> str:
         """クライアントIDを取得"""
         # APIキーがある場合はそれを使用
-        api_key = request.headers.get("X-API-Key")
         if api_key:
             return f"api_key:{api_key}"
-        
+
         # IPアドレスを使用
-        if request.client:
-            return f"ip:{request.client.host}"
-        
+        if client_host:
+            return f"ip:{client_host}"
+
         return "unknown"
-    
-    def _is_rate_limited(self, client_id: str) -> bool:
-        """レート制限をチェック"""
-        current_time = time.time()
-        
-        if client_id not in self.clients:
-            self.clients[client_id] = (current_time, 1)
-            return False
-        
-        last_request_time, request_count = self.clients[client_id]
-        time_passed = current_time - last_request_time
-        
-        # 1分以上経過している場合はリセット
-        if time_passed >= 60:
-            self.clients[client_id] = (current_time, 1)
-            return False
-        
-        # バーストサイズを超えていないかチェック
-        if request_count >= self.burst_size and time_passed < 1:
-            return True
-        
-        # 分あたりのリクエスト数をチェック
-        expected_requests = (time_passed / 60) * self.requests_per_minute
-        if request_count > expected_requests:
-            return True
-        
-        # リクエストカウントを増やす
-        self.clients[client_id] = (last_request_time, request_count + 1)
-        return False
-    
-    async def dispatch(self, request: Request, call_next):
-        """リクエストを処理"""
-        # ヘルスチェックエンドポイントは除外
-        if request.url.path == "/health":
-            return await call_next(request)
-        
-        client_id = self._get_client_id(request)
-        
-        if self._is_rate_limited(client_id):
-            logger.warning(
-                "Rate limit exceeded",
-                client_id=client_id,
-                path=request.url.path
-            )
-            
-            return JSONResponse(
-                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                content={
-                    "error": "RateLimitExceeded",
-                    "message": "リクエスト数が制限を超えました。しばらく待ってから再試行してください。"
-                },
-                headers={
-                    "Retry-After": "60",
-                    "X-RateLimit-Limit": str(self.requests_per_minute),
-                    "X-RateLimit-Reset": str(int(time.time()) + 60)
-                }
-            )
-        
-        response = await call_next(request)
-        
-        # レート制限情報をヘッダーに追加
-        response.headers["X-RateLimit-Limit"] = str(self.requests_per_minute)
-        
-        return response
\ No newline at end of file
+
+    def policy_for(self, path: str, api_key: Optional[str] = None) -> Optional[RateLimitPolicy]:
+        """リクエストに適用するポリシーを選択（制限対象外ならNone）"""
+        if any(_matches(path, exempt) for exempt in self.exempt_paths):
+            return None
+
+        if api_key and api_key in self.api_key_policies:
+            return self.api_key_policies[api_key]
+
+        for prefix, policy in self.route_policies:
+            if _matches(path, prefix):
+                return policy
+
+        return self.default_policy
+
+    async def hit(self, policy: RateLimitPolicy, client_id: str) -> RateLimitResult:
+        """ポリシーの枠を1リクエスト分消費"""
+        return await self.backend.hit(f"{policy.name}:{client_id}", policy)
+
+
+def create_rate_limiter() -> RateLimiter:
+    """設定値からレート制限を生成"""
+    local_backend = InMemoryRateLimitBackend(max_clients=settings.RATE_LIMIT_MAX_CLIENTS)
+    if settings.RATE_LIMIT_BACKEND == "redis":
+        backend = RedisRateLimitBackend(fallback=local_backend)
+    else:
+        backend = local_backend
+
+    return RateLimiter(
+        default_policy=RateLimitPolicy(
+            "default", settings.RATE_LIMIT_REQUESTS_PER_MINUTE, settings.RATE_LIMIT_BURST
+        ),
+        backend=backend,
+        route_policies={
+            prefix: RateLimitPolicy.parse(prefix, spec)
+            for prefix, spec in settings.RATE_LIMIT_ROUTE_POLICIES.items()
+        },
+        api_key_policies={
+            api_key: RateLimitPolicy.parse("api_key", spec)
+            for api_key, spec in settings.RATE_LIMIT_API_KEY_POLICIES.items()
+        },
+    )
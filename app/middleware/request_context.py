@@ -0,0 +1,122 @@
+"""リクエストコンテキストミドルウェア（純粋なASGI実装）
+
+リクエストIDの付与・レート制限・処理時間の計測・アクセスログを1層で行う。
+BaseHTTPMiddlewareと異なりリクエストごとにタスクやストリームを生成せず、
+StreamingResponseもそのまま流れる。
+"""
+
+import json
+import math
+import time
+import uuid
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+import structlog
+
+from app.core.logging import log_request_response
+from app.middleware.rate_limit import RateLimiter, RateLimitPolicy, RateLimitResult, create_rate_limiter
+
+logger = structlog.get_logger(__name__)
+
+RATE_LIMIT_BODY = json.dumps({
+    "error": "RateLimitExceeded",
+    "message": "リクエスト数が制限を超えました。しばらく待ってから再試行してください。"
+}, ensure_ascii=False).encode("utf-8")
+
+
+class RequestContextMiddleware:
+    """リクエストID・レート制限・アクセスログを処理するASGIミドルウェア"""
+
+    def __init__(self, app: ASGIApp, rate_limiter: Optional[RateLimiter] = None):
+        self.app = app
+        self.rate_limiter = rate_limiter or create_rate_limiter()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        headers = Headers(scope=scope)
+        client = scope.get("client")
+        client_host: Optional[str] = client[0] if client else None
+        method = scope["method"]
+        path = scope["path"]
+
+        # リクエストIDを生成または取得し、request.stateとロガーに設定
+        request_id = headers.get("x-request-id") or str(uuid.uuid4())
+        scope.setdefault("state", {})["request_id"] = request_id
+        structlog.contextvars.bind_contextvars(request_id=request_id)
+
+        status_code = 500
+        policy: Optional[RateLimitPolicy] = None
+        result: Optional[RateLimitResult] = None
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                response_headers = MutableHeaders(scope=message)
+                response_headers["X-Request-ID"] = request_id
+                if policy is not None:
+                    response_headers["X-RateLimit-Limit"] = str(policy.requests_per_minute)
+                    response_headers["X-RateLimit-Remaining"] = str(result.remaining)
+            await send(message)
+
+        try:
+            # ヘルスチェックなど対象外のパスはpolicyがNone
+            api_key = headers.get("x-api-key")
+            policy = self.rate_limiter.policy_for(path, api_key)
+            if policy is not None:
+                client_id = self.rate_limiter.client_id(api_key, client_host)
+                result = await self.rate_limiter.hit(policy, client_id)
+                if not result.allowed:
+                    logger.warning("Rate limit exceeded", client_id=client_id, path=path, policy=policy.name)
+                    await self._send_rate_limited(send_wrapper, result)
+                    return
+
+            await self.app(scope, receive, send_wrapper)
+
+        except Exception as e:
+            logger.exception("Request failed", method=method, path=path, error=str(e))
+            log_request_response(
+                method=method,
+                path=path,
+                status_code=500,
+                duration_ms=(time.perf_counter() - start_time) * 1000,
+                error=str(e),
+                client=client_host,
+                user_agent=headers.get("user-agent", "unknown"),
+            )
+            raise
+
+        else:
+            log_request_response(
+                method=method,
+                path=path,
+                status_code=status_code,
+                duration_ms=(time.perf_counter() - start_time) * 1000,
+                client=client_host,
+                user_agent=headers.get("user-agent", "unknown"),
+            )
+
+        finally:
+            # コンテキストをクリア
+            structlog.contextvars.clear_contextvars()
+
+    async def _send_rate_limited(self, send: Send, result: RateLimitResult) -> None:
+        """429レスポンスを送信"""
+        retry_after = max(math.ceil(result.retry_after), 1)
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(RATE_LIMIT_BODY)).encode()),
+                (b"retry-after", str(retry_after).encode()),
+                (b"x-ratelimit-reset", str(int(time.time()) + retry_after).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": RATE_LIMIT_BODY})
@@ -3,6 +3,7 @@ TechBridge 列挙型定義
 """
 
 from enum import Enum
+from typing import Optional
 
 
 class ProgressStatus(str, Enum):
@@ -109,4 +110,11 @@ class NotificationStatus(str, Enum):
     PENDING = "pending"     # 送信待ち
     SENT = "sent"          # 送信完了
     FAILED = "failed"      # 送信失敗
-    RETRYING = "retrying"  # リトライ中
\ No newline at end of file
+    RETRYING = "retrying"  # リトライ中
+    
+    @classmethod
+    def from_delivery(cls, delivered: Optional[bool]) -> 'NotificationStatus':
+        """送信結果から取得（Noneは結果がまだ分からない送信待ち）"""
+        if delivered is None:
+            return cls.PENDING
+        return cls.SENT if delivered else cls.FAILED
\ No newline at end of file
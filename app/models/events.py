@@ -0,0 +1,108 @@
+"""Append-only history models (status transitions and notifications)."""
+
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from sqlalchemy import JSON, BigInteger, DateTime, Enum as SQLEnum, Index, Integer, String, Text, func
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+from app.models.enums import EventType, NotificationStatus, ProgressStatus, WebhookSource
+
+# SQLiteではINTEGER PRIMARY KEYでないと自動採番されない
+EventId = BigInteger().with_variant(Integer(), "sqlite")
+EventMetadata = JSON().with_variant(JSONB(), "postgresql")
+
+
+def _isoformat(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value else None
+
+
+class WorkflowStatusEvent(Base):
+    """Status transition of a workflow item (append-only).
+
+    N番号への外部キーは持たない（アイテム削除後も履歴を残し、
+    PostgreSQLでは作成日時でのパーティション分割を可能にするため）。
+    """
+
+    __tablename__ = "workflow_status_events"
+
+    id: Mapped[int] = mapped_column(EventId, primary_key=True)
+    n_number: Mapped[str] = mapped_column(String(20))
+    event_type: Mapped[EventType] = mapped_column(SQLEnum(EventType), default=EventType.STATUS_CHANGE)
+    source: Mapped[WebhookSource] = mapped_column(SQLEnum(WebhookSource), default=WebhookSource.SYSTEM)
+    old_status: Mapped[Optional[ProgressStatus]] = mapped_column(SQLEnum(ProgressStatus))
+    new_status: Mapped[ProgressStatus] = mapped_column(SQLEnum(ProgressStatus))
+    changed_by: Mapped[Optional[str]] = mapped_column(String(100))
+    comment: Mapped[Optional[str]] = mapped_column(Text)
+    event_metadata: Mapped[Dict[str, Any]] = mapped_column(EventMetadata, default=dict)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+    )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "n_number": self.n_number,
+            "event_type": self.event_type.value,
+            "source": self.source.value,
+            "old_status": self.old_status.value if self.old_status else None,
+            "new_status": self.new_status.value,
+            "changed_by": self.changed_by,
+            "comment": self.comment,
+            "metadata": self.event_metadata or {},
+            "created_at": _isoformat(self.created_at),
+        }
+
+    def __repr__(self) -> str:
+        return f"<WorkflowStatusEvent(n_number={self.n_number}, {self.old_status} -> {self.new_status})>"
+
+
+class NotificationEvent(Base):
+    """Slack notification sent for a workflow item (append-only)."""
+
+    __tablename__ = "notification_events"
+
+    id: Mapped[int] = mapped_column(EventId, primary_key=True)
+    n_number: Mapped[str] = mapped_column(String(20))
+    event_type: Mapped[EventType] = mapped_column(SQLEnum(EventType), default=EventType.NOTIFICATION_SENT)
+    source: Mapped[WebhookSource] = mapped_column(SQLEnum(WebhookSource), default=WebhookSource.SYSTEM)
+    channel: Mapped[Optional[str]] = mapped_column(String(100))
+    status: Mapped[NotificationStatus] = mapped_column(SQLEnum(NotificationStatus), default=NotificationStatus.SENT)
+    workflow_status: Mapped[Optional[ProgressStatus]] = mapped_column(SQLEnum(ProgressStatus))
+    error_message: Mapped[Optional[str]] = mapped_column(Text)
+    event_metadata: Mapped[Dict[str, Any]] = mapped_column(EventMetadata, default=dict)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+    )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "n_number": self.n_number,
+            "event_type": self.event_type.value,
+            "source": self.source.value,
+            "channel": self.channel,
+            "status": self.status.value,
+            "workflow_status": self.workflow_status.value if self.workflow_status else None,
+            "error_message": self.error_message,
+            "metadata": self.event_metadata or {},
+            "created_at": _isoformat(self.created_at),
+        }
+
+    def __repr__(self) -> str:
+        return f"<NotificationEvent(n_number={self.n_number}, channel={self.channel}, status={self.status})>"
+
+
+# N番号ごとの履歴（新しい順）用の複合インデックス
+Index(
+    "ix_workflow_status_events_n_number_created_at",
+    WorkflowStatusEvent.n_number, WorkflowStatusEvent.created_at.desc(), WorkflowStatusEvent.id.desc(),
+)
+Index(
+    "ix_notification_events_n_number_created_at",
+    NotificationEvent.n_number, NotificationEvent.created_at.desc(), NotificationEvent.id.desc(),
+)
@@ -0,0 +1,141 @@
+"""Aggregate counters of workflow items (per status and editor)."""
+
+from typing import Dict, List
+
+from sqlalchemy import Enum as SQLEnum, Float, Integer, String, event
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+from app.models.enums import ProgressStatus
+
+# 担当編集者なしを表すキー（主キーにNULLは使えないため）
+UNASSIGNED = ""
+
+
+class WorkflowStatusStats(Base):
+    """Item counts and time-in-status totals per (status, assigned editor).
+
+    workflow_itemsのトリガーが挿入・削除・ステータス/担当変更のたびに
+    増減させるため、行数はステータス数×編集者数で頭打ちになり、
+    アイテム数に関係なく一定の時間で集計できる。
+    exit_count / total_seconds はそのステータスを抜けたアイテムの件数と
+    滞在時間の合計（平均滞在時間 = total_seconds / exit_count）。
+    """
+
+    __tablename__ = "workflow_status_stats"
+
+    status: Mapped[ProgressStatus] = mapped_column(SQLEnum(ProgressStatus), primary_key=True)
+    assigned_editor: Mapped[str] = mapped_column(String(50), primary_key=True, default=UNASSIGNED)
+    item_count: Mapped[int] = mapped_column(Integer, default=0)
+    exit_count: Mapped[int] = mapped_column(Integer, default=0)
+    total_seconds: Mapped[float] = mapped_column(Float, default=0.0)
+
+    def __repr__(self) -> str:
+        return f"<WorkflowStatusStats({self.status}, {self.assigned_editor!r}: {self.item_count})>"
+
+
+_SQLITE_UPSERT = """
+    INSERT INTO workflow_status_stats (status, assigned_editor, item_count, exit_count, total_seconds)
+    VALUES ({values})
+    ON CONFLICT (status, assigned_editor) DO UPDATE SET
+        item_count = item_count + excluded.item_count,
+        exit_count = exit_count + excluded.exit_count,
+        total_seconds = total_seconds + excluded.total_seconds;
+"""
+
+_SQLITE_STATUS_CHANGED = "OLD.status IS NOT NEW.status"
+
+# ダイアレクトごとのトリガー（テーブル作成後とマイグレーションで作成する）
+STATS_TRIGGERS: Dict[str, List[str]] = {
+    "sqlite": [
+        """
+        CREATE TRIGGER IF NOT EXISTS workflow_items_stats_insert AFTER INSERT ON workflow_items
+        BEGIN
+        """ + _SQLITE_UPSERT.format(values="NEW.status, COALESCE(NEW.assigned_editor, ''), 1, 0, 0") + """
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS workflow_items_stats_delete AFTER DELETE ON workflow_items
+        BEGIN
+        """ + _SQLITE_UPSERT.format(values="OLD.status, COALESCE(OLD.assigned_editor, ''), -1, 0, 0") + """
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS workflow_items_stats_update
+        AFTER UPDATE OF status, assigned_editor ON workflow_items
+        WHEN {_SQLITE_STATUS_CHANGED} OR OLD.assigned_editor IS NOT NEW.assigned_editor
+        BEGIN
+        """ + _SQLITE_UPSERT.format(values=f"""
+            OLD.status, COALESCE(OLD.assigned_editor, ''), -1,
+            CASE WHEN {_SQLITE_STATUS_CHANGED} THEN 1 ELSE 0 END,
+            CASE WHEN {_SQLITE_STATUS_CHANGED}
+                THEN (julianday('now') - julianday(OLD.status_changed_at)) * 86400.0 ELSE 0 END
+        """) + _SQLITE_UPSERT.format(values="NEW.status, COALESCE(NEW.assigned_editor, ''), 1, 0, 0") + f"""
+            UPDATE workflow_items SET status_changed_at = CURRENT_TIMESTAMP
+            WHERE id = NEW.id AND {_SQLITE_STATUS_CHANGED};
+        END
+        """,
+    ],
+    "postgresql": [
+        """
+        CREATE OR REPLACE FUNCTION workflow_items_track_status() RETURNS trigger AS $$
+        BEGIN
+            IF NEW.status IS DISTINCT FROM OLD.status THEN
+                NEW.status_changed_at := now();
+            END IF;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+        """,
+        # 変更前後の行は常に同じ順序でロックする（ステータスを入れ替える更新同士のデッドロック防止）
+        """
+        CREATE OR REPLACE FUNCTION workflow_items_update_stats() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO workflow_status_stats AS s (status, assigned_editor, item_count, exit_count, total_seconds)
+            SELECT * FROM (
+                SELECT OLD.status, COALESCE(OLD.assigned_editor, ''), -1,
+                       CASE WHEN TG_OP = 'UPDATE' AND NEW.status <> OLD.status THEN 1 ELSE 0 END,
+                       CASE WHEN TG_OP = 'UPDATE' AND NEW.status <> OLD.status
+                            THEN EXTRACT(EPOCH FROM now() - OLD.status_changed_at) ELSE 0 END
+                WHERE TG_OP <> 'INSERT'
+                UNION ALL
+                SELECT NEW.status, COALESCE(NEW.assigned_editor, ''), 1, 0, 0
+                WHERE TG_OP <> 'DELETE'
+            ) AS delta (status, assigned_editor, item_count, exit_count, total_seconds)
+            ORDER BY status, assigned_editor
+            ON CONFLICT (status, assigned_editor) DO UPDATE SET
+                item_count = s.item_count + EXCLUDED.item_count,
+                exit_count = s.exit_count + EXCLUDED.exit_count,
+                total_seconds = s.total_seconds + EXCLUDED.total_seconds;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """,
+        "DROP TRIGGER IF EXISTS workflow_items_track_status ON workflow_items",
+        """
+        CREATE TRIGGER workflow_items_track_status BEFORE UPDATE OF status ON workflow_items
+        FOR EACH ROW EXECUTE FUNCTION workflow_items_track_status()
+        """,
+        "DROP TRIGGER IF EXISTS workflow_items_stats_insert_delete ON workflow_items",
+        """
+        CREATE TRIGGER workflow_items_stats_insert_delete AFTER INSERT OR DELETE ON workflow_items
+        FOR EACH ROW EXECUTE FUNCTION workflow_items_update_stats()
+        """,
+        "DROP TRIGGER IF EXISTS workflow_items_stats_update ON workflow_items",
+        """
+        CREATE TRIGGER workflow_items_stats_update AFTER UPDATE OF status, assigned_editor ON workflow_items
+        FOR EACH ROW
+        WHEN (OLD.status IS DISTINCT FROM NEW.status OR OLD.assigned_editor IS DISTINCT FROM NEW.assigned_editor)
+        EXECUTE FUNCTION workflow_items_update_stats()
+        """,
+    ],
+}
+
+
+@event.listens_for(Base.metadata, "after_create")
+def create_stats_triggers(target, connection, **kw) -> None:
+    """create_all（テストと開発環境の初期化）でもトリガーを作成"""
+    if WorkflowStatusStats.__table__.name not in target.tables:
+        return
+    for statement in STATS_TRIGGERS.get(connection.dialect.name, []):
+        connection.exec_driver_sql(statement)
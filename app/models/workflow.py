@@ -4,7 +4,8 @@ from datetime import datetime
 from enum import Enum
 from typing import Any, Dict, Optional
 
-from sqlalchemy import JSON, DateTime, Enum as SQLEnum, String, func
+from sqlalchemy import JSON, DateTime, Enum as SQLEnum, Index, String, func
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.core.database import Base
@@ -29,10 +30,12 @@ class WorkflowItem(Base):
     status: Mapped[WorkflowStatus] = mapped_column(
         SQLEnum(WorkflowStatus),
         default=WorkflowStatus.DISCOVERED,
-        index=True,
     )
     assigned_editor: Mapped[Optional[str]] = mapped_column(String(50))
-    workflow_metadata: Mapped[Dict[str, Any]] = mapped_column(JSON, default=dict)
+    workflow_metadata: Mapped[Dict[str, Any]] = mapped_column(
+        JSON().with_variant(JSONB(), "postgresql"),
+        default=dict,
+    )
     
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
@@ -43,6 +46,41 @@ class WorkflowItem(Base):
         server_default=func.now(),
         onupdate=func.now(),
     )
+    # 現在のステータスになった日時（ステータス変更時にトリガーで更新）
+    status_changed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+    )
+    # 遅延アラートの期限（SLAのないステータス・アラート送信済みはNULL）
+    due_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
 
     def __repr__(self) -> str:
-        return f"<WorkflowItem(n_number={self.n_number}, status={self.status})>"
\ No newline at end of file
+        return f"<WorkflowItem(n_number={self.n_number}, status={self.status})>"
+
+
+# 一覧取得（フィルタ + updated_at DESC, id DESC）用の複合インデックス
+Index(
+    "ix_workflow_items_status_updated_at",
+    WorkflowItem.status, WorkflowItem.updated_at.desc(), WorkflowItem.id.desc(),
+)
+Index(
+    "ix_workflow_items_assigned_editor_updated_at",
+    WorkflowItem.assigned_editor, WorkflowItem.updated_at.desc(), WorkflowItem.id.desc(),
+)
+Index(
+    "ix_workflow_items_updated_at",
+    WorkflowItem.updated_at.desc(), WorkflowItem.id.desc(),
+)
+# 遅延アラートの期限切れ取得用（期限のあるアイテムのみ）
+Index(
+    "ix_workflow_items_due_at",
+    WorkflowItem.due_at,
+    postgresql_where=WorkflowItem.due_at.isnot(None),
+    sqlite_where=WorkflowItem.due_at.isnot(None),
+)
+# メタデータの包含検索（@>）用（PostgreSQLのみ）
+Index(
+    "ix_workflow_items_workflow_metadata",
+    WorkflowItem.workflow_metadata,
+    postgresql_using="gin",
+).ddl_if(dialect="postgresql")
@@ -1,6 +1,6 @@
 """Progress API schemas."""
 
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from datetime import datetime
 
 from pydantic import BaseModel, Field
@@ -51,13 +51,39 @@ class WorkflowItemResponse(WorkflowItemBase):
         from_attributes = True
 
 
+class EditorCount(BaseModel):
+    """Item count of an editor."""
+    
+    assigned_editor: Optional[str] = Field(None, description="担当編集者（未割り当てはnull）")
+    count: int
+
+
+class StatusEditorCount(EditorCount):
+    """Item count of a status and editor pair."""
+    
+    status: WorkflowStatus
+
+
+class ProgressStatsResponse(BaseModel):
+    """Schema for aggregate progress statistics."""
+    
+    total: int = Field(..., description="アイテム数")
+    by_status: Dict[str, int] = Field(..., description="ステータス別件数")
+    by_editor: List[EditorCount] = Field(..., description="担当編集者別件数")
+    by_status_editor: List[StatusEditorCount] = Field(..., description="ステータス×担当編集者別件数")
+    average_seconds_in_status: Dict[str, Optional[float]] = Field(
+        ..., description="ステータスの平均滞在時間（秒、そのステータスを抜けたアイテムのみ）"
+    )
+
+
 class WorkflowListResponse(BaseModel):
     """Schema for workflow list responses."""
     
     items: list[WorkflowItemResponse]
-    total: int
+    total: Optional[int] = None
     limit: int
     offset: int
+    next_cursor: Optional[str] = None
 
 
 class WorkflowStatusUpdate(BaseModel):
@@ -73,6 +99,49 @@ class EditorAssignment(BaseModel):
     editor: str
 
 
+class BulkFilter(BaseModel):
+    """Filter selecting the targets of a bulk update."""
+    
+    status: Optional[WorkflowStatus] = Field(None, description="ステータス")
+    assigned_editor: Optional[str] = Field(None, description="担当編集者")
+
+
+class BulkSelection(BaseModel):
+    """Targets of a bulk update: explicit N numbers or a filter (exactly one)."""
+    
+    n_numbers: Optional[List[str]] = Field(None, min_length=1, description="対象のN番号")
+    filter: Optional[BulkFilter] = Field(None, description="対象のフィルタ（n_numbersと同時には指定できない）")
+
+
+class BulkStatusUpdate(BulkSelection):
+    """Schema for bulk status updates."""
+    
+    status: WorkflowStatus
+
+
+class BulkEditorAssignment(BulkSelection):
+    """Schema for bulk editor assignments."""
+    
+    editor: str = Field(..., min_length=1, max_length=50)
+
+
+class BulkRejection(BaseModel):
+    """An item left unchanged because the transition is not allowed."""
+    
+    n_number: str
+    status: WorkflowStatus = Field(..., description="現在のステータス")
+
+
+class BulkUpdateResponse(BaseModel):
+    """Result of a bulk update."""
+    
+    updated: List[str] = Field(..., description="更新したN番号")
+    unchanged: List[str] = Field(..., description="すでに指定の値だったN番号")
+    rejected: List[BulkRejection] = Field(default_factory=list, description="遷移できないため更新しなかったアイテム")
+    not_found: List[str] = Field(default_factory=list, description="存在しないN番号")
+    notified: Optional[int] = Field(None, description="通知したアイテム数（ステータス更新のみ）")
+
+
 class ProgressResponse(BaseModel):
     """General progress response schema."""
     
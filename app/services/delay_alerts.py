@@ -0,0 +1,140 @@
+"""遅延アラート（F202）
+
+ステータスごとのSLA（DELAY_ALERT_SLA_HOURS）を超えて同じステータスにある
+アイテムをSlackに通知する。
+
+- 各アイテムは次の期限をdue_at（部分インデックス付き）に持つ。ステータスが
+  変わる書き込みで期限を計算し直し、SLAのないステータスではNULLにする
+- スケジューラは期限切れのアイテムだけをインデックス順に取り出し、
+  due_atをNULLにしてからアラートを送る（アイテム数によらず期限切れの件数分の処理）
+- 送信に失敗したアイテムはdue_atをretry_seconds後に設定し直し、その時点で
+  再送する（送信結果を待ちきれなかったものは送信待ちとして記録し、再送しない）
+- 取り出し・期限の再設定・アラートの記録は同じトランザクションで行い、
+  PostgreSQLではSKIP LOCKEDで複数ワーカーが同じアイテムを取り出さないようにする
+  （コミット前にプロセスが落ちた場合はロールバックされ、次の周期で再送される）
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Callable, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+import structlog
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.sla import status_sla
+from app.crud import workflow as workflow_crud
+from app.models.enums import NotificationStatus, WebhookSource
+from app.models.workflow import WorkflowItem
+from app.services.slack import SlackService
+
+logger = structlog.get_logger(__name__)
+
+
+class DelayAlertScheduler:
+    """期限切れのアイテムを定期的に取り出して遅延アラートを送る"""
+
+    def __init__(
+        self,
+        slack_service_factory: Callable[[], SlackService],
+        session_factory: async_sessionmaker[AsyncSession] = AsyncSessionLocal,
+        interval_seconds: float = 60.0,
+        batch_size: int = 100,
+        retry_seconds: float = 600.0,
+        clock: Callable[[], datetime] = datetime.utcnow
+    ):
+        self.slack_service_factory = slack_service_factory
+        self.session_factory = session_factory
+        self.interval_seconds = interval_seconds
+        self.batch_size = batch_size
+        self.retry_seconds = retry_seconds
+        self.clock = clock
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """スケジューラを起動"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="delay-alert-scheduler")
+            logger.info("Delay alert scheduler started", interval_seconds=self.interval_seconds)
+
+    async def stop(self) -> None:
+        """スケジューラを停止"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+            logger.info("Delay alert scheduler stopped")
+
+    async def run_once(self) -> List[WorkflowItem]:
+        """期限切れのアイテムを最大batch_size件取り出してアラートを送る"""
+        now = self.clock()
+        async with self.session_factory() as db:
+            items = await workflow_crud.pop_overdue_items(db, now, self.batch_size)
+            if not items:
+                return []
+
+            slack_service = self.slack_service_factory()
+            failed = [
+                item.id for item in items
+                if await self._alert(db, slack_service, item, now) is False
+            ]
+            await workflow_crud.reschedule_due_at(db, failed, now + timedelta(seconds=self.retry_seconds))
+            await db.commit()
+
+        logger.info("Delay alerts sent", count=len(items), failed=len(failed))
+        return items
+
+    async def _alert(
+        self, db: AsyncSession, slack_service: SlackService, item: WorkflowItem, now: datetime
+    ) -> Optional[bool]:
+        """アラートを送って記録し、送信結果（結果待ちはNone）を返す"""
+        changed_at = item.status_changed_at
+        if changed_at.tzinfo is not None:
+            changed_at = changed_at.astimezone(timezone.utc).replace(tzinfo=None)
+        elapsed = now - changed_at
+        try:
+            notified = await slack_service.send_delay_alert(
+                channel=item.slack_channel,
+                n_number=item.n_number,
+                title=item.title,
+                status=item.status,
+                elapsed=elapsed,
+                sla=status_sla(item.status)
+            )
+        except Exception as e:
+            logger.error("Failed to send delay alert", n_number=item.n_number, error=str(e))
+            notified = False
+
+        workflow_crud.add_notification_event(
+            db,
+            item.n_number,
+            item.slack_channel,
+            NotificationStatus.from_delivery(notified),
+            source=WebhookSource.SYSTEM,
+            workflow_status=item.status,
+            metadata={"alert": "delay", "elapsed_hours": round(elapsed.total_seconds() / 3600, 1)}
+        )
+        return notified
+
+    async def _run(self) -> None:
+        """メインループ（取り出しきれなかった場合は待たずに続ける）"""
+        while True:
+            try:
+                while len(await self.run_once()) >= self.batch_size:
+                    pass
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Delay alert scheduler error", error=str(e))
+            await asyncio.sleep(self.interval_seconds)
+
+
+def create_delay_alert_scheduler(slack_service_factory: Callable[[], SlackService]) -> DelayAlertScheduler:
+    """設定値からスケジューラを生成"""
+    return DelayAlertScheduler(
+        slack_service_factory=slack_service_factory,
+        interval_seconds=settings.DELAY_ALERT_INTERVAL_SECONDS,
+        batch_size=settings.DELAY_ALERT_BATCH_SIZE,
+        retry_seconds=settings.DELAY_ALERT_RETRY_SECONDS,
+    )
@@ -1,12 +1,17 @@
 """Google Sheets integration service."""
 
+import asyncio
+import functools
 import time
 import random
-from typing import Optional, Dict, Any
+import threading
+from typing import Optional, Dict, Any, Awaitable, Callable, Hashable, List
 from pathlib import Path
 
 from google.oauth2 import service_account
+from google_auth_httplib2 import AuthorizedHttp
 from googleapiclient.discovery import build
+import httplib2
 from googleapiclient.errors import HttpError
 import structlog
 
@@ -15,6 +20,218 @@ from app.core.exceptions import ExternalServiceError
 
 logger = structlog.get_logger(__name__)
 
+# N番号・リポジトリ名・チャンネル名を保持する範囲
+INDEX_RANGE = 'A1:D1000'
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+def retry_wait_time(attempt: int) -> float:
+    """リトライまでの待機時間（指数バックオフ + ジッター）"""
+    return (2 ** attempt) + random.uniform(0, 1)
+
+
+class _InFlightCall:
+    """実行中の呼び出し"""
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """同一キーの同時呼び出しを1回の実行にまとめる
+
+    先行する呼び出しの実行中に同じキーで呼ばれた場合は、新たに実行せず
+    その結果（または例外）を共有する。結果のオブジェクトは共有されるため、
+    呼び出し側で変更しないこと。
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _InFlightCall] = {}
+    
+    def do(self, key: Hashable, func: Callable[[], Any]) -> Any:
+        """キー単位で実行をまとめて結果を返す"""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                leader = False
+            else:
+                call = _InFlightCall()
+                self._calls[key] = call
+                leader = True
+        
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        
+        try:
+            call.result = func()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            if call.waiters:
+                logger.debug("Coalesced concurrent API calls", key=str(key), waiters=call.waiters)
+            call.done.set()
+
+
+# プロセス内の全GoogleSheetsServiceで共有する
+_sheets_single_flight = SingleFlight()
+
+
+class NCodeIndex:
+    """N番号 → 行番号・リポジトリ名・チャンネル名のインデックス
+
+    シート全体の取得は初回のみ同期で行い、TTL経過後は古いエントリを返しつつ
+    バックグラウンドスレッドで再読込する。
+    """
+    
+    def __init__(self, ttl_seconds: int, miss_refresh_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self.miss_refresh_seconds = miss_refresh_seconds
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._loaded_at: Optional[float] = None
+        self._load_lock = threading.Lock()
+        self._state_lock = threading.Lock()
+        self._refreshing = False
+    
+    @property
+    def is_loaded(self) -> bool:
+        """インデックスが読込済みか"""
+        return self._loaded_at is not None
+    
+    def is_stale(self) -> bool:
+        """TTLを過ぎているか"""
+        if self._loaded_at is None:
+            return True
+        return time.monotonic() - self._loaded_at >= self.ttl_seconds
+    
+    def lookup(
+        self,
+        n_code: str,
+        loader: Callable[[], List[list]]
+    ) -> Optional[Dict[str, Any]]:
+        """N番号のエントリを取得（未読込なら読込、期限切れなら裏で再読込）"""
+        if self.needs_reload(n_code):
+            self.refresh(loader)
+        elif self.is_stale():
+            self.refresh_in_background(loader)
+        
+        return self.get(n_code)
+    
+    def get(self, n_code: str) -> Optional[Dict[str, Any]]:
+        """読込済みのインデックスからエントリを取得（API呼び出しなし）"""
+        return self._entries.get(n_code.upper())
+    
+    def needs_reload(self, n_code: str) -> bool:
+        """参照前に読込が必要か
+
+        未読込の場合、または未ヒットかつ前回読込から一定時間経過している場合
+        （シートへの行追加を拾うため）に再読込する。
+        """
+        if self._loaded_at is None:
+            return True
+        if n_code.upper() in self._entries:
+            return False
+        return time.monotonic() - self._loaded_at >= self.miss_refresh_seconds
+    
+    def refresh(self, loader: Callable[[], List[list]]) -> None:
+        """シートを読み込んでインデックスを再構築"""
+        requested_at = time.monotonic()
+        with self._load_lock:
+            # 待機中に他のスレッドが読み込んでいれば再取得しない
+            if self._loaded_at is not None and self._loaded_at >= requested_at:
+                return
+            
+            self._replace(loader())
+    
+    def replace(self, values: List[list]) -> None:
+        """取得済みの行でインデックスを再構築"""
+        with self._load_lock:
+            self._replace(values)
+    
+    def _replace(self, values: List[list]) -> None:
+        self._entries = self._build(values)
+        self._loaded_at = time.monotonic()
+        logger.info("N-code index loaded", entries=len(self._entries))
+    
+    def invalidate(self) -> None:
+        """インデックスを破棄し、次回参照時に再読込させる"""
+        with self._load_lock:
+            self._entries = {}
+            self._loaded_at = None
+        logger.info("N-code index invalidated")
+    
+    def refresh_in_background(self, loader: Callable[[], List[list]]) -> None:
+        """バックグラウンドで再読込（同時に1つまで）"""
+        with self._state_lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        
+        def _run() -> None:
+            try:
+                self.refresh(loader)
+            except Exception as e:
+                logger.warning("N-code index refresh failed", error=str(e))
+            finally:
+                with self._state_lock:
+                    self._refreshing = False
+        
+        threading.Thread(target=_run, name="n-code-index-refresh", daemon=True).start()
+    
+    @staticmethod
+    def _build(values: List[list]) -> Dict[str, Dict[str, Any]]:
+        """シートの行からインデックスを構築"""
+        entries: Dict[str, Dict[str, Any]] = {}
+        
+        for row_idx, row in enumerate(values, start=1):
+            if not row:
+                continue
+            
+            key = str(row[0]).strip().upper()
+            # 同じN番号が複数行ある場合は先頭の行を優先（従来の線形探索と同じ）
+            if not key or key in entries:
+                continue
+            
+            repository_name = row[2].strip() if len(row) > 2 and row[2] else None
+            channel_name = row[3].strip() if len(row) > 3 and row[3] else None
+            
+            entries[key] = {
+                'row': row_idx,
+                'repository_name': repository_name,
+                'channel_name': channel_name or repository_name
+            }
+        
+        return entries
+
+
+_n_code_indexes: Dict[str, NCodeIndex] = {}
+_n_code_indexes_lock = threading.Lock()
+
+
+def get_n_code_index(sheet_id: str) -> NCodeIndex:
+    """シートIDごとのプロセス共有インデックスを取得"""
+    with _n_code_indexes_lock:
+        index = _n_code_indexes.get(sheet_id)
+        if index is None:
+            index = NCodeIndex(
+                ttl_seconds=settings.GOOGLE_SHEETS_INDEX_TTL_SECONDS,
+                miss_refresh_seconds=settings.GOOGLE_SHEETS_INDEX_MISS_REFRESH_SECONDS
+            )
+            _n_code_indexes[sheet_id] = index
+        return index
+
 
 class GoogleSheetsService:
     """Google Sheets API integration service."""
@@ -22,11 +239,14 @@ class GoogleSheetsService:
     def __init__(self):
         """Initialize Google Sheets service."""
         self.service = None
+        self.credentials = None
         self.sheet_id = settings.GOOGLE_SHEETS_ID
+        self._local = threading.local()
         
         if not self.sheet_id or self.sheet_id in ["YOUR_SHEET_ID_HERE", "your-sheet-id"]:
             raise ValueError("Google Sheets ID is not configured properly")
         
+        self.index = get_n_code_index(self.sheet_id)
         self._authenticate()
     
     def _authenticate(self):
@@ -50,6 +270,7 @@ class GoogleSheetsService:
             else:
                 raise ValueError("Invalid service account configuration")
             
+            self.credentials = credentials
             self.service = build('sheets', 'v4', credentials=credentials)
             logger.info("Google Sheets API authentication successful")
             
@@ -57,55 +278,66 @@ class GoogleSheetsService:
             logger.error("Google Sheets API authentication failed", error=str(e))
             raise ExternalServiceError(f"Google Sheets authentication failed: {e}")
     
+    def _http(self) -> AuthorizedHttp:
+        """スレッドごとのHTTPクライアントを取得
+
+        httplib2はスレッドセーフでないため、バックグラウンド再読込や
+        非同期ファサードのワーカースレッドごとに接続を分けて再利用する。
+        """
+        http = getattr(self._local, 'http', None)
+        if http is None:
+            http = AuthorizedHttp(self.credentials, http=httplib2.Http())
+            self._local.http = http
+        return http
+    
     def search_n_code(self, n_code: str) -> Optional[Dict[str, Any]]:
         """Search for N-code and return row information."""
-        return self._execute_with_retry(self._search_n_code_impl, n_code)
+        return self._search_n_code_impl(n_code)
     
     def _search_n_code_impl(self, n_code: str) -> Optional[Dict[str, Any]]:
         """Implementation of N-code search."""
         logger.info("Starting N-code search", n_code=n_code)
         
-        range_name = 'A1:D1000'
+        entry = self.index.lookup(n_code, self._load_index_rows)
+        return self._build_search_result(n_code, entry)
+    
+    def _build_search_result(
+        self,
+        n_code: str,
+        entry: Optional[Dict[str, Any]]
+    ) -> Optional[Dict[str, Any]]:
+        """インデックスのエントリから検索結果を構築"""
+        if not entry:
+            logger.warning("N-code not found", n_code=n_code)
+            return None
         
-        try:
-            result = self.service.spreadsheets().values().get(
-                spreadsheetId=self.sheet_id,
-                range=range_name
-            ).execute()
-        except HttpError as e:
-            logger.error("Google Sheets API error", error=str(e))
-            raise
+        if not entry['repository_name']:
+            logger.warning("No repository name in column C", row=entry['row'])
+            return None
         
-        values = result.get('values', [])
+        result_dict = {
+            'row': entry['row'],
+            'n_code': n_code,
+            'repository_name': entry['repository_name'],
+            'channel_name': entry['channel_name']
+        }
         
+        logger.info("N-code found", **result_dict)
+        return result_dict
+    
+    def _load_index_rows(self) -> List[list]:
+        """インデックス用にN番号の範囲を取得"""
+        result = self._get_values(INDEX_RANGE)
+        
+        values = result.get('values', [])
         if not values:
             logger.warning("No data found in spreadsheet")
-            return None
         
-        for row_idx, row in enumerate(values, start=1):
-            if row and len(row) > 0:
-                cell_value = str(row[0]).strip().upper()
-                if cell_value == n_code.upper():
-                    repository_name = row[2].strip() if len(row) > 2 and row[2] else None
-                    
-                    if not repository_name:
-                        logger.warning("No repository name in column C", row=row_idx)
-                        return None
-                    
-                    channel_name = row[3].strip() if len(row) > 3 and row[3] else None
-                    
-                    result_dict = {
-                        'row': row_idx,
-                        'n_code': n_code,
-                        'repository_name': repository_name,
-                        'channel_name': channel_name or repository_name
-                    }
-                    
-                    logger.info("N-code found", **result_dict)
-                    return result_dict
-        
-        logger.warning("N-code not found", n_code=n_code)
-        return None
+        return values
+    
+    def invalidate_index(self) -> None:
+        """N番号インデックスを破棄（シートの手動編集後などに使用）"""
+        self.index.invalidate()
     
     def _execute_with_retry(self, func, *args, max_retries: int = 3, **kwargs):
         """Execute function with retry."""
@@ -115,7 +347,7 @@ class GoogleSheetsService:
                 
             except HttpError as e:
                 if self._is_retryable_error(e) and attempt < max_retries:
-                    wait_time = (2 ** attempt) + random.uniform(0, 1)
+                    wait_time = retry_wait_time(attempt)
                     logger.warning("Retrying API call", attempt=attempt + 1, wait_time=wait_time)
                     time.sleep(wait_time)
                     continue
@@ -127,11 +359,46 @@ class GoogleSheetsService:
                 logger.error("Unexpected error", error=str(e))
                 raise
     
+    def _execute_read(self, key: Hashable, func: Callable[[], Any]) -> Any:
+        """読み取り系の呼び出しを同時実行分まとめてリトライ付きで実行"""
+        return _sheets_single_flight.do(
+            (self.sheet_id, key),
+            lambda: self._execute_with_retry(func)
+        )
+    
+    def _get_values(self, range_name: str) -> Dict[str, Any]:
+        """指定範囲の値を取得（同一範囲の同時読み取りは1回にまとめる）"""
+        return self._execute_read(
+            ('values.get', range_name),
+            lambda: self._fetch_values(range_name)
+        )
+    
+    def _fetch_values(self, range_name: str) -> Dict[str, Any]:
+        """values.getを1回実行"""
+        return self.service.spreadsheets().values().get(
+            spreadsheetId=self.sheet_id,
+            range=range_name
+        ).execute(http=self._http())
+    
+    def _update_value(self, range_name: str, value: str) -> Dict[str, Any]:
+        """values.updateを1回実行"""
+        return self.service.spreadsheets().values().update(
+            spreadsheetId=self.sheet_id,
+            range=range_name,
+            valueInputOption='RAW',
+            body={'values': [[value]]}
+        ).execute(http=self._http())
+    
+    def _fetch_metadata(self) -> Dict[str, Any]:
+        """spreadsheets.getを1回実行"""
+        return self.service.spreadsheets().get(
+            spreadsheetId=self.sheet_id
+        ).execute(http=self._http())
+    
     def _is_retryable_error(self, error: HttpError) -> bool:
         """Check if error is retryable."""
-        retryable_codes = {429, 500, 502, 503, 504}
         status_code = error.resp.status if error.resp else None
-        return status_code in retryable_codes
+        return status_code in RETRYABLE_STATUS_CODES
     
     def get_repository_name(self, n_code: str) -> Optional[str]:
         """Get repository name by N-code."""
@@ -158,9 +425,7 @@ class GoogleSheetsService:
     def test_connection(self) -> bool:
         """Test Google Sheets connection."""
         try:
-            sheet_metadata = self._execute_with_retry(
-                lambda: self.service.spreadsheets().get(spreadsheetId=self.sheet_id).execute()
-            )
+            sheet_metadata = self._execute_read(('spreadsheets.get',), self._fetch_metadata)
             
             sheet_title = sheet_metadata.get('properties', {}).get('title', 'Unknown')
             logger.info("Connection test successful", sheet_title=sheet_title)
@@ -181,12 +446,7 @@ class GoogleSheetsService:
         range_name = f'{column}{row}'
         
         try:
-            result = self._execute_with_retry(
-                lambda: self.service.spreadsheets().values().get(
-                    spreadsheetId=self.sheet_id,
-                    range=range_name
-                ).execute()
-            )
+            result = self._get_values(range_name)
             
             values = result.get('values', [[]])
             if values and len(values[0]) > 0:
@@ -212,16 +472,14 @@ class GoogleSheetsService:
         range_name = f'{column}{row}'
         
         try:
-            self._execute_with_retry(
-                lambda: self.service.spreadsheets().values().update(
-                    spreadsheetId=self.sheet_id,
-                    range=range_name,
-                    valueInputOption='RAW',
-                    body={'values': [[value]]}
-                ).execute()
-            )
+            self._execute_with_retry(self._update_value, range_name, value)
             
             logger.info("Cell write successful", n_code=n_code, column=column, row=row, value=value)
+            
+            # インデックス対象の列を書き換えた場合は再読込させる
+            if column.upper() in ('A', 'B', 'C', 'D'):
+                self.invalidate_index()
+            
             return True
             
         except Exception as e:
@@ -279,4 +537,164 @@ class GoogleSheetsService:
             "test_value": test_value,
             "written_value": written_value,
             "restored": restore_success
-        }
\ No newline at end of file
+        }
+
+
+class AsyncSingleFlight:
+    """同一キーの同時コルーチン呼び出しを1回の実行にまとめる（SingleFlightの非同期版）
+
+    実行は専用のタスクで行い、呼び出し元はshieldして待つ。最初の呼び出し元が
+    キャンセルされても実行は続き、他の待機者は結果を受け取れる。
+    """
+    
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+    
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        """キー単位で実行をまとめて結果を返す"""
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        return await asyncio.shield(task)
+    
+    def _finish(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # 待機者が全員キャンセルされた場合に未取得例外の警告を出さない
+        if not task.cancelled():
+            task.exception()
+
+
+_sheets_async_single_flight = AsyncSingleFlight()
+
+
+class AsyncGoogleSheetsService:
+    """GoogleSheetsServiceの非同期ファサード
+
+    API呼び出しはスレッドプールで実行し、リトライ待機はasyncio.sleepで行うため
+    イベントループをブロックしない。N番号インデックスは同期版と共有する。
+    """
+    
+    def __init__(self, sheets_service: GoogleSheetsService, max_retries: int = 3):
+        self.sync = sheets_service
+        self.sheet_id = sheets_service.sheet_id
+        self.index = sheets_service.index
+        self.max_retries = max_retries
+    
+    async def search_n_code(self, n_code: str) -> Optional[Dict[str, Any]]:
+        """Search for N-code and return row information."""
+        logger.info("Starting N-code search", n_code=n_code)
+        
+        if self.index.needs_reload(n_code):
+            await _sheets_async_single_flight.do(
+                (self.sheet_id, 'index.load'),
+                self._reload_index
+            )
+        elif self.index.is_stale():
+            self.index.refresh_in_background(self.sync._load_index_rows)
+        
+        return self.sync._build_search_result(n_code, self.index.get(n_code))
+    
+    async def get_workflow_info(self, n_code: str) -> Optional[Dict[str, str]]:
+        """Get workflow information by N-code."""
+        result = await self.search_n_code(n_code)
+        if not result:
+            return None
+        
+        return {
+            'n_code': n_code,
+            'repository_name': result['repository_name'],
+            'slack_channel': result['repository_name']  # リポジトリ名と同名のチャンネル
+        }
+    
+    async def read_cell(self, n_code: str, column: str = 'G') -> Optional[str]:
+        """指定したN番号の行の指定列を読み取り"""
+        result = await self.search_n_code(n_code)
+        if not result:
+            logger.warning("N-code not found for reading", n_code=n_code)
+            return None
+        
+        row = result['row']
+        range_name = f'{column}{row}'
+        
+        try:
+            result = await self._get_values(range_name)
+            
+            values = result.get('values', [[]])
+            if values and len(values[0]) > 0:
+                cell_value = values[0][0]
+                logger.info("Cell read successful", n_code=n_code, column=column, row=row, value=cell_value)
+                return cell_value
+            else:
+                logger.info("Cell is empty", n_code=n_code, column=column, row=row)
+                return ""
+                
+        except Exception as e:
+            logger.error("Failed to read cell", n_code=n_code, column=column, row=row, error=str(e))
+            return None
+    
+    async def write_cell(self, n_code: str, value: str, column: str = 'G') -> bool:
+        """指定したN番号の行の指定列に値を書き込み"""
+        result = await self.search_n_code(n_code)
+        if not result:
+            logger.warning("N-code not found for writing", n_code=n_code)
+            return False
+        
+        row = result['row']
+        range_name = f'{column}{row}'
+        
+        try:
+            await self._execute_with_retry(self.sync._update_value, range_name, value)
+            
+            logger.info("Cell write successful", n_code=n_code, column=column, row=row, value=value)
+            
+            # インデックス対象の列を書き換えた場合は再読込させる
+            if column.upper() in ('A', 'B', 'C', 'D'):
+                self.sync.invalidate_index()
+            
+            return True
+            
+        except Exception as e:
+            logger.error("Failed to write cell", n_code=n_code, column=column, row=row, value=value, error=str(e))
+            return False
+    
+    async def _reload_index(self) -> None:
+        """インデックスを非同期に再読込"""
+        result = await self._get_values(INDEX_RANGE)
+        
+        values = result.get('values', [])
+        if not values:
+            logger.warning("No data found in spreadsheet")
+        
+        self.index.replace(values)
+    
+    async def _get_values(self, range_name: str) -> Dict[str, Any]:
+        """指定範囲の値を取得（同一範囲の同時読み取りは1回にまとめる）"""
+        return await _sheets_async_single_flight.do(
+            (self.sheet_id, 'values.get', range_name),
+            lambda: self._execute_with_retry(self.sync._fetch_values, range_name)
+        )
+    
+    async def _execute_with_retry(self, func: Callable[..., Any], *args: Any) -> Any:
+        """スレッドプールで実行し、リトライ待機はasyncio.sleepで行う"""
+        loop = asyncio.get_running_loop()
+        
+        for attempt in range(self.max_retries + 1):
+            try:
+                return await loop.run_in_executor(None, functools.partial(func, *args))
+                
+            except HttpError as e:
+                if self.sync._is_retryable_error(e) and attempt < self.max_retries:
+                    wait_time = retry_wait_time(attempt)
+                    logger.warning("Retrying API call", attempt=attempt + 1, wait_time=wait_time)
+                    await asyncio.sleep(wait_time)
+                    continue
+                else:
+                    logger.error("API call failed", error=str(e))
+                    raise
+                    
+            except Exception as e:
+                logger.error("Unexpected error", error=str(e))
+                raise
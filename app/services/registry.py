@@ -0,0 +1,49 @@
+"""共有サービスクライアントのレジストリ"""
+
+from typing import Optional
+
+import structlog
+
+from app.core.config import settings
+from app.services.google_sheets import GoogleSheetsService
+from app.services.slack import SlackService
+
+logger = structlog.get_logger(__name__)
+
+
+class ServiceRegistry:
+    """プロセス内で共有する外部サービスクライアント
+
+    アプリケーションのlifespanで一度だけ生成し、FastAPIの依存性
+    （app.core.deps.get_slack_service など）経由で各エンドポイントに渡す。
+    サービスアカウントキーの解析や認証をリクエストごとに行わないためのもの。
+    """
+    
+    def __init__(self):
+        self._slack_service: Optional[SlackService] = None
+    
+    def startup(self) -> None:
+        """クライアントを生成"""
+        self.get_slack_service()
+        logger.info(
+            "Service clients initialized",
+            sheets_available=self.get_sheets_service() is not None
+        )
+    
+    def shutdown(self) -> None:
+        """クライアントを破棄"""
+        self._slack_service = None
+    
+    def get_slack_service(self) -> SlackService:
+        """共有SlackServiceを取得（lifespan外では初回呼び出し時に生成）"""
+        if self._slack_service is None:
+            self._slack_service = SlackService(settings.SLACK_BOT_TOKEN)
+        return self._slack_service
+    
+    def get_sheets_service(self) -> Optional[GoogleSheetsService]:
+        """共有GoogleSheetsServiceを取得（未設定・認証失敗時はNone）"""
+        return self.get_slack_service().sheets_service
+
+
+# プロセス内で共有するレジストリ
+services = ServiceRegistry()
@@ -1,6 +1,7 @@
 """Slackサービス"""
 
-from typing import Optional, Dict, Any
+from datetime import timedelta
+from typing import Optional, Dict, Any, List, Tuple
 import asyncio
 import time
 
@@ -9,7 +10,12 @@ from slack_sdk.errors import SlackApiError
 import structlog
 
 from app.models.enums import ProgressStatus as WorkflowStatus
-from app.services.google_sheets import GoogleSheetsService
+from app.core.config import settings
+from app.services.google_sheets import AsyncGoogleSheetsService, GoogleSheetsService
+from app.services.slack_coalescer import NotificationCoalescer, PendingNotification
+from app.services.slack_dispatcher import SlackDispatcher, create_slack_dispatcher
+from app.services.slack_templates import render_completion, render_delay_alert, render_status_digest, render_status_update
+from app.services.slack_channel_cache import SlackChannelCache, channel_cache as default_channel_cache
 
 logger = structlog.get_logger(__name__)
 
@@ -17,11 +23,31 @@ logger = structlog.get_logger(__name__)
 class SlackService:
     """Slack API操作サービス"""
     
-    def __init__(self, token: str):
+    def __init__(
+        self,
+        token: str,
+        channel_cache: Optional[SlackChannelCache] = None,
+        dispatcher: Optional[SlackDispatcher] = None,
+        coalesce_window_seconds: Optional[float] = None
+    ):
         self.client = WebClient(token=token)
+        self.dispatcher = dispatcher or create_slack_dispatcher(token)
+        
+        # ステータス通知のまとめ送信（0なら無効）
+        if coalesce_window_seconds is None:
+            coalesce_window_seconds = settings.SLACK_COALESCE_WINDOW_SECONDS
+        self.coalescer = None
+        if coalesce_window_seconds > 0:
+            self.coalescer = NotificationCoalescer(coalesce_window_seconds, self._send_coalesced)
+        self.digest_max_items = settings.SLACK_DIGEST_MAX_ITEMS
+        self.result_timeout_seconds = settings.SLACK_DISPATCH_RESULT_TIMEOUT_SECONDS
+        
+        self.channel_cache = channel_cache or default_channel_cache
         self.sheets_service = None
+        self.async_sheets_service = None
         try:
             self.sheets_service = GoogleSheetsService()
+            self.async_sheets_service = AsyncGoogleSheetsService(self.sheets_service)
         except Exception as e:
             logger.warning("Google Sheets service initialization failed", error=str(e))
     
@@ -46,33 +72,63 @@ class SlackService:
         logger.warning("Using default channel", n_number=n_number, default=default_channel)
         return default_channel
     
+    async def resolve_channel_name_async(self, n_number: str, default_channel: str = "#general") -> str:
+        """N番号からSlackチャンネル名を解決（イベントループをブロックしない）"""
+        if not self.async_sheets_service:
+            logger.warning("Google Sheets service not available, using default channel")
+            return default_channel
+        
+        try:
+            workflow_info = await self.async_sheets_service.get_workflow_info(n_number)
+            if workflow_info and workflow_info.get('slack_channel'):
+                channel_name = workflow_info['slack_channel']
+                # チャンネル名が#で始まっていない場合は追加
+                if not channel_name.startswith('#'):
+                    channel_name = f"#{channel_name}"
+                logger.info("Resolved channel name", n_number=n_number, channel=channel_name)
+                return channel_name
+        except Exception as e:
+            logger.error("Failed to resolve channel name", n_number=n_number, error=str(e))
+        
+        logger.warning("Using default channel", n_number=n_number, default=default_channel)
+        return default_channel
+    
     def get_channel_id(self, channel_name: str) -> Optional[str]:
         """チャンネル名からチャンネルIDを取得"""
+        # #記号を除去
+        clean_channel_name = channel_name.lstrip('#')
+        
+        channel_id = self.channel_cache.get(clean_channel_name)
+        if channel_id:
+            return channel_id
+        
         try:
-            # #記号を除去
-            clean_channel_name = channel_name.lstrip('#')
+            return self._find_channel_id(clean_channel_name)
             
-            # プライベートチャンネル一覧を取得（ページネーション対応）
-            all_channels = []
-            cursor = None
+        except SlackApiError as e:
+            logger.error("Failed to get channel ID", channel_name=channel_name, error=str(e))
+            return None
+        finally:
+            self.channel_cache.save()
+    
+    def _find_channel_id(self, clean_channel_name: str) -> Optional[str]:
+        """チャンネル一覧をページングして検索（見つかった時点で打ち切り）"""
+        cursor = None
+        
+        while True:
+            # プライベートチャンネル一覧を取得
+            params = {
+                "types": "private_channel",
+                "limit": 1000
+            }
+            if cursor:
+                params["cursor"] = cursor
             
-            while True:
-                params = {
-                    "types": "private_channel",
-                    "limit": 1000
-                }
-                if cursor:
-                    params["cursor"] = cursor
-                
-                result = self.client.conversations_list(**params)
-                channels = result.get("channels", [])
-                all_channels.extend(channels)
-                
-                cursor = result.get("response_metadata", {}).get("next_cursor")
-                if not cursor:
-                    break
+            result = self.client.conversations_list(**params)
+            channels = result.get("channels", [])
             
-            channels = all_channels
+            # 取得したページのチャンネルはまとめてキャッシュに登録
+            self.channel_cache.update(channels)
             
             # チャンネル名でマッチング（Botが参加しているもののみ）
             for channel in channels:
@@ -80,18 +136,25 @@ class SlackService:
                     logger.info("Found channel ID", name=clean_channel_name, id=channel["id"])
                     return channel["id"]
             
-            logger.warning("Channel not found", name=clean_channel_name)
-            return None
-            
-        except SlackApiError as e:
-            logger.error("Failed to get channel ID", channel_name=channel_name, error=str(e))
-            return None
+            cursor = result.get("response_metadata", {}).get("next_cursor")
+            if not cursor:
+                break
+        
+        self.channel_cache.discard(clean_channel_name)
+        logger.warning("Channel not found", name=clean_channel_name)
+        return None
     
     def resolve_channel_id(self, n_number: str, default_channel: str = "#general") -> Optional[str]:
         """N番号からSlackチャンネルIDを解決"""
         channel_name = self.resolve_channel_name(n_number, default_channel)
         return self.get_channel_id(channel_name)
     
+    async def resolve_channel_id_async(self, n_number: str, default_channel: str = "#general") -> Optional[str]:
+        """N番号からSlackチャンネルIDを解決（イベントループをブロックしない）"""
+        channel_name = await self.resolve_channel_name_async(n_number, default_channel)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.get_channel_id, channel_name)
+    
     async def send_status_update(
         self,
         channel: str,
@@ -100,112 +163,149 @@ class SlackService:
         old_status: Optional[WorkflowStatus],
         new_status: WorkflowStatus,
         auto_resolve_channel: bool = True
-    ) -> bool:
-        """ステータス更新通知を送信"""
+    ) -> Optional[bool]:
+        """ステータス更新通知を送信（まとめ送信中は結果が分からないためNone）"""
         # チャンネルIDの自動解決
         if auto_resolve_channel and n_number:
-            resolved_channel_id = self.resolve_channel_id(n_number, channel)
-            if resolved_channel_id:
-                logger.info("Channel ID resolved", original=channel, resolved_id=resolved_channel_id)
-                channel = resolved_channel_id
-            else:
-                # フォールバック: チャンネル名を使用
-                resolved_channel = self.resolve_channel_name(n_number, channel)
-                if resolved_channel != channel:
-                    logger.info("Channel name resolved", original=channel, resolved=resolved_channel)
-                    channel = resolved_channel
-        
-        # ステータスを日本語に変換
-        status_ja = {
-            WorkflowStatus.DISCOVERED: "🔍 発見",
-            WorkflowStatus.PURCHASED: "💰 購入完了",
-            WorkflowStatus.MANUSCRIPT_REQUESTED: "✍️ 原稿依頼",
-            WorkflowStatus.MANUSCRIPT_RECEIVED: "📄 原稿受領",
-            WorkflowStatus.FIRST_PROOF: "📝 初校",
-            WorkflowStatus.SECOND_PROOF: "✏️ 再校",
-            WorkflowStatus.COMPLETED: "✅ 完成"
-        }
-        
-        old_status_text = status_ja.get(old_status, old_status.value) if old_status else "なし"
-        new_status_text = status_ja.get(new_status, new_status.value)
-        
-        # メッセージを構築
-        blocks = [
-            {
-                "type": "header",
-                "text": {
-                    "type": "plain_text",
-                    "text": f"📊 進捗更新: {n_number}"
-                }
-            },
-            {
-                "type": "section",
-                "fields": [
-                    {
-                        "type": "mrkdwn",
-                        "text": f"*タイトル:*\n{title}"
-                    },
-                    {
-                        "type": "mrkdwn",
-                        "text": f"*N番号:*\n{n_number}"
-                    },
-                    {
-                        "type": "mrkdwn",
-                        "text": f"*変更前:*\n{old_status_text}"
-                    },
-                    {
-                        "type": "mrkdwn",
-                        "text": f"*変更後:*\n{new_status_text}"
-                    }
-                ]
-            }
-        ]
-        
-        # 特定のステータスに応じた追加メッセージ
-        if new_status == WorkflowStatus.MANUSCRIPT_REQUESTED:
-            blocks.append({
-                "type": "section",
-                "text": {
-                    "type": "mrkdwn",
-                    "text": "📮 *著者への原稿依頼をお忘れなく！*"
-                }
-            })
-        elif new_status == WorkflowStatus.COMPLETED:
-            blocks.append({
-                "type": "section",
-                "text": {
-                    "type": "mrkdwn",
-                    "text": "🎉 *お疲れさまでした！編集作業が完了しました。*"
-                }
-            })
+            channel = await self._resolve_notification_channel(n_number, channel)
         
-        try:
-            # 非同期実行のため、同期メソッドを別スレッドで実行
-            loop = asyncio.get_event_loop()
-            result = await loop.run_in_executor(
-                None,
-                self._send_message,
-                channel,
-                f"進捗更新: {n_number} - {new_status_text}",
-                blocks
-            )
-            
+        if self.coalescer is not None:
+            # ウィンドウ内の連続した遷移は1通にまとめて送信
+            await self.coalescer.add(channel, n_number, title, old_status, new_status)
+            return None
+        
+        return await self._post_status_update(channel, n_number, title, [old_status, new_status])
+    
+    async def send_status_updates(
+        self,
+        updates: List[Tuple[str, str, str, Optional[WorkflowStatus], WorkflowStatus]]
+    ) -> Dict[str, Optional[bool]]:
+        """複数アイテムのステータス更新通知をまとめて送信（一括更新用）
+        
+        updatesは(チャンネル, N番号, タイトル, 変更前, 変更後)のリスト。
+        チャンネルごとに1件なら通常の通知、複数ならダイジェストとして送信キューに
+        積む（まとめ送信のウィンドウは待たない）。戻り値はN番号ごとの送信結果
+        （_deliverと同じくNoneは結果待ち）。
+        """
+        pending: Dict[str, Dict[str, PendingNotification]] = {}
+        for channel, n_number, title, old_status, new_status in updates:
+            channel = await self._resolve_notification_channel(n_number, channel)
+            notifications = pending.setdefault(channel, {})
+            notification = notifications.get(n_number)
+            if notification is None:
+                notification = notifications[n_number] = PendingNotification(n_number, title, old_status)
+            notification.add(title, new_status)
+        
+        # 先にすべてキューに積み、送信結果はまとめて待つ
+        chunks: List[List[PendingNotification]] = []
+        posts = []
+        for channel, notifications in pending.items():
+            batch = list(notifications.values())
+            if len(batch) == 1:
+                notification = batch[0]
+                chunks.append(batch)
+                posts.append(self._post_status_update(
+                    channel, notification.n_number, notification.title, notification.path
+                ))
+                continue
+            for start in range(0, len(batch), self.digest_max_items):
+                chunk = batch[start:start + self.digest_max_items]
+                chunks.append(chunk)
+                posts.append(self._post_digest(channel, chunk))
+        
+        results: Dict[str, Optional[bool]] = {}
+        for chunk, delivered in zip(chunks, await asyncio.gather(*posts)):
+            results.update((notification.n_number, delivered) for notification in chunk)
+        
+        logger.info("Sent bulk status update notifications", items=len(results), channels=len(pending))
+        return results
+    
+    async def _resolve_notification_channel(self, n_number: str, channel: str) -> str:
+        """N番号から通知先のチャンネルIDを解決（なければチャンネル名）"""
+        resolved_channel_id = await self.resolve_channel_id_async(n_number, channel)
+        if resolved_channel_id:
+            logger.info("Channel ID resolved", original=channel, resolved_id=resolved_channel_id)
+            return resolved_channel_id
+        
+        # フォールバック: チャンネル名を使用
+        resolved_channel = await self.resolve_channel_name_async(n_number, channel)
+        if resolved_channel != channel:
+            logger.info("Channel name resolved", original=channel, resolved=resolved_channel)
+        return resolved_channel
+    
+    async def flush_notifications(self) -> None:
+        """まとめ待ちの通知をすべて送信"""
+        if self.coalescer is not None:
+            await self.coalescer.flush_all()
+    
+    async def _send_coalesced(self, channel: str, notifications: List[PendingNotification]) -> None:
+        """まとめた通知を送信（1件なら通常の通知、複数ならダイジェスト）"""
+        if len(notifications) == 1:
+            notification = notifications[0]
+            await self._post_status_update(channel, notification.n_number, notification.title, notification.path)
+            return
+        
+        for start in range(0, len(notifications), self.digest_max_items):
+            await self._post_digest(channel, notifications[start:start + self.digest_max_items])
+    
+    async def _post_status_update(
+        self,
+        channel: str,
+        n_number: str,
+        title: str,
+        path: List[Optional[WorkflowStatus]]
+    ) -> Optional[bool]:
+        """ステータス更新通知を送信（pathは変更前から変更後までの遷移）"""
+        new_status = path[-1]
+        text, blocks = render_status_update(n_number, title, path)
+        
+        delivered = await self._deliver(channel, text, blocks)
+        if delivered:
             logger.info(
                 "Sent status update notification",
                 channel=channel,
                 n_number=n_number,
                 status=new_status.value
             )
-            
+        return delivered
+    
+    async def _post_digest(self, channel: str, notifications: List[PendingNotification]) -> Optional[bool]:
+        """複数アイテムのステータス更新を1通のダイジェストとして送信"""
+        text, blocks = render_status_digest([
+            (notification.n_number, notification.title, notification.path)
+            for notification in notifications
+        ])
+        
+        delivered = await self._deliver(channel, text, blocks)
+        if delivered:
+            logger.info("Sent status update digest", channel=channel, items=len(notifications))
+        return delivered
+    
+    async def _deliver(self, channel: str, text: str, blocks: List[Dict[str, Any]]) -> Optional[bool]:
+        """レート制限を考慮して送信キューに積み、送信結果を待つ
+        
+        送信できればTrue、失敗すればFalse、result_timeout_seconds以内に
+        結果が分からなければNone（送信待ち）を返す。
+        """
+        try:
+            future = await self.dispatcher.submit("chat.postMessage", channel=channel, text=text, blocks=blocks)
+            done, _ = await asyncio.wait({future}, timeout=self.result_timeout_seconds)
+            if not done:
+                logger.warning("Slack delivery result timed out", channel=channel)
+                return None
+            future.result()
             return True
-            
         except SlackApiError as e:
             logger.error(
                 "Failed to send Slack notification",
+                channel=channel,
                 error=str(e),
                 response=e.response
             )
             return False
+        except Exception as e:
+            logger.error("Failed to send Slack notification", channel=channel, error=str(e))
+            return False
     
     async def send_completion_notification(
         self,
@@ -214,121 +314,43 @@ class SlackService:
         repository_name: str,
         workflow_metadata: Dict[str, Any],
         auto_resolve_channel: bool = True
-    ) -> bool:
+    ) -> Optional[bool]:
         """完了通知を送信"""
-        # チャンネルIDの自動解決
         if auto_resolve_channel and n_number:
-            resolved_channel_id = self.resolve_channel_id(n_number, channel)
-            if resolved_channel_id:
-                logger.info("Channel ID resolved for completion", original=channel, resolved_id=resolved_channel_id)
-                channel = resolved_channel_id
-            else:
-                # フォールバック: チャンネル名を使用
-                resolved_channel = self.resolve_channel_name(n_number, channel)
-                if resolved_channel != channel:
-                    logger.info("Channel name resolved for completion", original=channel, resolved=resolved_channel)
-                    channel = resolved_channel
-        
-        # メッセージを構築
-        blocks = [
-            {
-                "type": "header",
-                "text": {
-                    "type": "plain_text",
-                    "text": f"🎉 制作完了: {n_number}"
-                }
-            },
-            {
-                "type": "section",
-                "fields": [
-                    {
-                        "type": "mrkdwn",
-                        "text": f"*N番号:*\n{n_number}"
-                    },
-                    {
-                        "type": "mrkdwn",
-                        "text": f"*リポジトリ:*\n{repository_name}"
-                    }
-                ]
-            }
-        ]
+            channel = await self._resolve_notification_channel(n_number, channel)
         
-        # メタデータから追加情報を抽出
-        if workflow_metadata:
-            additional_fields = []
-            
-            if "pages" in workflow_metadata:
-                additional_fields.append({
-                    "type": "mrkdwn",
-                    "text": f"*ページ数:*\n{workflow_metadata['pages']}ページ"
-                })
-            
-            if "format" in workflow_metadata:
-                additional_fields.append({
-                    "type": "mrkdwn",
-                    "text": f"*フォーマット:*\n{workflow_metadata['format']}"
-                })
-            
-            if "completed_by" in workflow_metadata:
-                additional_fields.append({
-                    "type": "mrkdwn",
-                    "text": f"*完了者:*\n{workflow_metadata['completed_by']}"
-                })
-            
-            if additional_fields:
-                blocks.append({
-                    "type": "section",
-                    "fields": additional_fields[:2]  # 最大2フィールド
-                })
-        
-        blocks.append({
-            "type": "section",
-            "text": {
-                "type": "mrkdwn",
-                "text": "✨ *技術の泉シリーズの制作が完了しました！*\n最終確認をお願いします。"
-            }
-        })
+        text, blocks = render_completion(n_number, repository_name, workflow_metadata)
         
-        try:
-            # 非同期実行のため、同期メソッドを別スレッドで実行
-            loop = asyncio.get_event_loop()
-            result = await loop.run_in_executor(
-                None,
-                self._send_message,
-                channel,
-                f"制作完了: {n_number} - {repository_name}",
-                blocks
-            )
-            
+        delivered = await self._deliver(channel, text, blocks)
+        if delivered:
             logger.info(
                 "Sent completion notification",
                 channel=channel,
                 n_number=n_number,
                 repository_name=repository_name
             )
-            
-            return True
-            
-        except SlackApiError as e:
-            logger.error(
-                "Failed to send Slack notification",
-                error=str(e),
-                response=e.response
-            )
-            return False
+        return delivered
     
-    def _send_message(
+    async def send_delay_alert(
         self,
         channel: str,
-        text: str,
-        blocks: Optional[list] = None
-    ) -> dict:
-        """同期的にメッセージを送信（内部使用）"""
-        return self.client.chat_postMessage(
-            channel=channel,
-            text=text,
-            blocks=blocks
-        )
+        n_number: str,
+        title: str,
+        status: WorkflowStatus,
+        elapsed: timedelta,
+        sla: Optional[timedelta],
+        auto_resolve_channel: bool = True
+    ) -> Optional[bool]:
+        """遅延アラートを送信"""
+        if auto_resolve_channel and n_number:
+            channel = await self._resolve_notification_channel(n_number, channel)
+        
+        text, blocks = render_delay_alert(n_number, title, status, elapsed, sla)
+        
+        delivered = await self._deliver(channel, text, blocks)
+        if delivered:
+            logger.info("Sent delay alert", channel=channel, n_number=n_number, status=status.value)
+        return delivered
     
     def post_test_message(self, channel: str, message: str = "🧪 TechBridge API Test Message") -> Optional[Dict[str, Any]]:
         """テストメッセージを投稿"""
@@ -0,0 +1,137 @@
+"""Slackチャンネルディレクトリキャッシュ（チャンネル名 → チャンネルID）"""
+
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+import json
+import os
+import threading
+
+import structlog
+
+from app.core.config import settings
+
+logger = structlog.get_logger(__name__)
+
+
+class SlackChannelCache:
+    """チャンネル名 → チャンネルIDのキャッシュ
+
+    メモリ上のマップをJSONファイルのスナップショットで永続化する。
+    各エントリは最後に確認した日時（last_checked）を持ち、TTLを過ぎた
+    エントリは未登録と同様に扱われ、呼び出し側でAPIから再確認される。
+    """
+
+    def __init__(self, path: str, ttl_seconds: int):
+        self.path = Path(path)
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self._channels: Dict[str, Dict[str, Any]] = {}
+        self._loaded = False
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def load(self) -> None:
+        """スナップショットファイルを読み込む"""
+        with self._lock:
+            if self._loaded:
+                return
+            self._loaded = True
+
+            if not self.path.exists():
+                return
+
+            try:
+                data = json.loads(self.path.read_text(encoding="utf-8"))
+            except (OSError, ValueError) as e:
+                logger.warning("Failed to load Slack channel cache", path=str(self.path), error=str(e))
+                return
+
+            for name, entry in data.get("channels", {}).items():
+                if isinstance(entry, dict) and entry.get("id"):
+                    self._channels[name] = {
+                        "id": entry["id"],
+                        "name": entry.get("name", name),
+                        "is_private": entry.get("is_private", True),
+                        "last_checked": entry.get("last_checked"),
+                    }
+
+            # 旧形式（トップレベルに "チャンネル名": "ID"）のエントリ
+            for name, channel_id in data.items():
+                if name not in ("channels", "last_updated") and isinstance(channel_id, str):
+                    self._channels.setdefault(name, {
+                        "id": channel_id,
+                        "name": name,
+                        "is_private": True,
+                        "last_checked": None,
+                    })
+
+            logger.info("Loaded Slack channel cache", path=str(self.path), channels=len(self._channels))
+
+    def save(self) -> None:
+        """変更があればスナップショットファイルに書き出す"""
+        with self._lock:
+            if not self._dirty:
+                return
+
+            data = {
+                "channels": self._channels,
+                "last_updated": datetime.now().isoformat(),
+            }
+
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+                tmp_path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+                os.replace(tmp_path, self.path)
+                self._dirty = False
+            except OSError as e:
+                logger.warning("Failed to save Slack channel cache", path=str(self.path), error=str(e))
+
+    def get(self, name: str) -> Optional[str]:
+        """チャンネルIDを取得（未登録またはTTL切れの場合はNone）"""
+        if not self._loaded:
+            self.load()
+
+        entry = self._channels.get(name)
+        if entry is None:
+            return None
+
+        last_checked = entry.get("last_checked")
+        if last_checked:
+            try:
+                if datetime.now() - datetime.fromisoformat(last_checked) > self.ttl:
+                    return None
+            except ValueError:
+                return None
+
+        return entry["id"]
+
+    def update(self, channels: Iterable[Dict[str, Any]]) -> None:
+        """conversations_listの結果からBotが参加しているチャンネルを登録"""
+        checked_at = datetime.now().isoformat()
+
+        with self._lock:
+            for channel in channels:
+                if not channel.get("is_member", False):
+                    continue
+
+                self._channels[channel["name"]] = {
+                    "id": channel["id"],
+                    "name": channel["name"],
+                    "is_private": channel.get("is_private", True),
+                    "last_checked": checked_at,
+                }
+                self._dirty = True
+
+    def discard(self, name: str) -> None:
+        """エントリを削除（チャンネルの改名・アーカイブ時など）"""
+        with self._lock:
+            if self._channels.pop(name, None) is not None:
+                self._dirty = True
+
+
+# プロセス内で共有するキャッシュ
+channel_cache = SlackChannelCache(
+    settings.SLACK_CHANNEL_CACHE_FILE,
+    settings.SLACK_CHANNEL_CACHE_TTL_SECONDS,
+)
@@ -0,0 +1,94 @@
+"""Slackステータス通知のまとめ送信
+
+一括操作などで同じアイテムのステータスが数秒のうちに何度も変わる場合、
+チャンネルごとに一定時間（ウィンドウ）通知をためてから送信する。
+
+- 同じ（チャンネル, N番号）の遷移は1件にまとめ、途中の経過を保持する
+- ウィンドウ内に複数アイテムの通知があればチャンネルごとのダイジェストにする
+
+ウィンドウは最初の通知から数えるため、通知の遅延はウィンドウ幅を超えない。
+"""
+
+import asyncio
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import structlog
+
+from app.models.enums import ProgressStatus as WorkflowStatus
+
+logger = structlog.get_logger(__name__)
+
+
+class PendingNotification:
+    """まとめ待ちの1アイテム分のステータス遷移"""
+
+    def __init__(self, n_number: str, title: str, old_status: Optional[WorkflowStatus]):
+        self.n_number = n_number
+        self.title = title
+        self.path: List[Optional[WorkflowStatus]] = [old_status]
+
+    def add(self, title: str, new_status: WorkflowStatus) -> None:
+        """遷移を追加（同じステータスの連続は1つにまとめる）"""
+        self.title = title or self.title
+        if self.path[-1] != new_status:
+            self.path.append(new_status)
+
+    def __repr__(self) -> str:
+        return f"<PendingNotification({self.n_number}: {[s.value if s else None for s in self.path]})>"
+
+
+FlushCallback = Callable[[str, List[PendingNotification]], Awaitable[None]]
+
+
+class NotificationCoalescer:
+    """チャンネルごとにステータス通知をためてまとめて送信"""
+
+    def __init__(self, window_seconds: float, flush: FlushCallback):
+        self.window_seconds = window_seconds
+        self._flush = flush
+        self._pending: Dict[str, Dict[str, PendingNotification]] = {}
+        self._timers: Dict[str, asyncio.Task] = {}
+
+    async def add(
+        self,
+        channel: str,
+        n_number: str,
+        title: str,
+        old_status: Optional[WorkflowStatus],
+        new_status: WorkflowStatus
+    ) -> None:
+        """通知をためる（チャンネルの最初の通知でウィンドウを開始）"""
+        notifications = self._pending.setdefault(channel, {})
+        notification = notifications.get(n_number)
+        if notification is None:
+            notification = notifications[n_number] = PendingNotification(n_number, title, old_status)
+        notification.add(title, new_status)
+
+        if channel not in self._timers:
+            self._timers[channel] = asyncio.create_task(self._flush_later(channel))
+
+    async def _flush_later(self, channel: str) -> None:
+        await asyncio.sleep(self.window_seconds)
+        self._timers.pop(channel, None)
+        await self.flush_channel(channel)
+
+    async def flush_channel(self, channel: str) -> None:
+        """チャンネルにたまった通知を送信"""
+        notifications = self._pending.pop(channel, {})
+        if not notifications:
+            return
+
+        try:
+            await self._flush(channel, list(notifications.values()))
+        except Exception as e:
+            logger.error("Failed to send coalesced notifications", channel=channel, items=len(notifications), error=str(e))
+
+    async def flush_all(self) -> None:
+        """すべてのチャンネルの通知を直ちに送信（シャットダウン時）"""
+        timers, self._timers = self._timers, {}
+        for task in timers.values():
+            task.cancel()
+        await asyncio.gather(*timers.values(), return_exceptions=True)
+
+        for channel in list(self._pending):
+            await self.flush_channel(channel)
@@ -0,0 +1,369 @@
+"""Slack送信ディスパッチャ
+
+AsyncWebClientでSlack Web APIを呼び出す。メソッドごとのトークンバケットで
+Slackのティア制限を超えないように送信間隔を調整し、429が返った場合は
+Retry-Afterの間そのメソッドの送信を止めてから再試行する。
+
+通知はキュー（プロセス内またはRedisリスト）に積み、上限付きの並行数で
+ワーカーが送信する。ワーカーが起動していない場合はその場で送信する。
+submitは送信結果で完了するFutureを返す（Redisキューで別プロセスのワーカーが
+送信した場合は、結果をPub/Subで受け取って完了させる）。停止時はキューに
+残った通知を送り切るまで待つ。
+"""
+
+import asyncio
+import json
+import time
+import uuid
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from redis.asyncio import Redis
+from slack_sdk.errors import SlackApiError
+import structlog
+
+from app.core.config import settings
+from app.core.exceptions import SlackNotificationError
+from app.core.redis import get_redis
+
+logger = structlog.get_logger(__name__)
+
+QUEUE_KEY = "techbridge:slack:outbox"
+RESULT_CHANNEL = "techbridge:slack:results"
+
+# メソッドごとの制限（1分あたりのリクエスト数, バースト数）
+# https://api.slack.com/docs/rate-limits
+SLACK_METHOD_LIMITS: Dict[str, Tuple[int, int]] = {
+    "chat.postMessage": (60, 3),     # 1チャンネルあたり毎秒1件程度
+    "chat.update": (50, 5),          # Tier 3
+    "chat.delete": (50, 5),          # Tier 3
+    "conversations.list": (20, 2),   # Tier 2
+}
+DEFAULT_METHOD_LIMIT = (20, 2)  # Tier 2
+
+# チャンネル単位で制限されるメソッド
+PER_CHANNEL_METHODS = frozenset({"chat.postMessage"})
+
+
+class TokenBucket:
+    """トークンバケット（取得できるまで待機する）"""
+
+    def __init__(
+        self,
+        requests_per_minute: int,
+        burst_size: int,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep
+    ):
+        self.rate = requests_per_minute / 60.0
+        self.capacity = float(max(burst_size, 1))
+        self.clock = clock
+        self.sleep = sleep
+        self.tokens = self.capacity
+        self.updated = clock()
+        self.blocked_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def pause(self, seconds: float) -> None:
+        """Retry-Afterの間、トークンの払い出しを止める"""
+        self.blocked_until = max(self.blocked_until, self.clock() + seconds)
+        self.tokens = 0.0
+
+    async def acquire(self) -> None:
+        """トークンを1つ取得（なければ補充されるまで待機）"""
+        async with self._lock:
+            while True:
+                now = self.clock()
+                if now < self.blocked_until:
+                    await self.sleep(self.blocked_until - now)
+                    continue
+
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+
+                await self.sleep((1 - self.tokens) / self.rate)
+
+
+class InMemorySlackQueue:
+    """プロセス内の送信キュー"""
+
+    shared = False
+
+    def __init__(self):
+        self._queue: asyncio.Queue = asyncio.Queue()
+
+    async def put(self, message: Dict[str, Any]) -> None:
+        await self._queue.put(message)
+
+    async def get(self, timeout: float) -> Optional[Dict[str, Any]]:
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def qsize(self) -> int:
+        return self._queue.qsize()
+
+
+class RedisSlackQueue:
+    """Redisリストの送信キュー（再起動・複数ワーカー間で共有）"""
+
+    shared = True
+
+    def __init__(
+        self,
+        redis_factory: Callable[[], Awaitable[Redis]] = get_redis,
+        key: str = QUEUE_KEY,
+        result_channel: str = RESULT_CHANNEL
+    ):
+        self.redis_factory = redis_factory
+        self.key = key
+        self.result_channel = result_channel
+
+    async def put(self, message: Dict[str, Any]) -> None:
+        redis = await self.redis_factory()
+        await redis.lpush(self.key, json.dumps(message, ensure_ascii=False))
+
+    async def get(self, timeout: float) -> Optional[Dict[str, Any]]:
+        redis = await self.redis_factory()
+        item = await redis.brpop(self.key, timeout=max(int(timeout), 1))
+        return json.loads(item[1]) if item else None
+
+    def qsize(self) -> int:
+        return 0
+
+    async def publish_result(self, message_id: str, error: Optional[str]) -> None:
+        """送信結果を送信元のプロセスへ通知"""
+        redis = await self.redis_factory()
+        await redis.publish(self.result_channel, json.dumps({"id": message_id, "error": error}, ensure_ascii=False))
+
+    async def results(self) -> AsyncIterator[Tuple[str, Optional[str]]]:
+        """全プロセスの送信結果（メッセージID, エラー）を受信"""
+        redis = await self.redis_factory()
+        pubsub = redis.pubsub()
+        await pubsub.subscribe(self.result_channel)
+        try:
+            async for message in pubsub.listen():
+                if message.get("type") != "message":
+                    continue
+                data = json.loads(message["data"])
+                yield data["id"], data.get("error")
+        finally:
+            await pubsub.unsubscribe(self.result_channel)
+            await pubsub.close()
+
+
+def _retry_after(error: SlackApiError) -> float:
+    """429レスポンスのRetry-After（秒）"""
+    headers = getattr(error.response, "headers", None) or {}
+    value = headers.get("Retry-After") or headers.get("retry-after") or 1
+    try:
+        return max(float(value), 0.0)
+    except (TypeError, ValueError):
+        return 1.0
+
+
+class SlackDispatcher:
+    """レート制限を考慮してSlack Web APIを呼び出すディスパッチャ"""
+
+    def __init__(
+        self,
+        token: Optional[str] = None,
+        client: Any = None,
+        queue: Any = None,
+        concurrency: int = 4,
+        max_retries: int = 3,
+        drain_seconds: float = 10.0,
+        limits: Optional[Dict[str, Tuple[int, int]]] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep
+    ):
+        self.token = token
+        self._client = client
+        self.queue = queue
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.drain_seconds = drain_seconds
+        self.limits = limits or SLACK_METHOD_LIMITS
+        self.clock = clock
+        self.sleep = sleep
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._workers: List[asyncio.Task] = []
+        self._listener: Optional[asyncio.Task] = None
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._stopping = False
+
+    @property
+    def client(self) -> Any:
+        """AsyncWebClient（初回アクセス時に生成）"""
+        if self._client is None:
+            from slack_sdk.web.async_client import AsyncWebClient
+            self._client = AsyncWebClient(token=self.token)
+        return self._client
+
+    def bucket_for(self, method: str, channel: Optional[str] = None) -> TokenBucket:
+        """メソッド（とチャンネル）に対応するトークンバケットを取得"""
+        key = f"{method}:{channel}" if method in PER_CHANNEL_METHODS and channel else method
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            requests_per_minute, burst_size = self.limits.get(method, DEFAULT_METHOD_LIMIT)
+            bucket = TokenBucket(requests_per_minute, burst_size, clock=self.clock, sleep=self.sleep)
+            self._buckets[key] = bucket
+        return bucket
+
+    async def call(self, method: str, **params: Any) -> Any:
+        """APIを呼び出す（429の場合はRetry-After待機後に再試行）"""
+        bucket = self.bucket_for(method, params.get("channel"))
+        api_method = getattr(self.client, method.replace(".", "_"))
+
+        for attempt in range(self.max_retries + 1):
+            await bucket.acquire()
+            try:
+                async with self._semaphore:
+                    return await api_method(**params)
+            except SlackApiError as e:
+                if getattr(e.response, "status_code", None) != 429 or attempt >= self.max_retries:
+                    raise
+                retry_after = _retry_after(e)
+                logger.warning("Slack rate limited", method=method, retry_after=retry_after, attempt=attempt + 1)
+                bucket.pause(retry_after)
+
+    async def submit(self, method: str, **params: Any) -> asyncio.Future:
+        """キューに積み、送信結果で完了するFutureを返す
+
+        Futureの結果はAPIのレスポンスで、送信に失敗した場合は例外が設定される。
+        ワーカーが起動していない場合はその場で送信する。
+        """
+        future = asyncio.get_running_loop().create_future()
+        if self.queue is None or not self._workers:
+            try:
+                future.set_result(await self.call(method, **params))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+
+        message_id = uuid.uuid4().hex
+
+        def forget(done: asyncio.Future) -> None:
+            self._pending.pop(message_id, None)
+            if not done.cancelled():
+                done.exception()  # 結果を待たずに打ち切った呼び出し元でも警告を出さない
+
+        self._pending[message_id] = future
+        future.add_done_callback(forget)
+        try:
+            await self.queue.put({"id": message_id, "method": method, "params": params})
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def start(self) -> None:
+        """送信ワーカーを起動"""
+        if self.queue is None or self._workers:
+            return
+        self._stopping = False
+        self._workers = [
+            asyncio.create_task(self._run(), name=f"slack-dispatcher-{i}")
+            for i in range(self.concurrency)
+        ]
+        if self.queue.shared:
+            self._listener = asyncio.create_task(self._listen(), name="slack-dispatcher-results")
+        logger.info("Slack dispatcher started", concurrency=self.concurrency)
+
+    async def stop(self) -> None:
+        """送信ワーカーを停止（キューが空になるまで最大drain_seconds秒待つ）"""
+        if not self._workers:
+            return
+        self._stopping = True
+        _, unfinished = await asyncio.wait(self._workers, timeout=self.drain_seconds)
+        for task in unfinished:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        if self._listener is not None:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+            self._listener = None
+        if unfinished or self.queue.qsize():
+            logger.warning("Slack dispatcher stopped with unsent messages", pending=self.queue.qsize())
+        logger.info("Slack dispatcher stopped")
+
+    async def _run(self) -> None:
+        """ワーカーのメインループ（停止中はキューが空になったら終了）"""
+        while True:
+            try:
+                message = await self.queue.get(timeout=0.1 if self._stopping else 1.0)
+                if message is None:
+                    if self._stopping:
+                        return
+                    continue
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Slack dispatcher error", error=str(e))
+                await asyncio.sleep(1.0)
+                continue
+
+            try:
+                result = await self.call(message["method"], **message["params"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Failed to send Slack message", method=message["method"], error=str(e))
+                await self._complete(message.get("id"), error=e)
+            else:
+                await self._complete(message.get("id"), result=result)
+
+    async def _complete(self, message_id: Optional[str], result: Any = None, error: Optional[Exception] = None) -> None:
+        """送信結果でsubmitのFutureを完了させる（別プロセスのメッセージは結果を通知）"""
+        future = self._pending.get(message_id)
+        if future is not None:
+            if not future.done():
+                if error is not None:
+                    future.set_exception(error)
+                else:
+                    future.set_result(result)
+            return
+
+        if message_id and self.queue.shared:
+            try:
+                await self.queue.publish_result(message_id, str(error) if error is not None else None)
+            except Exception as e:
+                logger.warning("Failed to publish Slack result", message_id=message_id, error=str(e))
+
+    async def _listen(self) -> None:
+        """別プロセスのワーカーが送信した結果を受信（切断時は再接続）"""
+        while True:
+            try:
+                async for message_id, error in self.queue.results():
+                    future = self._pending.get(message_id)
+                    if future is None or future.done():
+                        continue
+                    if error is not None:
+                        future.set_exception(SlackNotificationError(error))
+                    else:
+                        future.set_result({"ok": True})
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Slack result listener error", error=str(e))
+            await asyncio.sleep(1.0)
+
+
+def create_slack_dispatcher(token: str) -> SlackDispatcher:
+    """設定値からディスパッチャを生成"""
+    queues = {
+        "memory": InMemorySlackQueue,
+        "redis": RedisSlackQueue,
+    }
+    queue_class = queues.get(settings.SLACK_DISPATCH_QUEUE)
+    return SlackDispatcher(
+        token=token,
+        queue=queue_class() if queue_class else None,
+        concurrency=settings.SLACK_DISPATCH_CONCURRENCY,
+        max_retries=settings.SLACK_DISPATCH_MAX_RETRIES,
+        drain_seconds=settings.SLACK_DISPATCH_DRAIN_SECONDS,
+    )
@@ -0,0 +1,136 @@
+"""Slackスラッシュコマンドの遅延応答
+
+Slackはスラッシュコマンドに3秒以内の応答を求める。遅延応答モードでは
+エンドポイントは「処理中」の応答だけを即座に返し、DB参照やSheets・Slackの
+呼び出しはバックグラウンドのワーカーで実行して、結果をコマンドの
+response_urlへ送信する（接続は共有のHTTPクライアントで使い回す）。
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+import httpx
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+import structlog
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+
+logger = structlog.get_logger(__name__)
+
+# response_urlとして受け付けるURL（署名検証済みでも任意のURLへは送信しない）
+RESPONSE_URL_PREFIX = "https://hooks.slack.com/"
+
+CommandJob = Callable[[AsyncSession], Awaitable[Dict[str, Any]]]
+
+
+def is_response_url(url: Optional[str]) -> bool:
+    """Slackのresponse_urlかどうか"""
+    return bool(url) and url.startswith(RESPONSE_URL_PREFIX)
+
+
+class SlackCommandResponder:
+    """コマンドの処理をバックグラウンドで実行し、結果をresponse_urlへ送信"""
+
+    def __init__(
+        self,
+        concurrency: int = 4,
+        timeout_seconds: float = 10.0,
+        session_factory: async_sessionmaker[AsyncSession] = AsyncSessionLocal,
+        http_client: Optional[httpx.AsyncClient] = None
+    ):
+        self.concurrency = concurrency
+        self.timeout_seconds = timeout_seconds
+        self.session_factory = session_factory
+        self._client = http_client
+        self._queue: "asyncio.Queue[Tuple[str, CommandJob]]" = asyncio.Queue()
+        self._workers: List[asyncio.Task] = []
+        self._tasks: Set[asyncio.Task] = set()
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """response_url送信用の共有HTTPクライアント（初回アクセス時に生成）"""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout_seconds,
+                limits=httpx.Limits(
+                    max_connections=self.concurrency * 2,
+                    max_keepalive_connections=self.concurrency
+                ),
+            )
+        return self._client
+
+    async def submit(self, response_url: str, job: CommandJob) -> None:
+        """コマンドの処理を登録（ワーカーが起動していない場合はタスクとして実行）"""
+        if self._workers:
+            await self._queue.put((response_url, job))
+            return
+
+        task = asyncio.create_task(self.run(response_url, job))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def run(self, response_url: str, job: CommandJob) -> bool:
+        """コマンドを処理して結果を送信"""
+        try:
+            async with self.session_factory() as db:
+                payload = await job(db)
+        except Exception as e:
+            logger.error("Deferred Slack command failed", error=str(e))
+            payload = {
+                "response_type": "ephemeral",
+                "text": f"❌ エラーが発生しました: {str(e)}"
+            }
+
+        return await self.respond(response_url, payload)
+
+    async def respond(self, response_url: str, payload: Dict[str, Any]) -> bool:
+        """response_urlへ結果を送信"""
+        try:
+            response = await self.client.post(response_url, json=payload)
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            logger.error("Failed to post Slack command response", error=str(e))
+            return False
+        return True
+
+    def start(self) -> None:
+        """ワーカーを起動"""
+        if self._workers:
+            return
+        self._workers = [
+            asyncio.create_task(self._run(), name=f"slack-command-responder-{i}")
+            for i in range(self.concurrency)
+        ]
+        logger.info("Slack command responder started", concurrency=self.concurrency)
+
+    async def stop(self) -> None:
+        """ワーカーを停止し、HTTPクライアントを閉じる"""
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, *self._tasks, return_exceptions=True)
+        self._workers = []
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        logger.info("Slack command responder stopped")
+
+    async def _run(self) -> None:
+        """ワーカーのメインループ"""
+        while True:
+            response_url, job = await self._queue.get()
+            try:
+                await self.run(response_url, job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Slack command responder error", error=str(e))
+            finally:
+                self._queue.task_done()
+
+
+# プロセス内で共有するレスポンダ
+command_responder = SlackCommandResponder(
+    concurrency=settings.SLACK_COMMAND_CONCURRENCY,
+    timeout_seconds=settings.SLACK_COMMAND_RESPONSE_TIMEOUT_SECONDS,
+)
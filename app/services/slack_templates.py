@@ -0,0 +1,173 @@
+"""Slack Block Kitメッセージテンプレート
+
+通知ごとのレイアウトを辞書リテラルとf文字列で組み立てる描画関数。
+ステータスの表示ラベルや「変更前」「変更後」フィールド、固定の案内文は
+起動時に一度だけ作って共有するため、描画結果のブロックは読み取り専用として
+扱うこと（返すリスト自体は毎回新しく作るので、要素の追加はできる）。
+"""
+
+from datetime import timedelta
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from app.models.enums import ProgressStatus
+
+Message = Tuple[str, List[Dict[str, Any]]]
+
+# ステータスの表示ラベル（絵文字 + 表示名）
+STATUS_LABELS: Mapping[ProgressStatus, str] = MappingProxyType({
+    status: f"{ProgressStatus.get_emoji(status)} {ProgressStatus.get_display_name(status)}"
+    for status in ProgressStatus
+})
+
+
+def status_label(status: Optional[ProgressStatus]) -> str:
+    """ステータスの表示ラベル（未設定は「なし」）"""
+    if status is None:
+        return "なし"
+    return STATUS_LABELS.get(status) or status.value
+
+
+def transition_label(path: Sequence[Optional[ProgressStatus]]) -> str:
+    """遷移の経過を「A → B → C」の形式で表示"""
+    return " → ".join(status_label(status) for status in path if status is not None)
+
+
+def _mrkdwn(text: str) -> Dict[str, str]:
+    return {"type": "mrkdwn", "text": text}
+
+
+def _section(text: str) -> Dict[str, Any]:
+    return {"type": "section", "text": _mrkdwn(text)}
+
+
+def _header(text: str) -> Dict[str, Any]:
+    return {"type": "header", "text": {"type": "plain_text", "text": text}}
+
+
+# ステータスごとの「変更前」「変更後」フィールドと追加メッセージ
+OLD_STATUS_FIELDS: Mapping[Optional[ProgressStatus], Dict[str, str]] = MappingProxyType({
+    status: _mrkdwn(f"*変更前:*\n{status_label(status)}") for status in (None, *ProgressStatus)
+})
+NEW_STATUS_FIELDS: Mapping[ProgressStatus, Dict[str, str]] = MappingProxyType({
+    status: _mrkdwn(f"*変更後:*\n{label}") for status, label in STATUS_LABELS.items()
+})
+STATUS_FOOTERS: Mapping[ProgressStatus, Tuple[Dict[str, Any], ...]] = MappingProxyType({
+    ProgressStatus.MANUSCRIPT_REQUESTED: (_section("📮 *著者への原稿依頼をお忘れなく！*"),),
+    ProgressStatus.COMPLETED: (_section("🎉 *お疲れさまでした！編集作業が完了しました。*"),),
+})
+
+# 完了通知に表示するメタデータ項目（表示順）
+COMPLETION_METADATA_FIELDS: Tuple[Tuple[str, Callable[[Mapping[str, Any]], str]], ...] = (
+    ("pages", "*ページ数:*\n{pages}ページ".format_map),
+    ("format", "*フォーマット:*\n{format}".format_map),
+    ("completed_by", "*完了者:*\n{completed_by}".format_map),
+)
+
+COMPLETION_FOOTER: Tuple[Dict[str, Any], ...] = (
+    _section("✨ *技術の泉シリーズの制作が完了しました！*\n最終確認をお願いします。"),
+)
+
+DELAY_ALERT_FOOTER: Dict[str, Any] = _section("⚠️ *目安の期間を過ぎています。進捗の確認をお願いします。*")
+
+
+def render_status_update(n_number: str, title: str, path: Sequence[Optional[ProgressStatus]]) -> Message:
+    """ステータス更新通知を描画（pathは変更前から変更後までの遷移）"""
+    old_status, new_status = path[0], path[-1]
+    blocks = [
+        _header(f"📊 進捗更新: {n_number}"),
+        {
+            "type": "section",
+            "fields": [
+                _mrkdwn(f"*タイトル:*\n{title}"),
+                _mrkdwn(f"*N番号:*\n{n_number}"),
+                OLD_STATUS_FIELDS[old_status],
+                NEW_STATUS_FIELDS[new_status],
+            ],
+        },
+    ]
+
+    # まとめた通知は途中の遷移も表示（新規作成から始まる場合は作成時のステータスから）
+    if len(path) > 2:
+        steps = path[1:] if old_status is None else path
+        blocks.append({"type": "context", "elements": [_mrkdwn(f"*経過:* {transition_label(steps)}")]})
+
+    blocks.extend(STATUS_FOOTERS.get(new_status, ()))
+    return f"進捗更新: {n_number} - {STATUS_LABELS[new_status]}", blocks
+
+
+def render_status_digest(items: Sequence[Tuple[str, str, Sequence[Optional[ProgressStatus]]]]) -> Message:
+    """複数アイテムのステータス更新ダイジェストを描画（items: (N番号, タイトル, 遷移)）"""
+    blocks = [_header(f"📊 進捗更新まとめ（{len(items)}件）")]
+    blocks.extend(
+        _section(f"*{n_number}* {title}\n{transition_label(path)}")
+        for n_number, title, path in items
+    )
+    return "進捗更新まとめ: " + ", ".join(n_number for n_number, _, _ in items), blocks
+
+
+def render_completion(
+    n_number: str,
+    repository_name: str,
+    workflow_metadata: Optional[Mapping[str, Any]]
+) -> Message:
+    """完了通知を描画"""
+    blocks = [
+        _header(f"🎉 制作完了: {n_number}"),
+        {
+            "type": "section",
+            "fields": [
+                _mrkdwn(f"*N番号:*\n{n_number}"),
+                _mrkdwn(f"*リポジトリ:*\n{repository_name}"),
+            ],
+        },
+    ]
+
+    # メタデータから追加情報を抽出（最大2フィールド）
+    if workflow_metadata:
+        fields = [
+            _mrkdwn(render(workflow_metadata))
+            for key, render in COMPLETION_METADATA_FIELDS
+            if key in workflow_metadata
+        ][:2]
+        if fields:
+            blocks.append({"type": "section", "fields": fields})
+
+    blocks.extend(COMPLETION_FOOTER)
+    return f"制作完了: {n_number} - {repository_name}", blocks
+
+
+def format_duration(duration: timedelta) -> str:
+    """期間を「N日M時間」の形式で表示"""
+    hours = int(duration.total_seconds() // 3600)
+    days, hours = divmod(hours, 24)
+    if days and hours:
+        return f"{days}日{hours}時間"
+    if days:
+        return f"{days}日"
+    return f"{hours}時間"
+
+
+def render_delay_alert(
+    n_number: str,
+    title: str,
+    status: ProgressStatus,
+    elapsed: timedelta,
+    sla: Optional[timedelta]
+) -> Message:
+    """遅延アラートを描画"""
+    label = status_label(status)
+    blocks = [
+        _header(f"⏰ 遅延アラート: {n_number}"),
+        {
+            "type": "section",
+            "fields": [
+                _mrkdwn(f"*タイトル:*\n{title}"),
+                _mrkdwn(f"*ステータス:*\n{label}"),
+                _mrkdwn(f"*経過:*\n{format_duration(elapsed)}"),
+                _mrkdwn(f"*目安:*\n{format_duration(sla) if sla else 'なし'}"),
+            ],
+        },
+        DELAY_ALERT_FOOTER,
+    ]
+    return f"遅延アラート: {n_number} - {label}", blocks
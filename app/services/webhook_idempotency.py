@@ -0,0 +1,125 @@
+"""Webhookの冪等性（重複配信の排除）
+
+[tech]/[techzip]はタイムアウト時に同じイベントを再送するため、配信IDまたは
+ペイロードのハッシュをキーにRedisへ処理結果を一定時間保存し、重複した
+リクエストには保存済みのレスポンスをそのまま返す。
+
+- 最初のリクエストがSET NXで「処理中」マーカーを確保する
+- 処理に成功したらレスポンスで上書きし、失敗したらマーカーを削除して
+  上流の再送で再処理できるようにする
+- Redisに接続できない場合は重複排除を行わずに処理を続行する
+"""
+
+import hashlib
+import json
+from typing import Any, Dict, Optional
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+import structlog
+
+from app.core.config import settings
+from app.core.redis import get_redis
+from app.models.enums import WebhookSource
+
+logger = structlog.get_logger(__name__)
+
+KEY_PREFIX = "techbridge:webhook:idempotency"
+PENDING = "__pending__"
+
+# 上流システムが配信IDを付与する場合のヘッダー
+DELIVERY_ID_HEADER = "X-Webhook-Delivery-Id"
+
+
+def idempotency_key(
+    source: WebhookSource,
+    payload: Dict[str, Any],
+    delivery_id: Optional[str] = None
+) -> str:
+    """配信ID（なければ正規化したペイロードのハッシュ）から冪等キーを生成"""
+    if delivery_id:
+        return f"{KEY_PREFIX}:{source.value}:id:{delivery_id}"
+
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    digest = hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+    return f"{KEY_PREFIX}:{source.value}:sha256:{digest}"
+
+
+class WebhookIdempotencyStore:
+    """処理済みWebhookのレスポンスを保存するRedisストア"""
+
+    def __init__(self, redis: Redis, ttl_seconds: int):
+        self.redis = redis
+        self.ttl_seconds = ttl_seconds
+
+    async def claim(self, key: str) -> Optional[Dict[str, Any]]:
+        """キーを確保する
+
+        初回ならNoneを返す。重複の場合は保存済みのレスポンス
+        （処理中なら {"pending": True}）を返す。
+        """
+        if await self.redis.set(key, PENDING, nx=True, ex=self.ttl_seconds):
+            return None
+
+        cached = await self.redis.get(key)
+        if cached is None or cached == PENDING:
+            return {"pending": True}
+        return json.loads(cached)
+
+    async def store(self, key: str, status_code: int, body: Dict[str, Any]) -> None:
+        """処理結果のレスポンスを保存"""
+        await self.redis.set(
+            key,
+            json.dumps({"status_code": status_code, "body": body}, ensure_ascii=False),
+            ex=self.ttl_seconds
+        )
+
+    async def release(self, key: str) -> None:
+        """処理に失敗したキーを解放（再送時に再処理させる）"""
+        await self.redis.delete(key)
+
+
+async def get_idempotency_store() -> Optional[WebhookIdempotencyStore]:
+    """共有Redis接続を使うストアを取得（無効化されている場合はNone）"""
+    if settings.WEBHOOK_IDEMPOTENCY_TTL_SECONDS <= 0:
+        return None
+    return WebhookIdempotencyStore(await get_redis(), settings.WEBHOOK_IDEMPOTENCY_TTL_SECONDS)
+
+
+async def claim_webhook(
+    store: Optional[WebhookIdempotencyStore],
+    key: str
+) -> Optional[Dict[str, Any]]:
+    """重複チェック（Redisエラー時は初回として扱う）"""
+    if store is None:
+        return None
+    try:
+        return await store.claim(key)
+    except (RedisError, OSError) as e:
+        logger.warning("Idempotency check failed", key=key, error=str(e))
+        return None
+
+
+async def remember_webhook(
+    store: Optional[WebhookIdempotencyStore],
+    key: str,
+    status_code: int,
+    body: Dict[str, Any]
+) -> None:
+    """レスポンスを保存（Redisエラーは無視）"""
+    if store is None:
+        return
+    try:
+        await store.store(key, status_code, body)
+    except (RedisError, OSError) as e:
+        logger.warning("Failed to store idempotency record", key=key, error=str(e))
+
+
+async def forget_webhook(store: Optional[WebhookIdempotencyStore], key: str) -> None:
+    """キーを解放（Redisエラーは無視）"""
+    if store is None:
+        return
+    try:
+        await store.release(key)
+    except (RedisError, OSError) as e:
+        logger.warning("Failed to release idempotency key", key=key, error=str(e))
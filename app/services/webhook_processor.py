@@ -0,0 +1,271 @@
+"""Webhookイベントの処理（DB更新・Slack通知）"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+import structlog
+
+from app.core.exceptions import NotFoundError, ValidationError
+from app.core.logging import log_webhook_event
+from app.crud.workflow import add_notification_event
+from app.models.enums import NotificationStatus, ProgressStatus as WorkflowStatus, WebhookSource
+from app.models.workflow import WorkflowItem
+from app.services.slack import SlackService
+from app.services.workflow import WorkflowService
+
+logger = structlog.get_logger(__name__)
+
+
+def parse_tech_status(payload: Dict[str, Any]) -> WorkflowStatus:
+    """[tech]ペイロードのステータスをEnumに変換"""
+    status_str = payload.get("status", "").upper()
+    try:
+        return WorkflowStatus[status_str]
+    except KeyError:
+        raise ValidationError(f"Invalid status: {status_str}", field="status")
+
+
+async def record_notification(
+    db: AsyncSession,
+    item: WorkflowItem,
+    source: WebhookSource,
+    notified: Optional[bool]
+) -> None:
+    """通知履歴を記録（記録の失敗で処理全体を失敗させない）"""
+    try:
+        add_notification_event(
+            db,
+            item.n_number,
+            item.slack_channel,
+            NotificationStatus.from_delivery(notified),
+            source=source,
+            workflow_status=item.status
+        )
+        await db.commit()
+    except Exception as e:
+        await db.rollback()
+        logger.error("Failed to record notification", n_number=item.n_number, error=str(e))
+
+
+def tech_event_values(payload: Dict[str, Any], status: WorkflowStatus) -> Dict[str, Any]:
+    """[tech]ペイロードからワークフローアイテムの値を生成"""
+    return {
+        "n_number": payload.get("n_number"),
+        "book_id": payload.get("book_id"),
+        "title": payload.get("title"),
+        "author": payload.get("author"),
+        "status": status,
+        "repository_name": f"n{payload.get('n_number', '').lower()}-{payload.get('title', '').replace(' ', '-').lower()[:30]}",
+        "slack_channel": "#general",  # TODO: Google Sheetsから取得
+        "workflow_metadata": payload.get("metadata", {}),
+    }
+
+
+async def process_tech_status_change(
+    db: AsyncSession,
+    slack_service: SlackService,
+    payload: Dict[str, Any]
+) -> WorkflowItem:
+    """[tech]からのステータス変更を反映して通知"""
+    new_status = parse_tech_status(payload)
+
+    try:
+        # ワークフローサービスを使用して更新
+        workflow_service = WorkflowService(db)
+
+        # ワークフローアイテムを作成または更新
+        item = await workflow_service.create_or_update(
+            **tech_event_values(payload, new_status), source=WebhookSource.TECH
+        )
+
+        # Slack通知を送信
+        notified = await slack_service.send_status_update(
+            channel=item.slack_channel,
+            n_number=item.n_number,
+            title=item.title,
+            old_status=None,  # 新規の場合
+            new_status=new_status
+        )
+        await record_notification(db, item, WebhookSource.TECH, notified)
+
+        # ログを記録
+        log_webhook_event(
+            event_type="status_change",
+            source="tech",
+            n_number=item.n_number,
+            success=True,
+            status=new_status.value
+        )
+
+        return item
+
+    except Exception as e:
+        logger.error(
+            "Failed to process tech webhook",
+            error=str(e),
+            n_number=payload.get("n_number")
+        )
+
+        log_webhook_event(
+            event_type="status_change",
+            source="tech",
+            n_number=payload.get("n_number", "unknown"),
+            success=False,
+            error=str(e)
+        )
+        raise
+
+
+async def process_tech_status_batch(
+    db: AsyncSession,
+    slack_service: SlackService,
+    events: List[Any],
+    concurrency: int
+) -> List[Dict[str, Any]]:
+    """[tech]からの複数のステータス変更を1文でupsertし、通知を並行送信
+
+    不正なイベントはスキップし、イベントごとの結果を入力順で返す。
+    """
+    results: List[Optional[Dict[str, Any]]] = [None] * len(events)
+    accepted: Dict[str, Tuple[int, WorkflowStatus]] = {}
+
+    for index, payload in enumerate(events):
+        n_number = payload.get("n_number") if isinstance(payload, dict) else None
+        if not n_number:
+            results[index] = {"index": index, "n_number": n_number, "status": "error", "error": "Missing n_number"}
+            continue
+
+        try:
+            new_status = parse_tech_status(payload)
+        except ValidationError as e:
+            results[index] = {"index": index, "n_number": n_number, "status": "error", "error": e.message}
+            continue
+
+        # 同じN番号は後のイベントが優先
+        if n_number in accepted:
+            superseded, _ = accepted[n_number]
+            results[superseded] = {"index": superseded, "n_number": n_number, "status": "superseded"}
+        accepted[n_number] = (index, new_status)
+
+    workflow_service = WorkflowService(db)
+    items = await workflow_service.bulk_create_or_update(
+        [tech_event_values(events[index], new_status) for index, new_status in accepted.values()],
+        source=WebhookSource.TECH
+    )
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def notify(item: WorkflowItem) -> None:
+        index, new_status = accepted[item.n_number]
+        async with semaphore:
+            try:
+                notified = await slack_service.send_status_update(
+                    channel=item.slack_channel,
+                    n_number=item.n_number,
+                    title=item.title,
+                    old_status=None,
+                    new_status=new_status
+                )
+            except Exception as e:
+                logger.error("Failed to send batch notification", n_number=item.n_number, error=str(e))
+                notified = False
+        add_notification_event(
+            db,
+            item.n_number,
+            item.slack_channel,
+            NotificationStatus.from_delivery(notified),
+            source=WebhookSource.TECH,
+            workflow_status=new_status
+        )
+
+        log_webhook_event(
+            event_type="status_change",
+            source="tech",
+            n_number=item.n_number,
+            success=True,
+            status=new_status.value
+        )
+        results[index] = {
+            "index": index,
+            "n_number": item.n_number,
+            "status": "success",
+            "workflow_status": new_status.value,
+            "notified": notified
+        }
+
+    await asyncio.gather(*(notify(item) for item in items))
+    # 通知履歴はまとめて1回のコミットで記録
+    await db.commit()
+
+    return results
+
+
+async def process_techzip_completion(
+    db: AsyncSession,
+    slack_service: SlackService,
+    payload: Dict[str, Any]
+) -> WorkflowItem:
+    """[techzip]からの完了通知を反映して通知"""
+    try:
+        # ワークフローサービスを使用して更新
+        workflow_service = WorkflowService(db)
+
+        # 既存のアイテムを取得
+        item = await workflow_service.get_by_n_number(payload.get("n_number"))
+        if not item:
+            raise NotFoundError("WorkflowItem", str(payload.get("n_number")))
+
+        # ステータスを更新
+        item = await workflow_service.update_status(
+            n_number=payload.get("n_number"),
+            status=WorkflowStatus.COMPLETED,
+            workflow_metadata=payload.get("metadata", {}),
+            source=WebhookSource.TECHZIP
+        )
+
+        # Slack通知を送信
+        notified = await slack_service.send_completion_notification(
+            channel=item.slack_channel,
+            n_number=item.n_number,
+            repository_name=payload.get("repository_name"),
+            workflow_metadata=payload.get("metadata", {})
+        )
+        await record_notification(db, item, WebhookSource.TECHZIP, notified)
+
+        # ログを記録
+        log_webhook_event(
+            event_type="completion",
+            source="techzip",
+            n_number=item.n_number,
+            success=True,
+            repository_name=payload.get("repository_name")
+        )
+
+        return item
+
+    except Exception as e:
+        logger.error(
+            "Failed to process techzip webhook",
+            error=str(e),
+            n_number=payload.get("n_number")
+        )
+
+        log_webhook_event(
+            event_type="completion",
+            source="techzip",
+            n_number=payload.get("n_number", "unknown"),
+            success=False,
+            error=str(e)
+        )
+        raise
+
+
+# Webhook送信元ごとの処理
+WEBHOOK_PROCESSORS: Dict[
+    WebhookSource,
+    Callable[[AsyncSession, SlackService, Dict[str, Any]], Awaitable[WorkflowItem]]
+] = {
+    WebhookSource.TECH: process_tech_status_change,
+    WebhookSource.TECHZIP: process_techzip_completion,
+}
@@ -0,0 +1,256 @@
+"""Webhookジョブキュー（Redis Streams）
+
+Webhookエンドポイントは署名検証後にイベントをストリームへ投入して即座に
+202を返し、DB更新・Sheets参照・Slack通知はワーカーが非同期に処理する。
+
+- 処理に失敗したメッセージはACKせずに保留（pending）のまま残し、
+  一定時間経過後にXAUTOCLAIMで再取得してリトライする
+- 配信回数が上限を超えたメッセージ、または再試行しても成功しない
+  エラー（4xx相当）はデッドレターストリームへ移す
+"""
+
+import asyncio
+import json
+import os
+import socket
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError, ResponseError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+import structlog
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.exceptions import TechBridgeException
+from app.core.redis import get_redis
+from app.models.enums import WebhookSource
+from app.services.slack import SlackService
+from app.services.webhook_processor import WEBHOOK_PROCESSORS
+
+logger = structlog.get_logger(__name__)
+
+STREAM_KEY = "techbridge:webhooks"
+DEAD_LETTER_KEY = "techbridge:webhooks:dead"
+GROUP_NAME = "webhook-workers"
+
+# デッドレターストリームの保持件数（概算）
+DEAD_LETTER_MAXLEN = 10000
+
+Message = Tuple[str, Dict[str, str]]
+
+
+class WebhookQueue:
+    """Redis Streamsを使った永続Webhookキュー"""
+
+    def __init__(
+        self,
+        redis: Redis,
+        stream: str = STREAM_KEY,
+        dead_letter_stream: str = DEAD_LETTER_KEY,
+        group: str = GROUP_NAME
+    ):
+        self.redis = redis
+        self.stream = stream
+        self.dead_letter_stream = dead_letter_stream
+        self.group = group
+
+    async def ensure_group(self) -> None:
+        """コンシューマグループを作成（既存なら何もしない）"""
+        try:
+            await self.redis.xgroup_create(self.stream, self.group, id="0", mkstream=True)
+        except ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    async def enqueue(self, source: WebhookSource, payload: Dict[str, Any]) -> str:
+        """イベントをストリームに追加してメッセージIDを返す"""
+        return await self.redis.xadd(self.stream, {
+            "source": source.value,
+            "payload": json.dumps(payload, ensure_ascii=False),
+            "received_at": datetime.utcnow().isoformat(),
+        })
+
+    async def read(self, consumer: str, count: int, block_ms: int) -> List[Message]:
+        """未配信のメッセージを取得"""
+        response = await self.redis.xreadgroup(
+            self.group, consumer, {self.stream: ">"}, count=count, block=block_ms
+        )
+        return [message for _, messages in response or [] for message in messages]
+
+    async def claim_stale(self, consumer: str, min_idle_ms: int, count: int) -> List[Message]:
+        """一定時間ACKされていないメッセージを引き取る（リトライ）"""
+        response = await self.redis.xautoclaim(
+            self.stream, self.group, consumer, min_idle_time=min_idle_ms, start_id="0-0", count=count
+        )
+        # [next_start_id, messages, (deleted_ids)]
+        return [message for message in response[1] if message[1]]
+
+    async def delivery_count(self, message_id: str) -> int:
+        """メッセージの配信回数を取得"""
+        pending = await self.redis.xpending_range(
+            self.stream, self.group, min=message_id, max=message_id, count=1
+        )
+        return pending[0]["times_delivered"] if pending else 0
+
+    async def ack(self, message_id: str) -> None:
+        """処理完了したメッセージをACKしてストリームから削除"""
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.xack(self.stream, self.group, message_id)
+            pipe.xdel(self.stream, message_id)
+            await pipe.execute()
+
+    async def dead_letter(self, message_id: str, fields: Dict[str, str], error: str) -> None:
+        """メッセージをデッドレターストリームへ移す"""
+        await self.redis.xadd(
+            self.dead_letter_stream,
+            {**fields, "original_id": message_id, "error": error, "failed_at": datetime.utcnow().isoformat()},
+            maxlen=DEAD_LETTER_MAXLEN,
+            approximate=True,
+        )
+        await self.ack(message_id)
+
+
+async def get_webhook_queue() -> WebhookQueue:
+    """共有Redis接続を使うWebhookキューを取得"""
+    return WebhookQueue(await get_redis())
+
+
+async def enqueue_webhook(source: WebhookSource, payload: Dict[str, Any]) -> Optional[str]:
+    """Webhookイベントをキューに投入（Redisに接続できない場合はNone）"""
+    try:
+        queue = await get_webhook_queue()
+        message_id = await queue.enqueue(source, payload)
+    except (RedisError, OSError) as e:
+        logger.warning("Failed to enqueue webhook", source=source.value, error=str(e))
+        return None
+
+    logger.info("Webhook enqueued", source=source.value, message_id=message_id, n_number=payload.get("n_number"))
+    return message_id
+
+
+class WebhookWorkerPool:
+    """Webhookキューを処理する非同期ワーカー群"""
+
+    def __init__(
+        self,
+        queue_factory: Callable[[], Awaitable[WebhookQueue]],
+        slack_service_factory: Callable[[], SlackService],
+        concurrency: int,
+        max_attempts: int,
+        retry_idle_seconds: int,
+        session_factory: async_sessionmaker[AsyncSession] = AsyncSessionLocal,
+        block_ms: int = 5000,
+        error_backoff_seconds: float = 5.0
+    ):
+        self.queue_factory = queue_factory
+        self.slack_service_factory = slack_service_factory
+        self.session_factory = session_factory
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.retry_idle_ms = retry_idle_seconds * 1000
+        self.block_ms = block_ms
+        self.error_backoff_seconds = error_backoff_seconds
+        self._tasks: List[asyncio.Task] = []
+        self._stopping = asyncio.Event()
+
+    def start(self) -> None:
+        """ワーカーを起動"""
+        self._stopping.clear()
+        consumer_prefix = f"{socket.gethostname()}-{os.getpid()}"
+        self._tasks = [
+            asyncio.create_task(self._run(f"{consumer_prefix}-{i}"), name=f"webhook-worker-{i}")
+            for i in range(self.concurrency)
+        ]
+        logger.info("Webhook workers started", concurrency=self.concurrency)
+
+    async def stop(self) -> None:
+        """ワーカーを停止（処理中のメッセージは保留のまま残り、再起動後にリトライされる）"""
+        self._stopping.set()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        logger.info("Webhook workers stopped")
+
+    async def _run(self, consumer: str) -> None:
+        """ワーカーのメインループ"""
+        queue: Optional[WebhookQueue] = None
+
+        while not self._stopping.is_set():
+            try:
+                if queue is None:
+                    queue = await self.queue_factory()
+                    await queue.ensure_group()
+
+                # 先にリトライ対象を処理し、なければ新着を待つ
+                messages = await queue.claim_stale(consumer, self.retry_idle_ms, count=1)
+                retry = bool(messages)
+                if not retry:
+                    messages = await queue.read(consumer, count=1, block_ms=self.block_ms)
+
+                for message_id, fields in messages:
+                    await self.handle(queue, message_id, fields, retry=retry)
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Webhook worker error", consumer=consumer, error=str(e))
+                queue = None
+                await asyncio.sleep(self.error_backoff_seconds)
+
+    async def handle(
+        self,
+        queue: WebhookQueue,
+        message_id: str,
+        fields: Dict[str, str],
+        retry: bool = False
+    ) -> bool:
+        """1件のメッセージを処理（成功時True）"""
+        if retry:
+            attempts = await queue.delivery_count(message_id)
+            if attempts > self.max_attempts:
+                logger.error("Webhook exceeded max attempts", message_id=message_id, attempts=attempts)
+                await queue.dead_letter(message_id, fields, "max attempts exceeded")
+                return False
+
+        try:
+            source = WebhookSource(fields.get("source"))
+            processor = WEBHOOK_PROCESSORS[source]
+            payload = json.loads(fields["payload"])
+        except (KeyError, ValueError) as e:
+            logger.error("Invalid webhook message", message_id=message_id, error=str(e))
+            await queue.dead_letter(message_id, fields, f"invalid message: {e}")
+            return False
+
+        try:
+            async with self.session_factory() as db:
+                await processor(db, self.slack_service_factory(), payload)
+
+        except TechBridgeException as e:
+            # 4xx相当のエラー（対象なし・不正な値など）はリトライしても成功しない
+            if e.status_code is not None and e.status_code < 500:
+                await queue.dead_letter(message_id, fields, e.message)
+                return False
+            logger.warning("Webhook processing failed, will retry", message_id=message_id, error=str(e))
+            return False
+
+        except Exception as e:
+            logger.warning("Webhook processing failed, will retry", message_id=message_id, error=str(e))
+            return False
+
+        await queue.ack(message_id)
+        logger.info("Webhook processed", message_id=message_id, source=source.value, n_number=payload.get("n_number"))
+        return True
+
+
+def create_worker_pool(slack_service_factory: Callable[[], SlackService]) -> WebhookWorkerPool:
+    """設定値からワーカープールを生成"""
+    return WebhookWorkerPool(
+        queue_factory=get_webhook_queue,
+        slack_service_factory=slack_service_factory,
+        concurrency=settings.WEBHOOK_WORKER_CONCURRENCY,
+        max_attempts=settings.WEBHOOK_MAX_ATTEMPTS,
+        retry_idle_seconds=settings.WEBHOOK_RETRY_IDLE_SECONDS,
+    )
@@ -1,17 +1,56 @@
 """ワークフローサービス"""
 
-from typing import Optional, List, Tuple
+from typing import Any, Dict, FrozenSet, Optional, List, Tuple
 from datetime import datetime
 
-from sqlalchemy import select, and_
+from sqlalchemy import case, select, update, and_, func, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession
 import structlog
 
+from app.core.exceptions import ValidationError
+from app.core.sla import due_at_for
+from app.crud.workflow import add_status_event, add_status_transitions
 from app.models.workflow import WorkflowItem
-from app.models.enums import ProgressStatus as WorkflowStatus
+from app.models.enums import ProgressStatus as WorkflowStatus, WebhookSource
+from app.services.workflow_cache import workflow_cache
+from app.services.workflow_events import WorkflowEvent, snapshot, workflow_events
 
 logger = structlog.get_logger(__name__)
 
+# 方言ごとのON CONFLICT対応INSERT
+UPSERT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+# 新規作成時に未指定フィールドへ入れる値
+CREATE_DEFAULTS: Dict[str, Any] = {
+    "book_id": "",
+    "title": "",
+    "author": "",
+    "status": WorkflowStatus.DISCOVERED,
+    "repository_name": "",
+    "slack_channel": "#general",
+    "workflow_metadata": {},
+}
+
+
+class BulkUpdateResult:
+    """一括更新の結果"""
+    
+    def __init__(self, before: Dict[str, Any], not_found: List[str]):
+        self.before = before                  # 対象アイテムの変更前の値（N番号 -> 行）
+        self.not_found = not_found
+        self.items: List[WorkflowItem] = []   # 更新したアイテム（N番号順）
+        self.unchanged: List[str] = []
+        self.rejected: List[Tuple[str, WorkflowStatus]] = []
+    
+    def previous(self, n_number: str) -> Dict[str, Any]:
+        """フィルタに使う変更前の値"""
+        row = self.before[n_number]
+        return {"status": row.status.value, "assigned_editor": row.assigned_editor}
+
 
 class WorkflowService:
     """ワークフロー管理サービス"""
@@ -29,67 +68,132 @@ class WorkflowService:
         repository_name: Optional[str] = None,
         slack_channel: Optional[str] = None,
         assigned_editor: Optional[str] = None,
-        workflow_workflow_metadata: Optional[dict] = None
+        workflow_metadata: Optional[dict] = None,
+        source: WebhookSource = WebhookSource.SYSTEM,
+        changed_by: Optional[str] = None
     ) -> WorkflowItem:
-        """ワークフローアイテムを作成または更新"""
-        # 既存のアイテムを検索
-        result = await self.db.execute(
-            select(WorkflowItem).where(WorkflowItem.n_number == n_number)
-        )
-        item = result.scalar_one_or_none()
-        
-        if item:
-            # 更新
-            if book_id is not None:
-                item.book_id = book_id
-            if title is not None:
-                item.title = title
-            if author is not None:
-                item.author = author
-            if status is not None:
-                item.status = status
-            if repository_name is not None:
-                item.repository_name = repository_name
-            if slack_channel is not None:
-                item.slack_channel = slack_channel
-            if assigned_editor is not None:
-                item.assigned_editor = assigned_editor
-            if workflow_metadata is not None:
-                item.workflow_metadata = workflow_metadata
-            
-            item.updated_at = datetime.utcnow()
-            
-            logger.info(
-                "Updated workflow item",
-                n_number=n_number,
-                status=status.value if status else None
-            )
-        else:
-            # 新規作成
-            item = WorkflowItem(
-                n_number=n_number,
-                book_id=book_id or "",
-                title=title or "",
-                author=author or "",
-                status=status or WorkflowStatus.DISCOVERED,
-                repository_name=repository_name or "",
-                slack_channel=slack_channel or "#general",
-                assigned_editor=assigned_editor,
-                workflow_metadata=workflow_metadata or {}
-            )
-            self.db.add(item)
-            
-            logger.info(
-                "Created workflow item",
-                n_number=n_number,
-                status=item.status.value
-            )
+        """ワークフローアイテムを作成または更新
+
+        INSERT ... ON CONFLICT (n_number) DO UPDATE ... RETURNINGの1文で処理する。
+        既存アイテムは指定されたフィールド（None以外）のみ更新され、新規作成時の
+        未指定フィールドにはデフォルト値が入る。ステータスが変わった場合は
+        upsertの前に行ロック付きで読んだステータスを遷移元として、ステータス履歴を
+        同じトランザクションに追記する。
+        """
+        values = {
+            "n_number": n_number,
+            "book_id": book_id,
+            "title": title,
+            "author": author,
+            "status": status,
+            "repository_name": repository_name,
+            "slack_channel": slack_channel,
+            "assigned_editor": assigned_editor,
+            "workflow_metadata": workflow_metadata,
+        }
+        values = {k: v for k, v in values.items() if v is not None}
         
+        previous = await self._lock_statuses([n_number])
+        item, = await self._upsert([values], frozenset(values))
+        await add_status_transitions(
+            self.db, [(n_number, previous.get(n_number), item.status)], source=source, changed_by=changed_by
+        )
         await self.db.commit()
-        await self.db.refresh(item)
+        await workflow_cache.invalidate(n_number)
+        await workflow_events.publish_items("updated", [item])
+        
+        logger.info(
+            "Upserted workflow item",
+            n_number=n_number,
+            status=item.status.value
+        )
         
         return item
     
+    async def bulk_create_or_update(
+        self,
+        items: List[Dict[str, Any]],
+        source: WebhookSource = WebhookSource.SYSTEM,
+        changed_by: Optional[str] = None
+    ) -> List[WorkflowItem]:
+        """複数のワークフローアイテムをまとめて作成または更新
+
+        各アイテムは指定されたフィールド（None以外）のみ更新する。
+        同じN番号が複数含まれる場合は後のものが優先される。
+        """
+        merged: Dict[str, Dict[str, Any]] = {}
+        for values in items:
+            merged[values["n_number"]] = {k: v for k, v in values.items() if v is not None}
+        
+        if not merged:
+            return []
+        
+        # 指定フィールドの組み合わせごとに1文のINSERT ... ON CONFLICTを発行
+        groups: Dict[FrozenSet[str], List[Dict[str, Any]]] = {}
+        for values in merged.values():
+            groups.setdefault(frozenset(values), []).append(values)
+        
+        previous = await self._lock_statuses(list(merged))
+        upserted: Dict[str, WorkflowItem] = {}
+        for fields, rows in groups.items():
+            for item in await self._upsert(rows, fields):
+                upserted[item.n_number] = item
+        
+        await add_status_transitions(
+            self.db,
+            [(n_number, previous.get(n_number), item.status) for n_number, item in upserted.items()],
+            source=source,
+            changed_by=changed_by
+        )
+        await self.db.commit()
+        await workflow_cache.invalidate(*upserted)
+        await workflow_events.publish_items("updated", upserted.values())
+        
+        logger.info("Upserted workflow items", count=len(upserted))
+        
+        return [upserted[n_number] for n_number in merged]
+    
+    async def _lock_statuses(self, n_numbers: List[str]) -> Dict[str, WorkflowStatus]:
+        """既存アイテムの現在のステータスを行ロック付きで取得（ステータス履歴の遷移元）
+        
+        PostgreSQLではSELECT ... FOR UPDATEで同じアイテムへの同時書き込みを
+        直列化し、同じ遷移が重複して記録されないようにする。
+        """
+        result = await self.db.execute(
+            select(WorkflowItem.n_number, WorkflowItem.status)
+            .where(WorkflowItem.n_number.in_(n_numbers))
+            .with_for_update()
+        )
+        return dict(result.all())
+    
+    async def _upsert(self, rows: List[Dict[str, Any]], fields: FrozenSet[str]) -> List[WorkflowItem]:
+        """INSERT ... ON CONFLICT (n_number) DO UPDATE ... RETURNINGを実行"""
+        insert = UPSERT_INSERTS[self.db.get_bind().dialect.name]
+        now = datetime.utcnow()
+        
+        stmt = insert(WorkflowItem).values([
+            {
+                **CREATE_DEFAULTS, **row, "updated_at": now,
+                "due_at": due_at_for(row.get("status", CREATE_DEFAULTS["status"]), now),
+            }
+            for row in rows
+        ])
+        update_columns = sorted(fields - {"n_number"}) + ["updated_at"]
+        set_ = {column: stmt.excluded[column] for column in update_columns}
+        if "status" in fields:
+            # 遅延アラートの期限はステータスが変わった場合のみ計算し直す
+            set_["due_at"] = case(
+                (WorkflowItem.status == stmt.excluded.status, WorkflowItem.due_at),
+                else_=stmt.excluded.due_at
+            )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[WorkflowItem.n_number],
+            set_=set_
+        ).returning(WorkflowItem)
+        
+        result = await self.db.execute(stmt, execution_options={"populate_existing": True})
+        return list(result.scalars().all())
+    
     async def get_by_n_number(self, n_number: str) -> Optional[WorkflowItem]:
         """N番号でワークフローアイテムを取得"""
         result = await self.db.execute(
@@ -139,7 +243,7 @@ class WorkflowService:
         """フィルタ付きでワークフローアイテムを取得"""
         # 基本クエリ
         query = select(WorkflowItem)
-        count_query = select(WorkflowItem)
+        count_query = select(func.count()).select_from(WorkflowItem)
         
         # フィルタを追加
         conditions = []
@@ -154,10 +258,10 @@ class WorkflowService:
         
         # 総数を取得
         count_result = await self.db.execute(count_query)
-        total = len(count_result.scalars().all())
+        total = count_result.scalar_one()
         
         # データを取得
-        query = query.order_by(WorkflowItem.updated_at.desc()).limit(limit).offset(offset)
+        query = query.order_by(WorkflowItem.updated_at.desc(), WorkflowItem.id.desc()).limit(limit).offset(offset)
         result = await self.db.execute(query)
         items = result.scalars().all()
         
@@ -167,13 +271,19 @@ class WorkflowService:
         self,
         n_number: str,
         status: WorkflowStatus,
-        workflow_workflow_metadata: Optional[dict] = None
+        workflow_metadata: Optional[dict] = None,
+        source: WebhookSource = WebhookSource.SYSTEM,
+        changed_by: Optional[str] = None
     ) -> Optional[WorkflowItem]:
-        """ステータスを更新"""
+        """ステータスを更新（ステータス履歴も同じトランザクションで記録）"""
         item = await self.get_by_n_number(n_number)
         if not item:
             return None
         
+        previous = snapshot(item)
+        if item.status != status:
+            add_status_event(self.db, n_number, item.status, status, source=source, changed_by=changed_by)
+            item.due_at = due_at_for(status)
         item.status = status
         item.updated_at = datetime.utcnow()
         
@@ -185,6 +295,8 @@ class WorkflowService:
         
         await self.db.commit()
         await self.db.refresh(item)
+        await workflow_cache.invalidate(n_number)
+        await workflow_events.publish_items("updated", [item], previous)
         
         logger.info(
             "Updated workflow status",
@@ -204,11 +316,14 @@ class WorkflowService:
         if not item:
             return None
         
+        previous = snapshot(item)
         item.assigned_editor = editor
         item.updated_at = datetime.utcnow()
         
         await self.db.commit()
         await self.db.refresh(item)
+        await workflow_cache.invalidate(n_number)
+        await workflow_events.publish_items("updated", [item], previous)
         
         logger.info(
             "Assigned editor",
@@ -216,4 +331,152 @@ class WorkflowService:
             editor=editor
         )
         
-        return item
\ No newline at end of file
+        return item
+    
+    async def bulk_update_status(
+        self,
+        status: WorkflowStatus,
+        n_numbers: Optional[List[str]] = None,
+        filter_status: Optional[WorkflowStatus] = None,
+        assigned_editor: Optional[str] = None,
+        limit: int = 1000,
+        source: WebhookSource = WebhookSource.SYSTEM,
+        changed_by: Optional[str] = None
+    ) -> BulkUpdateResult:
+        """複数アイテムのステータスをまとめて更新
+        
+        対象はN番号のリストまたはフィルタ（filter_status, assigned_editor）で指定する。
+        対象の現在のステータスを1回のSELECTで読み、遷移の妥当性は
+        can_transition_toでメモリ上で判定する。遷移できるアイテムだけを
+        UPDATE ... WHERE n_number IN (...) RETURNINGの1文で更新し、ステータス履歴も
+        1文のINSERTで同じトランザクションに追記する。
+        UPDATEは読んだステータスのままであることも条件にするため、判定の後に
+        別の更新でステータスが変わったアイテムは更新されず、履歴の遷移元は
+        常に実際の変更前のステータスになる。
+        """
+        result = await self._select_bulk_targets(n_numbers, filter_status, assigned_editor, limit)
+        
+        targets = []
+        for n_number, row in result.before.items():
+            if row.status == status:
+                result.unchanged.append(n_number)
+            elif row.status.can_transition_to(status):
+                targets.append(n_number)
+            else:
+                result.rejected.append((n_number, row.status))
+        
+        if targets:
+            now = datetime.utcnow()
+            result.items = await self._bulk_update(
+                targets,
+                {"status": status, "due_at": due_at_for(status, now), "updated_at": now},
+                tuple_(WorkflowItem.n_number, WorkflowItem.status).in_(
+                    [(n_number, result.before[n_number].status) for n_number in targets]
+                )
+            )
+            await add_status_transitions(
+                self.db,
+                [(item.n_number, result.before[item.n_number].status, item.status) for item in result.items],
+                source=source,
+                changed_by=changed_by
+            )
+        await self._commit_bulk(result)
+        
+        logger.info(
+            "Bulk updated workflow status",
+            status=status.value,
+            updated=len(result.items),
+            unchanged=len(result.unchanged),
+            rejected=len(result.rejected),
+            not_found=len(result.not_found)
+        )
+        
+        return result
+    
+    async def bulk_assign_editor(
+        self,
+        editor: str,
+        n_numbers: Optional[List[str]] = None,
+        filter_status: Optional[WorkflowStatus] = None,
+        assigned_editor: Optional[str] = None,
+        limit: int = 1000
+    ) -> BulkUpdateResult:
+        """複数アイテムに編集者をまとめて割り当て
+        
+        対象の指定と更新の方法はbulk_update_statusと同じ。すでに同じ編集者が
+        割り当てられているアイテムは更新しない。
+        """
+        result = await self._select_bulk_targets(n_numbers, filter_status, assigned_editor, limit)
+        
+        targets = []
+        for n_number, row in result.before.items():
+            if row.assigned_editor == editor:
+                result.unchanged.append(n_number)
+            else:
+                targets.append(n_number)
+        
+        if targets:
+            result.items = await self._bulk_update(
+                targets,
+                {"assigned_editor": editor, "updated_at": datetime.utcnow()},
+                WorkflowItem.assigned_editor.is_distinct_from(editor)
+            )
+        await self._commit_bulk(result)
+        
+        logger.info(
+            "Bulk assigned editor",
+            editor=editor,
+            updated=len(result.items),
+            unchanged=len(result.unchanged),
+            not_found=len(result.not_found)
+        )
+        
+        return result
+    
+    async def _select_bulk_targets(
+        self,
+        n_numbers: Optional[List[str]],
+        status: Optional[WorkflowStatus],
+        assigned_editor: Optional[str],
+        limit: int
+    ) -> BulkUpdateResult:
+        """一括更新の対象と変更前の値を取得（上限を超える場合はエラー）"""
+        query = select(WorkflowItem.n_number, WorkflowItem.status, WorkflowItem.assigned_editor)
+        if n_numbers is not None:
+            n_numbers = list(dict.fromkeys(n_numbers))
+            if len(n_numbers) > limit:
+                raise ValidationError(f"対象が多すぎます（最大{limit}件）", field="n_numbers")
+            query = query.where(WorkflowItem.n_number.in_(n_numbers))
+        else:
+            if status is not None:
+                query = query.where(WorkflowItem.status == status)
+            if assigned_editor is not None:
+                query = query.where(WorkflowItem.assigned_editor == assigned_editor)
+        
+        result = await self.db.execute(query.order_by(WorkflowItem.n_number).limit(limit + 1))
+        before = {row.n_number: row for row in result.all()}
+        if len(before) > limit:
+            raise ValidationError(f"対象が多すぎます（最大{limit}件）", field="filter")
+        
+        not_found = [n_number for n_number in n_numbers if n_number not in before] if n_numbers else []
+        return BulkUpdateResult(before, not_found)
+    
+    async def _bulk_update(self, n_numbers: List[str], values: Dict[str, Any], *conditions: Any) -> List[WorkflowItem]:
+        """UPDATE ... WHERE n_number IN (...) RETURNINGを実行"""
+        result = await self.db.execute(
+            update(WorkflowItem)
+            .where(WorkflowItem.n_number.in_(n_numbers), *conditions)
+            .values(**values)
+            .returning(WorkflowItem),
+            execution_options={"synchronize_session": False, "populate_existing": True}
+        )
+        return sorted(result.scalars().all(), key=lambda item: item.n_number)
+    
+    async def _commit_bulk(self, result: BulkUpdateResult) -> None:
+        """一括更新をコミットし、キャッシュの無効化と変更イベントの発行を行う"""
+        await self.db.commit()
+        await workflow_cache.invalidate(*(item.n_number for item in result.items))
+        await workflow_events.publish(
+            WorkflowEvent.from_item("updated", item, result.previous(item.n_number))
+            for item in result.items
+        )
@@ -0,0 +1,233 @@
+"""ワークフローアイテムの読み取りキャッシュ
+
+`/status N番号` と `GET /api/v1/progress/{n_number}` は同じアイテムを
+何度も参照するため、シリアライズ済みのWorkflowItemResponse（JSON）を
+プロセス内のLRUとRedisの2段でキャッシュする。
+
+- 参照はプロセス内LRU → Redis → データベースの順（read-through）
+- 書き込み（WorkflowServiceとapp.crud.workflow）はコミット後に該当N番号を無効化する
+- 他のワーカーでの無効化はプロセス内LRUに届かないため、LRUのTTLは短くして
+  古い内容が見える時間を抑える
+- Redisに接続できない場合はプロセス内LRUとデータベースだけで処理を続行する
+
+無効化のたびにテーブル全体の変更バージョンを進めるため、バージョンが
+変わっていなければ一覧・詳細の内容も変わっていない（ETagに使う）。
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+import structlog
+
+from app.core.config import settings
+from app.core.redis import get_redis
+from app.models.workflow import WorkflowItem
+from app.schemas.progress import WorkflowItemResponse
+
+logger = structlog.get_logger(__name__)
+
+KEY_PREFIX = "techbridge:workflow:item"
+VERSION_KEY = "techbridge:workflow:version"
+
+ItemLoader = Callable[[], Awaitable[Optional[WorkflowItem]]]
+
+
+def serialize_item(item: WorkflowItem) -> str:
+    """アイテムをAPIレスポンスと同じJSONにシリアライズ"""
+    return WorkflowItemResponse.model_validate(item).model_dump_json()
+
+
+class WorkflowItemCache:
+    """N番号をキーにしたWorkflowItemResponse（JSON）のキャッシュ"""
+
+    def __init__(
+        self,
+        redis_factory: Optional[Callable[[], Awaitable[Redis]]] = get_redis,
+        ttl_seconds: int = 300,
+        local_max_items: int = 1000,
+        local_ttl_seconds: float = 5.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.redis_factory = redis_factory
+        self.ttl_seconds = ttl_seconds
+        self.local_max_items = local_max_items
+        self.local_ttl_seconds = local_ttl_seconds
+        self.clock = clock
+        # N番号 -> (有効期限, JSON)
+        self._local: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        # 無効化の回数（読み込み中に更新されたアイテムを書き戻さないために使う）
+        self._generation = 0
+        self.local_hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def key(n_number: str) -> str:
+        return f"{KEY_PREFIX}:{n_number}"
+
+    def _get_local(self, n_number: str) -> Optional[str]:
+        entry = self._local.get(n_number)
+        if entry is None:
+            return None
+        expires_at, payload = entry
+        if expires_at <= self.clock():
+            del self._local[n_number]
+            return None
+        self._local.move_to_end(n_number)
+        return payload
+
+    def _set_local(self, n_number: str, payload: str) -> None:
+        self._local[n_number] = (self.clock() + self.local_ttl_seconds, payload)
+        self._local.move_to_end(n_number)
+        while len(self._local) > self.local_max_items:
+            self._local.popitem(last=False)
+
+    async def get(self, n_number: str) -> Optional[str]:
+        """キャッシュ済みのJSONを取得（なければNone）"""
+        payload = self._get_local(n_number)
+        if payload is not None:
+            self.local_hits += 1
+            return payload
+
+        if self.redis_factory is not None:
+            try:
+                redis = await self.redis_factory()
+                payload = await redis.get(self.key(n_number))
+            except (RedisError, OSError) as e:
+                logger.warning("Workflow cache read failed", n_number=n_number, error=str(e))
+                payload = None
+            if payload is not None:
+                self.redis_hits += 1
+                self._set_local(n_number, payload)
+                return payload
+
+        self.misses += 1
+        return None
+
+    async def set(self, n_number: str, payload: str) -> None:
+        """JSONを保存"""
+        self._set_local(n_number, payload)
+        if self.redis_factory is None:
+            return
+        try:
+            redis = await self.redis_factory()
+            await redis.set(self.key(n_number), payload, ex=self.ttl_seconds)
+        except (RedisError, OSError) as e:
+            logger.warning("Workflow cache write failed", n_number=n_number, error=str(e))
+
+    async def get_or_load(self, n_number: str, loader: ItemLoader) -> Optional[str]:
+        """キャッシュから取得し、なければloaderでデータベースから読み込んで保存"""
+        payload = await self.get(n_number)
+        if payload is not None:
+            return payload
+
+        generation = self._generation
+        item = await loader()
+        if item is None:
+            return None
+
+        payload = serialize_item(item)
+        # 読み込み中に無効化された場合は古い内容の可能性があるため保存しない
+        if generation == self._generation:
+            await self.set(n_number, payload)
+        return payload
+
+    async def get_item(self, n_number: str, loader: ItemLoader) -> Optional[WorkflowItemResponse]:
+        """キャッシュ経由でアイテムを取得"""
+        payload = await self.get_or_load(n_number, loader)
+        if payload is None:
+            return None
+        return WorkflowItemResponse.model_validate_json(payload)
+
+    async def invalidate(self, *n_numbers: str) -> None:
+        """指定したN番号のキャッシュを削除（書き込みのコミット後に呼ぶ）"""
+        if not n_numbers:
+            return
+        self._generation += 1
+        self.invalidations += len(n_numbers)
+        for n_number in n_numbers:
+            self._local.pop(n_number, None)
+
+        if self.redis_factory is None:
+            return
+        try:
+            redis = await self.redis_factory()
+            await redis.delete(VERSION_KEY, *(self.key(n_number) for n_number in n_numbers))
+        except (RedisError, OSError) as e:
+            logger.warning("Workflow cache invalidation failed", n_numbers=list(n_numbers), error=str(e))
+
+    async def version(self) -> Optional[str]:
+        """ワークフローアイテム全体の変更バージョン（書き込みのたびに変わる）
+
+        Redisでは書き込み時にバージョンを削除し、次の参照時に現在時刻で
+        作り直す。TTLを付けるため、アプリ外で直接更新された場合も
+        ttl_seconds以内にバージョンが変わる。
+        Redisを使わない場合や読めない場合はNone（プロセス内の値では他の
+        ワーカーでの書き込みが分からないため、ETagに使わない）。
+        """
+        if self.redis_factory is not None:
+            try:
+                redis = await self.redis_factory()
+                version = await redis.get(VERSION_KEY)
+                if version is None:
+                    seed = str(time.time_ns() // 1000)
+                    if await redis.set(VERSION_KEY, seed, nx=True, ex=self.ttl_seconds):
+                        version = seed
+                    else:
+                        version = await redis.get(VERSION_KEY) or seed
+                return f"r{version}"
+            except (RedisError, OSError) as e:
+                logger.warning("Workflow version read failed", error=str(e))
+        return None
+
+    def clear(self) -> None:
+        """プロセス内のキャッシュと統計をリセット"""
+        self._local.clear()
+        self._generation += 1
+        self.local_hits = self.redis_hits = self.misses = self.invalidations = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """ヒット・ミスの統計"""
+        hits = self.local_hits + self.redis_hits
+        lookups = hits + self.misses
+        return {
+            "hits": hits,
+            "local_hits": self.local_hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+            "invalidations": self.invalidations,
+            "local_size": len(self._local),
+        }
+
+
+class NullWorkflowItemCache(WorkflowItemCache):
+    """キャッシュ無効時の実装（常にloaderで読み込む）"""
+
+    async def get(self, n_number: str) -> Optional[str]:
+        self.misses += 1
+        return None
+
+    async def set(self, n_number: str, payload: str) -> None:
+        return None
+
+
+def create_workflow_cache() -> WorkflowItemCache:
+    """設定値からキャッシュを生成"""
+    backend = settings.WORKFLOW_CACHE_BACKEND
+    if backend not in ("redis", "memory"):
+        return NullWorkflowItemCache(redis_factory=None)
+    return WorkflowItemCache(
+        redis_factory=get_redis if backend == "redis" else None,
+        ttl_seconds=settings.WORKFLOW_CACHE_TTL_SECONDS,
+        local_max_items=settings.WORKFLOW_CACHE_LOCAL_MAX_ITEMS,
+        local_ttl_seconds=settings.WORKFLOW_CACHE_LOCAL_TTL_SECONDS,
+    )
+
+
+# プロセス内で共有するキャッシュ
+workflow_cache = create_workflow_cache()
@@ -0,0 +1,345 @@
+"""ワークフロー変更イベントの配信（Server-Sent Events用）
+
+WorkflowServiceとapp.crud.workflowの書き込みはコミット後に変更イベントを
+発行し、`GET /api/v1/progress/stream` の接続へ差分として配信する。
+
+- Redisではイベントを上限付きのストリームに追記してIDを採番し、同じ内容を
+  Pub/Subチャンネルへ送る。各プロセスは1つの購読でイベントを受け取り、
+  プロセス内の接続へ振り分ける
+- 再接続時はLast-Event-IDより後のイベントをストリームから再送する
+  （保持件数を超えて古い場合は一覧の再取得を促す）
+- 発行に失敗しても書き込み自体は失敗させない
+"""
+
+import asyncio
+import json
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+import structlog
+
+from app.core.config import settings
+from app.core.redis import get_redis
+from app.models.workflow import WorkflowItem
+from app.schemas.progress import WorkflowItemResponse
+
+logger = structlog.get_logger(__name__)
+
+STREAM_KEY = "techbridge:workflow:events"
+CHANNEL = "techbridge:workflow:events"
+
+# 切断時にクライアント（EventSource）が再接続するまでの時間
+RETRY_MILLISECONDS = 3000
+
+EventId = Tuple[int, int]
+
+
+def parse_event_id(event_id: Optional[str]) -> Optional[EventId]:
+    """イベントID（"ミリ秒-連番"）を比較用のタプルに変換（不正ならNone）"""
+    if not event_id:
+        return None
+    ms, _, seq = event_id.strip().partition("-")
+    try:
+        return int(ms), int(seq or 0)
+    except ValueError:
+        return None
+
+
+def snapshot(item: WorkflowItem) -> Dict[str, Any]:
+    """フィルタに使う変更前の値"""
+    return {
+        "status": item.status.value if item.status else None,
+        "assigned_editor": item.assigned_editor,
+    }
+
+
+class WorkflowEvent:
+    """1件の変更イベント"""
+
+    def __init__(
+        self,
+        event_type: str,
+        item: Dict[str, Any],
+        previous: Optional[Dict[str, Any]] = None,
+        event_id: Optional[str] = None
+    ):
+        self.type = event_type
+        self.item = item
+        self.previous = previous
+        self.id = event_id
+
+    @classmethod
+    def from_item(
+        cls,
+        event_type: str,
+        item: WorkflowItem,
+        previous: Optional[Dict[str, Any]] = None
+    ) -> "WorkflowEvent":
+        return cls(event_type, WorkflowItemResponse.model_validate(item).model_dump(mode="json"), previous)
+
+    @classmethod
+    def from_json(cls, event_id: str, raw: str) -> "WorkflowEvent":
+        data = json.loads(raw)
+        return cls(data["type"], data["item"], data.get("previous"), event_id)
+
+    def to_json(self) -> str:
+        data = {"type": self.type, "item": self.item}
+        if self.previous is not None:
+            data["previous"] = self.previous
+        return json.dumps(data, ensure_ascii=False)
+
+    def matches(self, status: Optional[str] = None, assigned_editor: Optional[str] = None) -> bool:
+        """フィルタに一致するか（変更前の値が分かる場合はどちらかが一致すればよい）"""
+        candidates = [self.item] + ([self.previous] if self.previous else [])
+        return any(
+            (status is None or values.get("status") == status)
+            and (assigned_editor is None or values.get("assigned_editor") == assigned_editor)
+            for values in candidates
+        )
+
+    def to_sse(self) -> str:
+        """SSEのメッセージ形式"""
+        payload = json.dumps(
+            {"type": self.type, "n_number": self.item.get("n_number"), "item": self.item, "previous": self.previous},
+            ensure_ascii=False
+        )
+        return f"id: {self.id}\nevent: {self.type}\ndata: {payload}\n\n"
+
+    def __repr__(self) -> str:
+        return f"<WorkflowEvent({self.id}: {self.type} {self.item.get('n_number')})>"
+
+
+class Subscription:
+    """1接続分の受信キュー"""
+
+    def __init__(self, maxsize: int):
+        self.queue: "asyncio.Queue[WorkflowEvent]" = asyncio.Queue(maxsize=maxsize)
+        # 受信が追いつかずイベントを取りこぼした（再接続して再送を受ける）
+        self.overflowed = False
+
+    def put(self, event: WorkflowEvent) -> None:
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+
+class InMemoryEventLog:
+    """プロセス内のイベント履歴（Redisを使わない場合、配信も同じプロセス内のみ）"""
+
+    local = True
+
+    def __init__(self, max_len: int = 1000):
+        self._events: Deque[WorkflowEvent] = deque(maxlen=max_len)
+        self._counter = 0
+
+    async def append(self, events: List[WorkflowEvent]) -> None:
+        for event in events:
+            self._counter += 1
+            event.id = f"{self._counter}-0"
+            self._events.append(event)
+
+    async def since(self, last_id: EventId) -> Optional[List[WorkflowEvent]]:
+        """last_idより後のイベント（履歴から消えている、または未知のIDならNone）"""
+        if last_id > (self._counter, 0):
+            return None
+        if self._events and parse_event_id(self._events[0].id)[0] > last_id[0] + 1:
+            return None
+        return [event for event in self._events if parse_event_id(event.id) > last_id]
+
+
+class RedisEventLog:
+    """Redisストリーム（履歴）とPub/Sub（配信）"""
+
+    local = False
+
+    def __init__(self, redis_factory=get_redis, max_len: int = 1000):
+        self.redis_factory = redis_factory
+        self.max_len = max_len
+
+    async def append(self, events: List[WorkflowEvent]) -> None:
+        redis: Redis = await self.redis_factory()
+        raws = [event.to_json() for event in events]
+        async with redis.pipeline(transaction=False) as pipe:
+            for raw in raws:
+                pipe.xadd(STREAM_KEY, {"event": raw}, maxlen=self.max_len, approximate=True)
+            event_ids = await pipe.execute()
+
+        async with redis.pipeline(transaction=False) as pipe:
+            for event, event_id, raw in zip(events, event_ids, raws):
+                event.id = event_id
+                pipe.publish(CHANNEL, json.dumps({"id": event_id, "event": raw}, ensure_ascii=False))
+            await pipe.execute()
+
+    async def since(self, last_id: EventId) -> Optional[List[WorkflowEvent]]:
+        """last_idより後のイベント（履歴から消えている場合はNone）"""
+        redis: Redis = await self.redis_factory()
+        oldest = await redis.xrange(STREAM_KEY, count=1)
+        newest = await redis.xrevrange(STREAM_KEY, count=1)
+        if not newest or parse_event_id(newest[0][0]) < last_id:
+            return None
+        if parse_event_id(oldest[0][0]) > last_id:
+            # 最古より前のIDは、その間のイベントが削除済みの可能性がある
+            return None
+        entries = await redis.xrange(STREAM_KEY, min=f"({last_id[0]}-{last_id[1]}")
+        return [WorkflowEvent.from_json(event_id, fields["event"]) for event_id, fields in entries]
+
+    async def listen(self) -> AsyncIterator[WorkflowEvent]:
+        redis: Redis = await self.redis_factory()
+        pubsub = redis.pubsub()
+        await pubsub.subscribe(CHANNEL)
+        try:
+            async for message in pubsub.listen():
+                if message.get("type") != "message":
+                    continue
+                data = json.loads(message["data"])
+                yield WorkflowEvent.from_json(data["id"], data["event"])
+        finally:
+            await pubsub.unsubscribe(CHANNEL)
+            await pubsub.close()
+
+
+class WorkflowEventBroker:
+    """変更イベントの発行とプロセス内の接続への振り分け"""
+
+    def __init__(self, log=None, queue_size: int = 100):
+        self.log = log or InMemoryEventLog()
+        self.queue_size = queue_size
+        self._subscriptions: Set[Subscription] = set()
+        self._listener: Optional[asyncio.Task] = None
+
+    async def publish(self, events: Iterable[WorkflowEvent]) -> None:
+        """イベントを発行（失敗してもログのみ）"""
+        events = list(events)
+        if not events:
+            return
+        try:
+            await self.log.append(events)
+        except (RedisError, OSError) as e:
+            logger.warning("Failed to publish workflow events", count=len(events), error=str(e))
+            return
+
+        if self.log.local:
+            for event in events:
+                self._dispatch(event)
+
+    async def publish_items(
+        self,
+        event_type: str,
+        items: Iterable[WorkflowItem],
+        previous: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """ワークフローアイテムの変更を発行"""
+        await self.publish(WorkflowEvent.from_item(event_type, item, previous) for item in items)
+
+    def subscribe(self) -> Subscription:
+        """受信を開始（初回の購読でRedisの受信タスクを起動）"""
+        subscription = Subscription(self.queue_size)
+        self._subscriptions.add(subscription)
+        if not self.log.local and self._listener is None:
+            self._listener = asyncio.create_task(self._listen(), name="workflow-event-listener")
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._subscriptions.discard(subscription)
+
+    async def replay(self, last_event_id: Optional[str]) -> Optional[List[WorkflowEvent]]:
+        """Last-Event-IDより後のイベント（再送できない場合はNone）"""
+        last_id = parse_event_id(last_event_id)
+        if last_id is None:
+            return []
+        try:
+            return await self.log.since(last_id)
+        except (RedisError, OSError) as e:
+            logger.warning("Failed to replay workflow events", last_event_id=last_event_id, error=str(e))
+            return None
+
+    async def stream(
+        self,
+        last_event_id: Optional[str] = None,
+        status: Optional[str] = None,
+        assigned_editor: Optional[str] = None,
+        heartbeat_seconds: float = 15.0,
+        is_disconnected: Optional[Callable[[], Awaitable[bool]]] = None
+    ) -> AsyncIterator[str]:
+        """SSEのメッセージを生成
+
+        購読を開始してからLast-Event-ID以降を再送するため、再送と配信の
+        間のイベントも欠落しない（重複はIDで除外する）。再送できない場合は
+        resetイベントを送り、クライアントに一覧を再取得させる。
+        """
+        subscription = self.subscribe()
+        try:
+            yield f"retry: {RETRY_MILLISECONDS}\n\n"
+
+            last_id = parse_event_id(last_event_id)
+            backlog = await self.replay(last_event_id)
+            if backlog is None:
+                yield 'event: reset\ndata: {"reason": "history_unavailable"}\n\n'
+                last_id = None
+            else:
+                for event in backlog:
+                    last_id = parse_event_id(event.id)
+                    if event.matches(status, assigned_editor):
+                        yield event.to_sse()
+
+            while not (subscription.overflowed and subscription.queue.empty()):
+                try:
+                    event = await asyncio.wait_for(subscription.queue.get(), timeout=heartbeat_seconds)
+                except asyncio.TimeoutError:
+                    if is_disconnected is not None and await is_disconnected():
+                        return
+                    yield ": heartbeat\n\n"
+                    continue
+
+                event_id = parse_event_id(event.id)
+                if last_id is not None and event_id is not None and event_id <= last_id:
+                    continue
+                last_id = event_id
+                if event.matches(status, assigned_editor):
+                    yield event.to_sse()
+
+            # 受信が追いつかなかった接続は切断し、Last-Event-IDで再接続させる
+            logger.warning("Workflow event stream overflowed", queue_size=self.queue_size)
+        finally:
+            self.unsubscribe(subscription)
+
+    def _dispatch(self, event: WorkflowEvent) -> None:
+        for subscription in list(self._subscriptions):
+            subscription.put(event)
+
+    async def _listen(self) -> None:
+        """Pub/Subのイベントをプロセス内の接続へ振り分ける（切断時は再接続）"""
+        while True:
+            try:
+                async for event in self.log.listen():
+                    self._dispatch(event)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Workflow event listener error", error=str(e))
+            await asyncio.sleep(1.0)
+
+    async def stop(self) -> None:
+        """受信タスクを停止"""
+        if self._listener is not None:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+            self._listener = None
+
+
+def create_event_broker() -> WorkflowEventBroker:
+    """設定値からブローカーを生成"""
+    if settings.WORKFLOW_EVENTS_BACKEND == "redis":
+        log = RedisEventLog(max_len=settings.WORKFLOW_EVENTS_MAX_LEN)
+    else:
+        log = InMemoryEventLog(max_len=settings.WORKFLOW_EVENTS_MAX_LEN)
+    return WorkflowEventBroker(log, queue_size=settings.WORKFLOW_EVENTS_QUEUE_SIZE)
+
+
+# プロセス内で共有するブローカー
+workflow_events = create_event_broker()
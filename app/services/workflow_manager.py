@@ -5,7 +5,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.crud import workflow as workflow_crud
 from app.models.workflow import WorkflowItem
-from app.models.enums import ProgressStatus as WorkflowStatus
+from app.models.enums import ProgressStatus as WorkflowStatus, WebhookSource
 from app.schemas.progress import WorkflowItemCreate, WorkflowItemUpdate
 
 
@@ -49,11 +49,15 @@ class WorkflowManager:
         self,
         n_number: str,
         status: WorkflowStatus,
-        workflow_metadata: Optional[Dict[str, Any]] = None
+        workflow_metadata: Optional[Dict[str, Any]] = None,
+        source: WebhookSource = WebhookSource.SYSTEM,
+        changed_by: Optional[str] = None,
+        comment: Optional[str] = None
     ) -> Optional[WorkflowItem]:
         """Update workflow status."""
         return await workflow_crud.update_workflow_status(
-            self.db, n_number, status, workflow_metadata
+            self.db, n_number, status, workflow_metadata,
+            source=source, changed_by=changed_by, comment=comment
         )
     
     async def assign_editor(self, n_number: str, editor: str) -> Optional[WorkflowItem]:
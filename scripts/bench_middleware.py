@@ -0,0 +1,154 @@
+"""ミドルウェアのマイクロベンチマーク
+
+旧構成（BaseHTTPMiddleware x3: RequestID / Logging / RateLimit）と
+RequestContextMiddleware（純粋なASGI 1層）で、同じエンドポイントに
+ASGIで直接リクエストを投げたときの1リクエストあたりの処理時間を比較する。
+
+    python scripts/bench_middleware.py [リクエスト数]
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import structlog
+from starlette.applications import Starlette
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from app.core.logging import log_request_response
+from app.middleware.rate_limit import RateLimiter, RateLimitPolicy
+from app.middleware.request_context import RequestContextMiddleware
+
+# 計測対象はミドルウェアのオーバーヘッドのみ（ログ出力は捨てる）
+structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.CRITICAL))
+
+REQUESTS_PER_MINUTE = 10 ** 9
+BURST_SIZE = 10 ** 9
+
+
+def build_rate_limiter() -> RateLimiter:
+    return RateLimiter(RateLimitPolicy("bench", REQUESTS_PER_MINUTE, BURST_SIZE))
+
+
+async def endpoint(request):
+    return JSONResponse({"status": "ok"})
+
+
+def build_endpoint_app() -> Starlette:
+    return Starlette(routes=[Route("/bench", endpoint)])
+
+
+class LegacyRequestIDMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        request_id = request.headers.get("X-Request-ID", str(uuid.uuid4()))
+        request.state.request_id = request_id
+        structlog.contextvars.bind_contextvars(request_id=request_id)
+        try:
+            response = await call_next(request)
+            response.headers["X-Request-ID"] = request_id
+            return response
+        finally:
+            structlog.contextvars.clear_contextvars()
+
+
+class LegacyLoggingMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        start_time = time.time()
+        response = await call_next(request)
+        log_request_response(
+            method=request.method,
+            path=request.url.path,
+            status_code=response.status_code,
+            duration_ms=(time.time() - start_time) * 1000,
+        )
+        return response
+
+
+class LegacyRateLimitMiddleware(BaseHTTPMiddleware):
+    def __init__(self, app):
+        super().__init__(app)
+        self.rate_limiter = build_rate_limiter()
+
+    async def dispatch(self, request, call_next):
+        client_id = self.rate_limiter.client_id(
+            request.headers.get("X-API-Key"), request.client.host if request.client else None
+        )
+        await self.rate_limiter.hit(self.rate_limiter.default_policy, client_id)
+        response = await call_next(request)
+        response.headers["X-RateLimit-Limit"] = str(REQUESTS_PER_MINUTE)
+        return response
+
+
+def build_legacy_app():
+    app = build_endpoint_app()
+    app.add_middleware(LegacyLoggingMiddleware)
+    app.add_middleware(LegacyRequestIDMiddleware)
+    app.add_middleware(LegacyRateLimitMiddleware)
+    return app
+
+
+def build_fused_app():
+    app = build_endpoint_app()
+    app.add_middleware(RequestContextMiddleware, rate_limiter=build_rate_limiter())
+    return app
+
+
+async def run(app, requests: int) -> float:
+    """requests回リクエストを処理し、1リクエストあたりのマイクロ秒を返す"""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/bench",
+        "raw_path": b"/bench",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("bench", 80),
+    }
+
+    async def send(message):
+        pass
+
+    async def request_once():
+        messages = [{"type": "http.request", "body": b"", "more_body": False}]
+
+        async def receive():
+            if messages:
+                return messages.pop()
+            return {"type": "http.disconnect"}
+
+        await app(dict(scope), receive, send)
+
+    # ウォームアップ
+    for _ in range(200):
+        await request_once()
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        await request_once()
+    return (time.perf_counter() - start) / requests * 1_000_000
+
+
+async def main(requests: int) -> None:
+    legacy = await run(build_legacy_app(), requests)
+    fused = await run(build_fused_app(), requests)
+
+    print(f"requests: {requests}")
+    print(f"BaseHTTPMiddleware x3    : {legacy:8.1f} us/req")
+    print(f"RequestContextMiddleware : {fused:8.1f} us/req")
+    print(f"speedup                  : {legacy / fused:8.2f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000))
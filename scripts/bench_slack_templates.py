@@ -0,0 +1,87 @@
+"""Slack通知メッセージ描画のマイクロベンチマーク
+
+通知ごとにstatus_jaとBlock Kitの構造を組み立て直す旧実装と、
+ラベルや固定ブロックを共有する描画関数（app.services.slack_templates）で
+ステータス更新通知1件あたりの描画時間を比較する。
+
+    python scripts/bench_slack_templates.py [件数]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.models.enums import ProgressStatus as WorkflowStatus
+from app.services.slack_templates import render_status_update
+
+
+def legacy_status_update(n_number, title, old_status, new_status):
+    """旧実装（SlackService.send_status_update内の組み立て）"""
+    status_ja = {
+        WorkflowStatus.DISCOVERED: "🔍 発見",
+        WorkflowStatus.PURCHASED: "💰 購入完了",
+        WorkflowStatus.MANUSCRIPT_REQUESTED: "✍️ 原稿依頼",
+        WorkflowStatus.MANUSCRIPT_RECEIVED: "📄 原稿受領",
+        WorkflowStatus.FIRST_PROOF: "📝 初校",
+        WorkflowStatus.SECOND_PROOF: "✏️ 再校",
+        WorkflowStatus.COMPLETED: "✅ 完成"
+    }
+
+    old_status_text = status_ja.get(old_status, old_status.value) if old_status else "なし"
+    new_status_text = status_ja.get(new_status, new_status.value)
+
+    blocks = [
+        {"type": "header", "text": {"type": "plain_text", "text": f"📊 進捗更新: {n_number}"}},
+        {
+            "type": "section",
+            "fields": [
+                {"type": "mrkdwn", "text": f"*タイトル:*\n{title}"},
+                {"type": "mrkdwn", "text": f"*N番号:*\n{n_number}"},
+                {"type": "mrkdwn", "text": f"*変更前:*\n{old_status_text}"},
+                {"type": "mrkdwn", "text": f"*変更後:*\n{new_status_text}"},
+            ]
+        }
+    ]
+    if new_status == WorkflowStatus.MANUSCRIPT_REQUESTED:
+        blocks.append({"type": "section", "text": {"type": "mrkdwn", "text": "📮 *著者への原稿依頼をお忘れなく！*"}})
+    elif new_status == WorkflowStatus.COMPLETED:
+        blocks.append({"type": "section", "text": {"type": "mrkdwn", "text": "🎉 *お疲れさまでした！編集作業が完了しました。*"}})
+
+    return f"進捗更新: {n_number} - {new_status_text}", blocks
+
+
+def template_status_update(n_number, title, old_status, new_status):
+    return render_status_update(n_number, title, [old_status, new_status])
+
+
+def run(render, count: int) -> float:
+    """count件描画し、1件あたりのマイクロ秒を返す"""
+    statuses = list(WorkflowStatus)
+    args = [
+        (f"N{i:05d}", f"技術書タイトル{i}", statuses[i % len(statuses)], statuses[(i + 1) % len(statuses)])
+        for i in range(count)
+    ]
+
+    for n_number, title, old_status, new_status in args[:1000]:
+        render(n_number, title, old_status, new_status)
+
+    start = time.perf_counter()
+    for n_number, title, old_status, new_status in args:
+        render(n_number, title, old_status, new_status)
+    return (time.perf_counter() - start) / count * 1_000_000
+
+
+def main(count: int) -> None:
+    legacy = run(legacy_status_update, count)
+    templates = run(template_status_update, count)
+
+    print(f"messages: {count}")
+    print(f"hand-built blocks   : {legacy:6.2f} us/msg")
+    print(f"slack_templates     : {templates:6.2f} us/msg")
+    print(f"speedup             : {legacy / templates:6.2f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -1,6 +1,7 @@
 import asyncio
 import os
 from typing import AsyncGenerator, Generator
+from unittest.mock import patch
 
 import pytest
 import pytest_asyncio
@@ -11,6 +12,7 @@ from sqlalchemy.orm import sessionmaker
 
 from app.core.database import Base, get_db
 from app.main import app
+from app.services.workflow_cache import workflow_cache
 
 # テスト用データベースURL
 TEST_DATABASE_URL = os.getenv(
@@ -25,6 +27,25 @@ TestSessionLocal = sessionmaker(
 )
 
 
+class InMemoryRedis:
+    """GET/SET/DELETEだけを実装したテスト用Redis"""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        return True
+
+    async def delete(self, *keys):
+        return sum(1 for key in keys if self.data.pop(key, None) is not None)
+
+
 @pytest.fixture(scope="session")
 def event_loop() -> Generator:
     """イベントループのフィクスチャ"""
@@ -36,6 +57,7 @@ def event_loop() -> Generator:
 @pytest_asyncio.fixture(scope="function")
 async def db_session() -> AsyncGenerator[AsyncSession, None]:
     """データベースセッションのフィクスチャ"""
+    workflow_cache.clear()
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.drop_all)
         await conn.run_sync(Base.metadata.create_all)
@@ -69,6 +91,28 @@ async def async_client(override_get_db) -> AsyncGenerator[AsyncClient, None]:
         yield ac
 
 
+
+@pytest.fixture
+def no_rate_limit():
+    """レート制限を無効化（エンドポイントを連続で呼ぶテスト用）"""
+    with patch('app.middleware.rate_limit.RateLimiter.policy_for', return_value=None):
+        yield
+
+@pytest.fixture
+def redis():
+    return InMemoryRedis()
+
+
+@pytest.fixture
+def shared_cache(redis):
+    """テスト中は共有キャッシュのRedisをインメモリ実装に差し替え"""
+    async def redis_factory():
+        return redis
+
+    with patch.object(workflow_cache, "redis_factory", redis_factory):
+        yield workflow_cache
+
+
 @pytest.fixture
 def mock_slack_token():
     """Slackトークンのモック"""
@@ -0,0 +1,113 @@
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy import select, text
+
+from app.crud.workflow import get_notification_history
+from app.models.enums import NotificationStatus, ProgressStatus
+from app.models.workflow import WorkflowItem
+from app.services.delay_alerts import DelayAlertScheduler
+from app.services.slack_templates import render_delay_alert
+from app.services.workflow import WorkflowService
+from tests.conftest import TestSessionLocal
+
+SLA_PURCHASED = timedelta(hours=72)
+
+
+def make_scheduler(slack_service, now, batch_size=100):
+    return DelayAlertScheduler(
+        slack_service_factory=lambda: slack_service,
+        session_factory=TestSessionLocal,
+        batch_size=batch_size,
+        clock=lambda: now,
+    )
+
+
+@pytest.mark.asyncio
+async def test_due_at_follows_status_transitions(db_session):
+    service = WorkflowService(db_session)
+    item = await service.create_or_update(n_number="N00001", status=ProgressStatus.PURCHASED)
+    due_at = item.due_at
+    assert abs(due_at - datetime.utcnow() - SLA_PURCHASED) < timedelta(minutes=1)
+
+    # 同じステータスの再送では期限を延ばさない
+    item = await service.create_or_update(n_number="N00001", status=ProgressStatus.PURCHASED, title="本")
+    assert item.due_at == due_at
+
+    item = await service.update_status("N00001", ProgressStatus.COMPLETED)
+    assert item.due_at is None
+    item = await service.create_or_update(n_number="N00001", status=ProgressStatus.FIRST_PROOF)
+    assert item.due_at > due_at
+
+
+@pytest.mark.asyncio
+async def test_scheduler_pops_only_overdue_items(db_session):
+    service = WorkflowService(db_session)
+    await service.bulk_create_or_update([
+        {"n_number": "N00001", "status": ProgressStatus.PURCHASED},
+        {"n_number": "N00002", "status": ProgressStatus.FIRST_PROOF},
+        {"n_number": "N00003", "status": ProgressStatus.COMPLETED},
+    ])
+    slack_service = MagicMock()
+    slack_service.send_delay_alert = AsyncMock(return_value=True)
+    scheduler = make_scheduler(slack_service, datetime.utcnow() + SLA_PURCHASED + timedelta(hours=1))
+
+    alerted = await scheduler.run_once()
+    again = await scheduler.run_once()
+
+    assert [item.n_number for item in alerted] == ["N00001"]
+    assert again == []
+    kwargs = slack_service.send_delay_alert.await_args.kwargs
+    assert kwargs["status"] == ProgressStatus.PURCHASED
+    assert kwargs["elapsed"] > SLA_PURCHASED
+
+    db_session.expire_all()
+    due = dict((await db_session.execute(select(WorkflowItem.n_number, WorkflowItem.due_at))).all())
+    assert due["N00001"] is None and due["N00002"] is not None
+    notifications = await get_notification_history(db_session, "N00001")
+    assert [n.status for n in notifications] == [NotificationStatus.SENT]
+    assert notifications[0].event_metadata["alert"] == "delay"
+
+
+
+@pytest.mark.asyncio
+async def test_failed_alert_is_retried(db_session):
+    await WorkflowService(db_session).create_or_update(n_number="N00001", status=ProgressStatus.PURCHASED)
+    slack_service = MagicMock()
+    slack_service.send_delay_alert = AsyncMock(side_effect=[False, True])
+    now = datetime.utcnow() + SLA_PURCHASED + timedelta(hours=1)
+
+    failed = await make_scheduler(slack_service, now).run_once()
+    too_early = await make_scheduler(slack_service, now + timedelta(minutes=1)).run_once()
+    retried = await make_scheduler(slack_service, now + timedelta(hours=1)).run_once()
+
+    assert [item.n_number for item in failed] == ["N00001"]
+    assert too_early == []
+    assert [item.n_number for item in retried] == ["N00001"]
+    notifications = await get_notification_history(db_session, "N00001")
+    assert sorted(n.status for n in notifications) == sorted([NotificationStatus.FAILED, NotificationStatus.SENT])
+    db_session.expire_all()
+    assert (await db_session.execute(select(WorkflowItem.due_at))).scalar_one() is None
+
+@pytest.mark.asyncio
+async def test_overdue_lookup_uses_due_at_index(db_session):
+    plan = await db_session.execute(text(
+        "EXPLAIN QUERY PLAN SELECT id FROM workflow_items "
+        "WHERE due_at IS NOT NULL AND due_at <= '2030-01-01' ORDER BY due_at LIMIT 100"
+    ))
+    details = " ".join(row[-1] for row in plan)
+
+    assert "ix_workflow_items_due_at" in details
+    assert "TEMP B-TREE" not in details
+
+
+def test_render_delay_alert():
+    text_, blocks = render_delay_alert(
+        "N00001", "本", ProgressStatus.PURCHASED, timedelta(days=3, hours=5), SLA_PURCHASED
+    )
+
+    assert text_.startswith("遅延アラート: N00001")
+    fields = [field["text"] for field in blocks[1]["fields"]]
+    assert "*経過:*\n3日5時間" in fields
+    assert "*目安:*\n3日" in fields
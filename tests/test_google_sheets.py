@@ -0,0 +1,251 @@
+import asyncio
+import threading
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from googleapiclient.errors import HttpError
+
+from app.services.google_sheets import (
+    AsyncGoogleSheetsService,
+    AsyncSingleFlight,
+    GoogleSheetsService,
+    NCodeIndex,
+    SingleFlight,
+)
+
+
+SHEET_VALUES = [
+    ["N番号", "タイトル", "リポジトリ", "チャンネル"],
+    ["N99999", "テスト技術書", "n99999-test-book", "test-channel"],
+    ["n99998", "別の技術書", "n99998-another-book"],
+    ["N99997", "リポジトリなし", ""],
+    ["N99999", "重複行", "n99999-duplicate", "duplicate-channel"],
+]
+
+
+@pytest.fixture
+def sheets_api():
+    """Google Sheets APIのモック"""
+    with patch('app.services.google_sheets.build') as mock_build, \
+            patch('app.services.google_sheets.service_account'):
+        mock_service = MagicMock()
+        mock_build.return_value = mock_service
+        mock_get = mock_service.spreadsheets.return_value.values.return_value.get
+        mock_get.return_value.execute.return_value = {"values": SHEET_VALUES}
+        yield mock_get
+
+
+@pytest.fixture
+def sheets_service(sheets_api):
+    """インデックスを初期化したGoogleSheetsService"""
+    service = GoogleSheetsService()
+    service.invalidate_index()
+    yield service
+    service.invalidate_index()
+
+
+def test_search_n_code_uses_index(sheets_service, sheets_api):
+    """複数回の検索でもシート取得は1回のみ"""
+    result = sheets_service.search_n_code("N99999")
+    assert result == {
+        'row': 2,
+        'n_code': "N99999",
+        'repository_name': "n99999-test-book",
+        'channel_name': "test-channel"
+    }
+
+    # 小文字のN番号、チャンネル名なし（リポジトリ名で代替）
+    assert sheets_service.get_channel_name("N99998") == "n99998-another-book"
+    assert sheets_service.get_repository_name("n99999") == "n99999-test-book"
+
+    # リポジトリ名が空の行は見つからない扱い
+    assert sheets_service.search_n_code("N99997") is None
+
+    assert sheets_api.call_count == 1
+
+
+def test_index_shared_between_instances(sheets_service, sheets_api):
+    """インデックスはプロセス内のサービス間で共有される"""
+    sheets_service.search_n_code("N99999")
+
+    other = GoogleSheetsService()
+    assert other.index is sheets_service.index
+    assert other.search_n_code("N99998")["row"] == 3
+
+    assert sheets_api.call_count == 1
+
+
+def test_invalidate_forces_reload(sheets_service, sheets_api):
+    """invalidate後は次回検索で再取得する"""
+    sheets_service.search_n_code("N99999")
+    sheets_service.invalidate_index()
+    sheets_service.search_n_code("N99999")
+
+    assert sheets_api.call_count == 2
+
+
+def test_miss_refresh_is_throttled(sheets_service, sheets_api):
+    """未ヒット時の再読込は間隔を空けて行う"""
+    sheets_service.index.miss_refresh_seconds = 3600
+    assert sheets_service.search_n_code("N00000") is None
+    assert sheets_service.search_n_code("N00000") is None
+    assert sheets_api.call_count == 1
+
+    sheets_service.index.miss_refresh_seconds = 0
+    assert sheets_service.search_n_code("N00000") is None
+    assert sheets_api.call_count == 2
+
+
+def test_stale_index_refreshes_in_background():
+    """TTL切れのインデックスは古い値を返しつつ裏で再読込する"""
+    index = NCodeIndex(ttl_seconds=0, miss_refresh_seconds=3600)
+    index.lookup("N99999", lambda: SHEET_VALUES)
+
+    release = threading.Event()
+    loader = MagicMock(side_effect=lambda: release.wait(2) and [["N99999", "", "n99999-moved"]])
+
+    # 再読込の完了を待たずに古いエントリを返す
+    assert index.lookup("N99999", loader)["repository_name"] == "n99999-test-book"
+    release.set()
+
+    deadline = time.monotonic() + 2
+    while index._refreshing and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert loader.call_count == 1
+    index.ttl_seconds = 3600
+    assert index.lookup("N99999", loader)["repository_name"] == "n99999-moved"
+
+
+def test_single_flight_coalesces_concurrent_calls():
+    """同一キーの同時呼び出しは1回の実行結果を共有する"""
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def slow_call():
+        calls.append(1)
+        started.set()
+        release.wait(2)
+        return {"values": SHEET_VALUES}
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flight.do("key", slow_call)))
+    leader.start()
+    started.wait(2)
+
+    followers = [
+        threading.Thread(target=lambda: results.append(flight.do("key", slow_call)))
+        for _ in range(4)
+    ]
+    for thread in followers:
+        thread.start()
+    # 後続スレッドが待機に入るまで待つ
+    deadline = time.monotonic() + 2
+    while flight._calls["key"].waiters < 4 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    release.set()
+
+    for thread in [leader, *followers]:
+        thread.join(2)
+
+    assert len(calls) == 1
+    assert len(results) == 5
+    assert all(result is results[0] for result in results)
+
+    # 完了後は新たに実行される
+    flight.do("key", slow_call)
+    assert len(calls) == 2
+
+
+def test_single_flight_shares_errors():
+    """先行呼び出しの例外は待機中の呼び出しにも伝播する"""
+    flight = SingleFlight()
+
+    with pytest.raises(RuntimeError):
+        flight.do("key", MagicMock(side_effect=RuntimeError("boom")))
+
+    assert flight._calls == {}
+
+
+
+@pytest.mark.asyncio
+async def test_async_single_flight_survives_leader_cancellation():
+    """先行呼び出しがキャンセルされても待機中の呼び出しは結果を受け取る"""
+    flight = AsyncSingleFlight()
+    release = asyncio.Event()
+    calls = []
+
+    async def slow_call():
+        calls.append(1)
+        await release.wait()
+        return "value"
+
+    leader = asyncio.create_task(flight.do("key", slow_call))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(flight.do("key", slow_call))
+    await asyncio.sleep(0)
+    leader.cancel()
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await follower == "value"
+    assert leader.cancelled()
+    assert len(calls) == 1
+    assert flight._calls == {}
+
+@pytest.mark.asyncio
+async def test_async_search_n_code_shares_index(sheets_service, sheets_api):
+    """非同期版は同期版とインデックスを共有する"""
+    async_service = AsyncGoogleSheetsService(sheets_service)
+
+    result = await async_service.search_n_code("N99999")
+    assert result["repository_name"] == "n99999-test-book"
+    assert sheets_service.search_n_code("N99998")["row"] == 3
+    assert (await async_service.get_workflow_info("N99998"))["slack_channel"] == "n99998-another-book"
+
+    assert sheets_api.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_async_read_cell_coalesces_concurrent_reads(sheets_service, sheets_api):
+    """同じセルの同時読み取りは1回のAPI呼び出しにまとめる"""
+    async_service = AsyncGoogleSheetsService(sheets_service)
+    await async_service.search_n_code("N99999")
+
+    def fetch(**kwargs):
+        response = MagicMock()
+        if kwargs["range"] == "G2":
+            time.sleep(0.05)
+            response.execute.return_value = {"values": [["済"]]}
+        else:
+            response.execute.return_value = {"values": SHEET_VALUES}
+        return response
+
+    sheets_api.side_effect = fetch
+    values = await asyncio.gather(*[async_service.read_cell("N99999") for _ in range(5)])
+
+    assert values == ["済"] * 5
+    ranges = [call.kwargs["range"] for call in sheets_api.call_args_list]
+    assert ranges.count("G2") == 1
+
+
+@pytest.mark.asyncio
+async def test_async_retry_uses_asyncio_sleep(sheets_service, sheets_api):
+    """リトライ待機はasyncio.sleepで行う"""
+    async_service = AsyncGoogleSheetsService(sheets_service)
+    await async_service.search_n_code("N99999")
+
+    rate_limited = HttpError(MagicMock(status=429), b"rate limited")
+    mock_update = sheets_service.service.spreadsheets.return_value.values.return_value.update
+    mock_update.return_value.execute.side_effect = [rate_limited, {"updatedCells": 1}]
+
+    with patch('app.services.google_sheets.asyncio.sleep', new=AsyncMock()) as mock_sleep, \
+            patch('app.services.google_sheets.time.sleep') as mock_time_sleep:
+        assert await async_service.write_cell("N99999", "済") is True
+
+    mock_sleep.assert_awaited_once()
+    mock_time_sleep.assert_not_called()
+    assert mock_update.return_value.execute.call_count == 2
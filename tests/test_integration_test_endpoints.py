@@ -0,0 +1,130 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+from httpx import AsyncClient
+
+pytestmark = pytest.mark.usefixtures("no_rate_limit")
+
+BASE = "/api/v1/test"
+
+
+@pytest.fixture
+def sheets():
+    """エンドポイント内で生成されるGoogleSheetsServiceのモック"""
+    service = MagicMock()
+    service.test_connection.return_value = True
+    service.search_n_code.return_value = {"row": 2, "n_code": "N00001"}
+    service.get_workflow_info.return_value = {"slack_channel": "#books"}
+    service.read_cell.return_value = "済"
+    service.write_cell.return_value = True
+    service.test_read_write.return_value = {"success": True}
+    with patch("app.api.v1.test.GoogleSheetsService", return_value=service):
+        yield service
+
+
+@pytest.fixture
+def slack():
+    """エンドポイント内で生成されるSlackServiceのモック"""
+    service = MagicMock()
+    service.resolve_channel_name.return_value = "#books"
+    service.resolve_channel_id.return_value = "C1"
+    service.get_channel_id.return_value = "C1"
+    service.post_test_message.return_value = {"success": True, "message_ts": "1.0"}
+    service.delete_message.return_value = True
+    service.test_post_and_delete.return_value = {"success": True}
+    service.client.conversations_list.side_effect = [
+        {"channels": [{"id": "C1", "name": "n2279-book", "is_member": True}],
+         "response_metadata": {"next_cursor": "next"}},
+        {"channels": [{"id": "C2", "name": "random", "is_member": False},
+                      {"id": "C3", "name": "python-study", "is_member": True, "is_private": False}]},
+    ]
+    with patch("app.api.v1.test.SlackService", return_value=service):
+        yield service
+
+
+@pytest.mark.asyncio
+async def test_sheets_endpoints(async_client: AsyncClient, sheets):
+    connection = await async_client.get(f"{BASE}/sheets/connection")
+    search = await async_client.get(f"{BASE}/sheets/search/N00001")
+    workflow = await async_client.get(f"{BASE}/sheets/workflow/N00001")
+    read = await async_client.get(f"{BASE}/sheets/read-cell/N00001", params={"column": "H"})
+    write = await async_client.post(f"{BASE}/sheets/write-cell/N00001", params={"value": "x"})
+    read_write = await async_client.post(f"{BASE}/sheets/test-read-write/N00001")
+
+    assert connection.json()["connected"] is True
+    assert search.json() == {"n_code": "N00001", "found": True, "data": {"row": 2, "n_code": "N00001"}}
+    assert workflow.json()["workflow_info"] == {"slack_channel": "#books"}
+    assert read.json() == {"n_code": "N00001", "column": "H", "value": "済", "success": True}
+    assert write.json()["success"] is True
+    sheets.write_cell.assert_called_once_with("N00001", "x", "G")
+    assert read_write.json() == {"success": True}
+
+
+@pytest.mark.asyncio
+async def test_sheets_endpoints_report_errors(async_client: AsyncClient, sheets):
+    for method in ("test_connection", "search_n_code", "get_workflow_info", "read_cell", "write_cell", "test_read_write"):
+        getattr(sheets, method).side_effect = RuntimeError("sheets down")
+
+    connection = await async_client.get(f"{BASE}/sheets/connection")
+    responses = [
+        await async_client.get(f"{BASE}/sheets/search/N00001"),
+        await async_client.get(f"{BASE}/sheets/workflow/N00001"),
+        await async_client.get(f"{BASE}/sheets/read-cell/N00001"),
+        await async_client.post(f"{BASE}/sheets/write-cell/N00001", params={"value": "x"}),
+        await async_client.post(f"{BASE}/sheets/test-read-write/N00001"),
+    ]
+
+    assert connection.json() == {"service": "Google Sheets", "connected": False, "error": "sheets down"}
+    assert [response.status_code for response in responses] == [500] * 5
+    assert all(response.json()["detail"] == "sheets down" for response in responses)
+
+
+@pytest.mark.asyncio
+async def test_slack_endpoints(async_client: AsyncClient, slack):
+    resolve = await async_client.get(f"{BASE}/slack/channel-resolve/N00001")
+    channel_id = await async_client.get(f"{BASE}/slack/channel-id/books")
+    channels = await async_client.get(f"{BASE}/slack/channels")
+    post = await async_client.post(f"{BASE}/slack/post-message/books")
+    delete = await async_client.delete(f"{BASE}/slack/delete-message/books/1.0")
+    post_delete = await async_client.post(f"{BASE}/slack/test-post-delete/books", params={"delay_seconds": 0})
+
+    assert resolve.json()["resolved_channel_id"] == "C1"
+    assert channel_id.json() == {"channel_name": "books", "channel_id": "C1", "found": True}
+    data = channels.json()
+    assert [channel["id"] for channel in data["channels"]] == ["C1", "C3"]
+    assert [channel["id"] for channel in data["repo_channels"]] == ["C1", "C3"]
+    assert post.json()["message_ts"] == "1.0"
+    assert delete.json() == {"success": True, "channel": "books", "message_ts": "1.0"}
+    assert post_delete.json() == {"success": True}
+    slack.test_post_and_delete.assert_called_once_with("books", "🧪 TechBridge 投稿・削除テスト", 0)
+
+
+@pytest.mark.asyncio
+async def test_slack_endpoints_report_errors(async_client: AsyncClient, slack):
+    for method in ("resolve_channel_name", "get_channel_id", "post_test_message", "delete_message",
+                   "test_post_and_delete"):
+        getattr(slack, method).side_effect = RuntimeError("slack down")
+    slack.client.conversations_list.side_effect = RuntimeError("slack down")
+
+    responses = [
+        await async_client.get(f"{BASE}/slack/channel-resolve/N00001"),
+        await async_client.get(f"{BASE}/slack/channel-id/books"),
+        await async_client.get(f"{BASE}/slack/channels"),
+        await async_client.post(f"{BASE}/slack/post-message/books"),
+        await async_client.delete(f"{BASE}/slack/delete-message/books/1.0"),
+        await async_client.post(f"{BASE}/slack/test-post-delete/books"),
+    ]
+
+    assert [response.status_code for response in responses] == [500] * 6
+
+
+@pytest.mark.asyncio
+async def test_full_integration(async_client: AsyncClient, sheets, slack):
+    success = await async_client.post(f"{BASE}/test/integration/N00001")
+    sheets.search_n_code.side_effect = RuntimeError("sheets down")
+    partial = await async_client.post(f"{BASE}/test/integration/N00001")
+
+    assert success.json()["overall_success"] is True
+    assert success.json()["integration_test"]["slack"]["resolved_channel"] == "#books"
+    assert partial.json()["overall_success"] is False
+    assert partial.json()["integration_test"]["sheets"] == {"success": False, "error": "sheets down"}
@@ -0,0 +1,147 @@
+from unittest.mock import AsyncMock
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import event
+
+from app.core.deps import get_current_user, get_slack_service
+from app.core.exceptions import ValidationError
+from app.crud.workflow import get_notification_history, get_status_history
+from app.main import app
+from app.models.enums import NotificationStatus, ProgressStatus
+from app.services.workflow import WorkflowService
+
+
+pytestmark = pytest.mark.usefixtures("no_rate_limit")
+
+
+@pytest.fixture
+def slack_service():
+    """共有SlackServiceのモックと認証ユーザーを差し替える"""
+    service = AsyncMock()
+    service.send_status_updates.side_effect = lambda updates: {update[1]: True for update in updates}
+
+    app.dependency_overrides[get_slack_service] = lambda: service
+    app.dependency_overrides[get_current_user] = lambda: {"sub": "editor-lead"}
+    yield service
+    app.dependency_overrides.pop(get_slack_service, None)
+    app.dependency_overrides.pop(get_current_user, None)
+
+
+async def create_items(db_session):
+    await WorkflowService(db_session).bulk_create_or_update([
+        {"n_number": "N00001", "status": ProgressStatus.DISCOVERED, "assigned_editor": "editor1"},
+        {"n_number": "N00002", "status": ProgressStatus.PURCHASED, "assigned_editor": "editor1"},
+        {"n_number": "N00003", "status": ProgressStatus.FIRST_PROOF},
+        {"n_number": "N00004", "status": ProgressStatus.DISCOVERED, "assigned_editor": "editor2"},
+    ])
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_status_uses_single_update(db_session):
+    await create_items(db_session)
+
+    statements = []
+    engine = db_session.get_bind()
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        result = await WorkflowService(db_session).bulk_update_status(
+            ProgressStatus.PURCHASED, n_numbers=["N00001", "N00002", "N00003", "N00004", "N09999"]
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    assert [item.n_number for item in result.items] == ["N00001", "N00004"]
+    assert all(item.status == ProgressStatus.PURCHASED and item.due_at is not None for item in result.items)
+    assert result.unchanged == ["N00002"]
+    assert result.rejected == [("N00003", ProgressStatus.FIRST_PROOF)]
+    assert result.not_found == ["N09999"]
+    assert [statement.split()[0] for statement in statements] == ["SELECT", "UPDATE", "INSERT"]
+
+    history = await get_status_history(db_session, "N00004")
+    assert [(event.old_status, event.new_status) for event in history] == [
+        (ProgressStatus.DISCOVERED, ProgressStatus.PURCHASED),
+        (None, ProgressStatus.DISCOVERED),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_rejects_too_many_targets(db_session):
+    await create_items(db_session)
+
+    with pytest.raises(ValidationError):
+        await WorkflowService(db_session).bulk_assign_editor(
+            "editor3", filter_status=ProgressStatus.DISCOVERED, limit=1
+        )
+
+
+@pytest.mark.asyncio
+async def test_bulk_status_endpoint_notifies_once(async_client: AsyncClient, db_session, slack_service):
+    await create_items(db_session)
+
+    response = await async_client.post("/api/v1/progress/bulk/status", json={
+        "filter": {"assigned_editor": "editor1"},
+        "status": "manuscript_requested",
+    })
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "updated": ["N00001", "N00002"],
+        "unchanged": [],
+        "rejected": [],
+        "not_found": [],
+        "notified": 2,
+    }
+    slack_service.send_status_updates.assert_awaited_once()
+    updates = slack_service.send_status_updates.await_args.args[0]
+    assert [(update[1], update[3], update[4]) for update in updates] == [
+        ("N00001", ProgressStatus.DISCOVERED, ProgressStatus.MANUSCRIPT_REQUESTED),
+        ("N00002", ProgressStatus.PURCHASED, ProgressStatus.MANUSCRIPT_REQUESTED),
+    ]
+    notifications = await get_notification_history(db_session, "N00002")
+    assert [n.status for n in notifications] == [NotificationStatus.SENT]
+    history = await get_status_history(db_session, "N00002")
+    assert history[0].changed_by == "editor-lead"
+
+
+@pytest.mark.asyncio
+async def test_bulk_editor_endpoint(async_client: AsyncClient, db_session, slack_service):
+    await create_items(db_session)
+
+    response = await async_client.post("/api/v1/progress/bulk/editor", json={
+        "n_numbers": ["n00001", "N00003", "N00004"],
+        "editor": "editor2",
+    })
+    stats = await async_client.get("/api/v1/progress/stats")
+
+    assert response.status_code == 200
+    assert response.json()["updated"] == ["N00001", "N00003"]
+    assert response.json()["unchanged"] == ["N00004"]
+    assert {"assigned_editor": "editor2", "count": 3} in stats.json()["by_editor"]
+    slack_service.send_status_updates.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_bulk_endpoint_requires_one_selection(async_client: AsyncClient, db_session, slack_service):
+    both = await async_client.post("/api/v1/progress/bulk/editor", json={
+        "n_numbers": ["N00001"], "filter": {"status": "discovered"}, "editor": "editor2",
+    })
+    empty_filter = await async_client.post("/api/v1/progress/bulk/status", json={
+        "filter": {}, "status": "completed",
+    })
+
+    assert both.status_code == 422
+    assert both.json()["details"]["field"] == "n_numbers"
+    assert empty_filter.status_code == 422
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("editor", ["", "e" * 51])
+async def test_bulk_editor_rejects_invalid_editor(async_client: AsyncClient, db_session, slack_service, editor):
+    """空文字（未割り当ての集計キー）と列の長さを超える編集者名は受け付けない"""
+    response = await async_client.post("/api/v1/progress/bulk/editor", json={
+        "n_numbers": ["N00001"], "editor": editor,
+    })
+
+    assert response.status_code == 422
@@ -0,0 +1,69 @@
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from httpx import AsyncClient
+
+from app.models.enums import ProgressStatus
+from app.services.workflow import WorkflowService
+from tests.test_workflow_cache import make_item
+
+
+pytestmark = pytest.mark.usefixtures("no_rate_limit")
+
+
+@pytest.mark.asyncio
+async def test_unchanged_list_returns_304_without_query(async_client: AsyncClient, db_session, shared_cache):
+    db_session.add(make_item())
+    await db_session.commit()
+
+    first = await async_client.get("/api/v1/progress/", params={"limit": 10})
+    etag = first.headers["ETag"]
+    with patch('app.crud.workflow.get_workflow_items_by_cursor', new=AsyncMock()) as fetch:
+        second = await async_client.get(
+            "/api/v1/progress/", params={"limit": 10}, headers={"If-None-Match": etag}
+        )
+    other_query = await async_client.get(
+        "/api/v1/progress/", params={"limit": 5}, headers={"If-None-Match": etag}
+    )
+
+    assert first.status_code == 200
+    assert second.status_code == 304
+    assert second.headers["ETag"] == etag
+    assert second.content == b""
+    fetch.assert_not_awaited()
+    assert other_query.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_write_changes_detail_etag(async_client: AsyncClient, db_session, shared_cache):
+    """更新後は同じETagでも200で新しい内容を返す"""
+    db_session.add(make_item())
+    await db_session.commit()
+
+    first = await async_client.get("/api/v1/progress/N01234")
+    etag = first.headers["ETag"]
+    unchanged = await async_client.get("/api/v1/progress/N01234", headers={"If-None-Match": f'W/{etag}'})
+
+    await WorkflowService(db_session).update_status("N01234", ProgressStatus.MANUSCRIPT_REQUESTED)
+    changed = await async_client.get("/api/v1/progress/N01234", headers={"If-None-Match": etag})
+
+    assert unchanged.status_code == 304
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert changed.json()["status"] == ProgressStatus.MANUSCRIPT_REQUESTED.value
+
+
+@pytest.mark.asyncio
+async def test_no_etag_without_shared_version(async_client: AsyncClient, db_session):
+    """共有バージョンが無ければ他ワーカーの書き込みを検知できないためETagを出さない"""
+    db_session.add(make_item())
+    await db_session.commit()
+
+    listing = await async_client.get("/api/v1/progress/", headers={"If-None-Match": "*"})
+    detail = await async_client.get("/api/v1/progress/N01234", headers={"If-None-Match": "*"})
+
+    assert listing.status_code == 200
+    assert detail.status_code == 200
+    assert "ETag" not in listing.headers
+    assert "ETag" not in detail.headers
+    assert detail.headers["Cache-Control"] == "no-cache"
@@ -0,0 +1,73 @@
+import csv
+import io
+import json
+
+import pytest
+from httpx import AsyncClient
+
+from app.crud.workflow import stream_workflow_items
+from app.models.enums import ProgressStatus
+from app.services.workflow import WorkflowService
+
+
+pytestmark = pytest.mark.usefixtures("no_rate_limit")
+
+
+async def create_items(db_session):
+    await WorkflowService(db_session).bulk_create_or_update([
+        {"n_number": "N00001", "title": "本, その1", "status": ProgressStatus.PURCHASED, "assigned_editor": "editor1"},
+        {"n_number": "N00002", "title": "本2", "status": ProgressStatus.COMPLETED, "workflow_metadata": {"pages": 120}},
+        {"n_number": "N00003", "title": "本3", "status": ProgressStatus.PURCHASED},
+    ])
+
+
+@pytest.mark.asyncio
+async def test_stream_workflow_items_in_batches(db_session):
+    await create_items(db_session)
+
+    batches = [
+        [item.n_number for item in items]
+        async for items in stream_workflow_items(db_session, status=ProgressStatus.PURCHASED, batch_size=1)
+    ]
+
+    assert len(batches) == 2
+    assert all(len(batch) == 1 for batch in batches)
+    assert sorted(n for batch in batches for n in batch) == ["N00001", "N00003"]
+
+
+@pytest.mark.asyncio
+async def test_export_ndjson(async_client: AsyncClient, db_session):
+    await create_items(db_session)
+
+    response = await async_client.get("/api/v1/progress/export", params={"assigned_editor": "editor1"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert "attachment" in response.headers["content-disposition"]
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [(row["n_number"], row["status"]) for row in rows] == [("N00001", "purchased")]
+
+
+@pytest.mark.asyncio
+async def test_export_csv(async_client: AsyncClient, db_session):
+    await create_items(db_session)
+
+    response = await async_client.get("/api/v1/progress/export", params={"format": "csv"})
+    empty = await async_client.get(
+        "/api/v1/progress/export", params={"format": "csv", "assigned_editor": "nobody"}
+    )
+
+    assert response.status_code == 200
+    rows = list(csv.DictReader(io.StringIO(response.text.removeprefix("\ufeff"))))
+    assert sorted(row["n_number"] for row in rows) == ["N00001", "N00002", "N00003"]
+    by_n_number = {row["n_number"]: row for row in rows}
+    assert by_n_number["N00001"]["title"] == "本, その1"
+    assert json.loads(by_n_number["N00002"]["workflow_metadata"]) == {"pages": 120}
+    assert empty.text.removeprefix("\ufeff").splitlines()[0].startswith("n_number,")
+
+
+@pytest.mark.asyncio
+async def test_export_rejects_unknown_format(async_client: AsyncClient, db_session):
+    response = await async_client.get("/api/v1/progress/export", params={"format": "xml"})
+
+    assert response.status_code == 422
@@ -0,0 +1,76 @@
+from datetime import datetime, timedelta
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+
+from app.core.exceptions import ValidationError
+from app.crud import workflow as workflow_crud
+from app.models.enums import ProgressStatus
+from app.models.workflow import WorkflowItem
+
+
+pytestmark = pytest.mark.usefixtures("no_rate_limit")
+
+
+@pytest_asyncio.fixture
+async def workflow_items(db_session):
+    """updated_atが同じものを含む5件のアイテム"""
+    base = datetime(2025, 1, 1, 12, 0, 0)
+    items = [
+        WorkflowItem(
+            n_number=f"N0000{i}",
+            status=ProgressStatus.PURCHASED if i % 2 else ProgressStatus.DISCOVERED,
+            workflow_metadata={},
+            updated_at=base + timedelta(minutes=i // 2),
+        )
+        for i in range(5)
+    ]
+    db_session.add_all(items)
+    await db_session.commit()
+    return items
+
+
+@pytest.mark.asyncio
+async def test_count_workflow_items(db_session, workflow_items):
+    assert await workflow_crud.count_workflow_items(db_session) == 5
+    assert await workflow_crud.count_workflow_items(db_session, status=ProgressStatus.PURCHASED) == 2
+
+
+@pytest.mark.asyncio
+async def test_cursor_pagination_walks_all_items_once(db_session, workflow_items):
+    """同じupdated_atのアイテムもidで順序付けされ、重複・欠落なく走査できる"""
+    seen = []
+    cursor = None
+    while True:
+        page, cursor = await workflow_crud.get_workflow_items_by_cursor(db_session, limit=2, cursor=cursor)
+        seen.extend(item.n_number for item in page)
+        if cursor is None:
+            break
+
+    assert seen == ["N00004", "N00003", "N00002", "N00001", "N00000"]
+
+
+def test_decode_cursor_rejects_garbage():
+    with pytest.raises(ValidationError):
+        workflow_crud.decode_cursor("not-a-cursor")
+
+
+@pytest.mark.asyncio
+async def test_list_progress_returns_next_cursor(async_client: AsyncClient, workflow_items):
+    response = await async_client.get("/api/v1/progress/", params={"limit": 3})
+    data = response.json()
+
+    assert response.status_code == 200
+    assert data["total"] == 5
+    assert [item["n_number"] for item in data["items"]] == ["N00004", "N00003", "N00002"]
+
+    response = await async_client.get(
+        "/api/v1/progress/",
+        params={"limit": 3, "cursor": data["next_cursor"], "include_total": False}
+    )
+    data = response.json()
+
+    assert data["total"] is None
+    assert data["next_cursor"] is None
+    assert [item["n_number"] for item in data["items"]] == ["N00001", "N00000"]
@@ -0,0 +1,84 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import event, text
+
+from app.crud.workflow import delete_workflow_item, get_status_stats
+from app.models.enums import ProgressStatus
+from app.services.workflow import WorkflowService
+
+
+pytestmark = pytest.mark.usefixtures("no_rate_limit")
+
+
+@pytest.mark.asyncio
+async def test_counters_follow_every_write_path(db_session):
+    service = WorkflowService(db_session)
+    await service.bulk_create_or_update([
+        {"n_number": "N00001", "assigned_editor": "editor1"},
+        {"n_number": "N00002", "assigned_editor": "editor1"},
+        {"n_number": "N00003"},
+    ])
+    await service.create_or_update(n_number="N00001", status=ProgressStatus.PURCHASED)
+    removed = await service.update_status("N00002", ProgressStatus.PURCHASED)
+    await service.assign_editor("N00003", "editor2")
+    await delete_workflow_item(db_session, removed.id)
+
+    stats = await get_status_stats(db_session)
+
+    assert stats["total"] == 2
+    assert stats["by_status"]["purchased"] == 1
+    assert stats["by_status"]["discovered"] == 1
+    assert stats["by_editor"] == [
+        {"assigned_editor": "editor1", "count": 1},
+        {"assigned_editor": "editor2", "count": 1},
+    ]
+    assert stats["by_status_editor"] == [
+        {"status": "discovered", "assigned_editor": "editor2", "count": 1},
+        {"status": "purchased", "assigned_editor": "editor1", "count": 1},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_average_time_in_status(db_session):
+    service = WorkflowService(db_session)
+    await service.create_or_update(n_number="N00001")
+    await db_session.execute(text(
+        "UPDATE workflow_items SET status_changed_at = datetime('now', '-3600 seconds')"
+    ))
+    await db_session.commit()
+
+    await service.update_status("N00001", ProgressStatus.PURCHASED)
+    stats = await get_status_stats(db_session)
+
+    assert stats["average_seconds_in_status"]["discovered"] == pytest.approx(3600, abs=5)
+    assert stats["average_seconds_in_status"]["purchased"] is None
+
+
+@pytest.mark.asyncio
+async def test_stats_do_not_scan_items(db_session):
+    await WorkflowService(db_session).bulk_create_or_update([{"n_number": f"N{i:05d}"} for i in range(50)])
+
+    statements = []
+    engine = db_session.get_bind()
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        stats = await get_status_stats(db_session)
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    assert stats["total"] == 50
+    assert not any("workflow_items" in statement for statement in statements)
+
+
+@pytest.mark.asyncio
+async def test_stats_endpoint(async_client: AsyncClient, db_session, shared_cache):
+    await WorkflowService(db_session).create_or_update(n_number="N00001", status=ProgressStatus.COMPLETED)
+
+    first = await async_client.get("/api/v1/progress/stats")
+    second = await async_client.get("/api/v1/progress/stats", headers={"If-None-Match": first.headers["ETag"]})
+
+    assert first.status_code == 200
+    assert first.json()["by_status"]["completed"] == 1
+    assert first.json()["by_editor"] == [{"assigned_editor": None, "count": 1}]
+    assert second.status_code == 304
@@ -0,0 +1,77 @@
+from unittest.mock import patch
+
+import pytest
+from httpx import AsyncClient
+
+from app.core.deps import get_current_user
+from app.crud.workflow import get_status_history
+from app.main import app
+from app.models.enums import ProgressStatus, WebhookSource
+from app.services.workflow import WorkflowService
+
+
+pytestmark = pytest.mark.usefixtures("no_rate_limit")
+
+
+@pytest.fixture
+def current_user():
+    """認証ユーザーを差し替える"""
+    app.dependency_overrides[get_current_user] = lambda: {"sub": "editor1"}
+    yield
+    app.dependency_overrides.pop(get_current_user, None)
+
+
+@pytest.mark.asyncio
+async def test_update_status_records_manual_transition(async_client: AsyncClient, db_session, current_user):
+    await WorkflowService(db_session).create_or_update(n_number="N01234", status=ProgressStatus.PURCHASED)
+
+    response = await async_client.post("/api/v1/progress/n01234/update", json={
+        "status": "manuscript_requested",
+        "workflow_metadata": {"pages": 120},
+    })
+
+    assert response.status_code == 200
+    assert response.json()["data"] == {
+        "n_number": "N01234",
+        "old_status": "purchased",
+        "new_status": "manuscript_requested",
+    }
+    event = (await get_status_history(db_session, "N01234"))[0]
+    assert (event.new_status, event.source, event.changed_by) == (
+        ProgressStatus.MANUSCRIPT_REQUESTED, WebhookSource.MANUAL, "editor1"
+    )
+
+
+@pytest.mark.asyncio
+async def test_update_status_rejects_invalid_requests(async_client: AsyncClient, db_session, current_user):
+    await WorkflowService(db_session).create_or_update(n_number="N01234", status=ProgressStatus.FIRST_PROOF)
+
+    invalid_number = await async_client.post("/api/v1/progress/X01234/update", json={"status": "completed"})
+    not_found = await async_client.post("/api/v1/progress/N09999/update", json={"status": "completed"})
+    backwards = await async_client.post("/api/v1/progress/N01234/update", json={"status": "discovered"})
+
+    assert invalid_number.status_code == 422
+    assert invalid_number.json()["details"]["field"] == "n_number"
+    assert not_found.status_code == 404
+    assert backwards.status_code == 422
+    assert backwards.json()["details"]["field"] == "status"
+
+
+@pytest.mark.asyncio
+async def test_update_status_reports_failure(async_client: AsyncClient, db_session, current_user):
+    await WorkflowService(db_session).create_or_update(n_number="N01234", status=ProgressStatus.PURCHASED)
+
+    with patch("app.api.v1.progress.WorkflowManager.update_status", side_effect=RuntimeError("db down")):
+        response = await async_client.post("/api/v1/progress/N01234/update", json={"status": "manuscript_requested"})
+
+    assert response.status_code == 500
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("path", ["history", "notifications"])
+async def test_history_endpoints_validate_n_number(async_client: AsyncClient, db_session, path):
+    invalid_number = await async_client.get(f"/api/v1/progress/X01234/{path}")
+    not_found = await async_client.get(f"/api/v1/progress/N09999/{path}")
+
+    assert invalid_number.status_code == 422
+    assert not_found.status_code == 404
@@ -0,0 +1,36 @@
+import pytest
+from sqlalchemy import event
+
+from app.crud import workflow as workflow_crud
+from app.models.enums import ProgressStatus
+
+
+async def explain_listing(db_session, **filters) -> str:
+    """一覧クエリを実行し、発行されたSQLのクエリプランを返す（SQLite）"""
+    executed = []
+    engine = db_session.get_bind()
+    listener = lambda conn, cursor, statement, parameters, *args: executed.append((statement, parameters))
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        await workflow_crud.get_workflow_items_by_cursor(db_session, limit=20, **filters)
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    statement, parameters = executed[-1]
+    connection = await db_session.connection()
+    result = await connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+    return "\n".join(str(row[-1]) for row in result.all())
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("filters, index_name", [
+    ({"status": ProgressStatus.PURCHASED}, "ix_workflow_items_status_updated_at"),
+    ({"assigned_editor": "editor1"}, "ix_workflow_items_assigned_editor_updated_at"),
+    ({}, "ix_workflow_items_updated_at"),
+])
+async def test_listing_uses_composite_index(db_session, filters, index_name):
+    """フィルタとupdated_at DESCの並び替えが複合インデックスで処理される"""
+    plan = await explain_listing(db_session, **filters)
+
+    assert index_name in plan
+    assert "USE TEMP B-TREE FOR ORDER BY" not in plan
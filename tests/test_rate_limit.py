@@ -0,0 +1,88 @@
+from unittest.mock import AsyncMock
+
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.middleware.rate_limit import (
+    InMemoryRateLimitBackend,
+    RateLimiter,
+    RateLimitPolicy,
+    RedisRateLimitBackend,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.mark.asyncio
+async def test_gcra_allows_burst_then_refills():
+    """バースト数まで許可し、間隔が経過すると1件ずつ回復する"""
+    clock = FakeClock()
+    backend = InMemoryRateLimitBackend(clock=clock)
+    policy = RateLimitPolicy("default", 60, 3)
+
+    results = [await backend.hit("ip:1", policy) for _ in range(4)]
+    assert [r.allowed for r in results] == [True, True, True, False]
+    assert [r.remaining for r in results[:3]] == [2, 1, 0]
+    assert results[3].retry_after == pytest.approx(1.0)
+
+    clock.now += 1.0
+    assert (await backend.hit("ip:1", policy)).allowed
+    assert not (await backend.hit("ip:1", policy)).allowed
+
+
+@pytest.mark.asyncio
+async def test_in_memory_backend_is_bounded():
+    """保持するクライアント数はmax_clientsを超えない（古いものから破棄）"""
+    backend = InMemoryRateLimitBackend(max_clients=2, clock=FakeClock())
+    policy = RateLimitPolicy("default", 60, 1)
+
+    for client in ("a", "b", "c"):
+        await backend.hit(client, policy)
+
+    assert list(backend._tats) == ["b", "c"]
+    assert (await backend.hit("a", policy)).allowed
+
+
+@pytest.mark.asyncio
+async def test_policy_selection_and_separate_budgets():
+    """ルート・APIキーごとにポリシーを選択し、ポリシーごとに別の枠で数える"""
+    limiter = RateLimiter(
+        RateLimitPolicy("default", 60, 1),
+        backend=InMemoryRateLimitBackend(clock=FakeClock()),
+        route_policies={
+            "/api/v1/webhook/tech": RateLimitPolicy("tech", 600, 1),
+            "/api/v1/webhook/techzip": RateLimitPolicy("techzip", 600, 1),
+        },
+        api_key_policies={"partner": RateLimitPolicy("partner", 6000, 100)},
+    )
+
+    assert limiter.policy_for("/health/") is None
+    assert limiter.policy_for("/api/v1/webhook/tech/status-change").name == "tech"
+    assert limiter.policy_for("/api/v1/webhook/techzip/completion").name == "techzip"
+    assert limiter.policy_for("/api/v1/progress/").name == "default"
+    assert limiter.policy_for("/api/v1/progress/", "partner").name == "partner"
+
+    tech = limiter.policy_for("/api/v1/webhook/tech/status-change")
+    techzip = limiter.policy_for("/api/v1/webhook/techzip/completion")
+    assert (await limiter.hit(tech, "ip:1")).allowed
+    assert not (await limiter.hit(tech, "ip:1")).allowed
+    assert (await limiter.hit(techzip, "ip:1")).allowed
+
+
+@pytest.mark.asyncio
+async def test_redis_backend_falls_back_when_unavailable():
+    """Redisに接続できない場合はプロセス内のカウンタで判定する"""
+    backend = RedisRateLimitBackend(
+        redis_factory=AsyncMock(side_effect=RedisConnectionError("down")),
+        fallback=InMemoryRateLimitBackend(clock=FakeClock()),
+    )
+    policy = RateLimitPolicy("default", 60, 1)
+
+    assert (await backend.hit("ip:1", policy)).allowed
+    assert not (await backend.hit("ip:1", policy)).allowed
@@ -0,0 +1,62 @@
+import pytest
+from httpx import AsyncClient
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+from app.middleware.rate_limit import RateLimiter, RateLimitPolicy
+from app.middleware.request_context import RequestContextMiddleware
+
+
+async def echo_request_id(request: Request) -> JSONResponse:
+    return JSONResponse({"request_id": request.state.request_id})
+
+
+async def stream(request: Request) -> StreamingResponse:
+    async def chunks():
+        for i in range(3):
+            yield f"chunk-{i}\n"
+    return StreamingResponse(chunks(), media_type="text/plain")
+
+
+def build_app(**options) -> RequestContextMiddleware:
+    app = Starlette(routes=[Route("/echo", echo_request_id), Route("/stream", stream), Route("/health", echo_request_id)])
+    return RequestContextMiddleware(app, **options)
+
+
+@pytest.mark.asyncio
+async def test_request_id_is_propagated_to_state_and_response():
+    async with AsyncClient(app=build_app(), base_url="http://test") as client:
+        response = await client.get("/echo", headers={"X-Request-ID": "req-123"})
+        generated = await client.get("/echo", headers={"X-API-Key": "other"})
+
+    assert response.json() == {"request_id": "req-123"}
+    assert response.headers["X-Request-ID"] == "req-123"
+    assert generated.headers["X-Request-ID"] == generated.json()["request_id"]
+
+
+@pytest.mark.asyncio
+async def test_streaming_response_passes_through():
+    async with AsyncClient(app=build_app(), base_url="http://test") as client:
+        response = await client.get("/stream")
+
+    assert response.status_code == 200
+    assert response.text == "chunk-0\nchunk-1\nchunk-2\n"
+    assert "X-Request-ID" in response.headers
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_requests_get_429_except_exempt_paths():
+    async with AsyncClient(app=build_app(rate_limiter=RateLimiter(RateLimitPolicy("default", 60, 1))), base_url="http://test") as client:
+        first = await client.get("/echo")
+        limited = await client.get("/echo")
+        health = await client.get("/health")
+
+    assert first.status_code == 200
+    assert first.headers["X-RateLimit-Limit"] == "60"
+    assert limited.status_code == 429
+    assert limited.headers["Retry-After"] == "1"
+    assert limited.json()["error"] == "RateLimitExceeded"
+    assert health.status_code == 200
+    assert "X-RateLimit-Limit" not in health.headers
@@ -0,0 +1,32 @@
+import hashlib
+import hmac
+import time
+
+from app.core.security import verify_slack_request, verify_webhook_signature
+
+
+def slack_headers(body: bytes, secret: str, timestamp: str) -> dict:
+    signature = "v0=" + hmac.new(
+        secret.encode(), f"v0:{timestamp}:{body.decode()}".encode(), hashlib.sha256
+    ).hexdigest()
+    return {"x-slack-request-timestamp": timestamp, "x-slack-signature": signature}
+
+
+def test_verify_webhook_signature():
+    body = b'{"n_number":"N01234"}'
+    signature = hmac.new(b"secret", body, hashlib.sha256).hexdigest()
+
+    assert verify_webhook_signature(body, signature, "secret") is True
+    assert verify_webhook_signature(body, signature, "other") is False
+
+
+def test_verify_slack_request():
+    body = b"command=%2Fstatus&text=N01234"
+    now = str(int(time.time()))
+    stale = str(int(time.time()) - 600)
+
+    assert verify_slack_request(body, slack_headers(body, "secret", now), "secret") is True
+    assert verify_slack_request(body, slack_headers(body, "other", now), "secret") is False
+    assert verify_slack_request(body, slack_headers(body, "secret", stale), "secret") is False
+    assert verify_slack_request(body, slack_headers(body, "secret", "invalid"), "secret") is False
+    assert verify_slack_request(body, {}, "secret") is False
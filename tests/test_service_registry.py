@@ -0,0 +1,22 @@
+from unittest.mock import patch
+
+from app.services.registry import ServiceRegistry
+
+
+def test_registry_builds_clients_once():
+    """SlackService・GoogleSheetsServiceはプロセス内で1回だけ生成する"""
+    registry = ServiceRegistry()
+
+    with patch('app.services.registry.SlackService') as mock_slack:
+        registry.startup()
+        first = registry.get_slack_service()
+        second = registry.get_slack_service()
+
+        assert first is second
+        assert registry.get_sheets_service() is first.sheets_service
+        mock_slack.assert_called_once()
+
+        registry.shutdown()
+        registry.get_slack_service()
+        assert mock_slack.call_count == 2
+
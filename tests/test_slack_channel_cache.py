@@ -0,0 +1,94 @@
+import json
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.services.slack import SlackService
+from app.services.slack_channel_cache import SlackChannelCache
+
+
+@pytest.fixture
+def cache_file(tmp_path):
+    """既存形式のキャッシュファイル"""
+    path = tmp_path / "slack_channel_cache.json"
+    path.write_text(json.dumps({
+        "channels": {
+            "cached-channel": {
+                "id": "C0000CACHED",
+                "name": "cached-channel",
+                "is_private": True,
+                "last_checked": datetime.now().isoformat()
+            },
+            "stale-channel": {
+                "id": "C0000STALE",
+                "name": "stale-channel",
+                "is_private": True,
+                "last_checked": (datetime.now() - timedelta(days=30)).isoformat()
+            }
+        },
+        "last_updated": datetime.now().isoformat(),
+        "legacy-channel": "C0000LEGACY"
+    }), encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def slack_service(cache_file):
+    """キャッシュファイルを使うSlackService"""
+    with patch('app.services.slack.WebClient') as mock_client:
+        mock_instance = MagicMock()
+        mock_client.return_value = mock_instance
+        cache = SlackChannelCache(str(cache_file), ttl_seconds=60 * 60 * 24)
+        yield SlackService("test-token", channel_cache=cache)
+
+
+def page(channels, next_cursor=""):
+    """conversations_listのレスポンス"""
+    return {"channels": channels, "response_metadata": {"next_cursor": next_cursor}}
+
+
+def test_cached_channel_skips_api(slack_service):
+    """キャッシュ済みのチャンネルはAPIを呼ばない"""
+    assert slack_service.get_channel_id("#cached-channel") == "C0000CACHED"
+    assert slack_service.get_channel_id("legacy-channel") == "C0000LEGACY"
+    slack_service.client.conversations_list.assert_not_called()
+
+
+def test_miss_stops_paging_when_found(slack_service, cache_file):
+    """未登録のチャンネルは見つかった時点でページングを打ち切る"""
+    slack_service.client.conversations_list.side_effect = [
+        page([{"id": "C1", "name": "other", "is_member": True}], "cursor-2"),
+        page([{"id": "C2", "name": "n99999-test-book", "is_member": True}], "cursor-3"),
+        page([{"id": "C3", "name": "never-fetched", "is_member": True}]),
+    ]
+
+    assert slack_service.get_channel_id("#n99999-test-book") == "C2"
+    assert slack_service.client.conversations_list.call_count == 2
+
+    # 途中のページで見たチャンネルも登録され、スナップショットに保存される
+    assert slack_service.get_channel_id("other") == "C1"
+    assert slack_service.client.conversations_list.call_count == 2
+
+    saved = json.loads(cache_file.read_text(encoding="utf-8"))
+    assert saved["channels"]["n99999-test-book"]["id"] == "C2"
+    assert "last_checked" in saved["channels"]["n99999-test-book"]
+
+
+def test_stale_entry_is_rechecked(slack_service):
+    """TTLを過ぎたエントリはAPIで再確認し、見つからなければ削除する"""
+    slack_service.client.conversations_list.return_value = page([])
+
+    assert slack_service.get_channel_id("stale-channel") is None
+    assert slack_service.client.conversations_list.call_count == 1
+    assert "stale-channel" not in slack_service.channel_cache._channels
+
+
+def test_non_member_channels_are_not_cached(slack_service):
+    """Botが参加していないチャンネルは返さない"""
+    slack_service.client.conversations_list.return_value = page(
+        [{"id": "C9", "name": "private-room", "is_member": False}]
+    )
+
+    assert slack_service.get_channel_id("private-room") is None
+    assert slack_service.channel_cache.get("private-room") is None
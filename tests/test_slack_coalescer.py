@@ -0,0 +1,90 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.models.enums import ProgressStatus
+from app.services.slack import SlackService
+from app.services.slack_coalescer import NotificationCoalescer
+
+
+@pytest.fixture
+def dispatcher():
+    """送信に成功したFutureを返すディスパッチャのモック"""
+    async def submit(method, **params):
+        future = asyncio.get_running_loop().create_future()
+        future.set_result({"ok": True})
+        return future
+
+    mock = AsyncMock()
+    mock.submit.side_effect = submit
+    return mock
+
+
+@pytest.mark.asyncio
+async def test_coalescer_merges_transitions_per_item():
+    """同じアイテムの遷移は経過を保持して1件にまとめる"""
+    flush = AsyncMock()
+    coalescer = NotificationCoalescer(0.01, flush)
+
+    await coalescer.add("C1", "N00001", "本A", None, ProgressStatus.DISCOVERED)
+    await coalescer.add("C1", "N00001", "本A", None, ProgressStatus.PURCHASED)
+    await coalescer.add("C1", "N00001", "本A", None, ProgressStatus.MANUSCRIPT_REQUESTED)
+    await coalescer.add("C1", "N00002", "本B", None, ProgressStatus.PURCHASED)
+    await coalescer.add("C2", "N00003", "本C", None, ProgressStatus.PURCHASED)
+    await asyncio.sleep(0.05)
+
+    assert flush.await_count == 2
+    channel, notifications = flush.await_args_list[0].args
+    assert channel == "C1"
+    assert [n.n_number for n in notifications] == ["N00001", "N00002"]
+    assert notifications[0].path == [
+        None, ProgressStatus.DISCOVERED, ProgressStatus.PURCHASED, ProgressStatus.MANUSCRIPT_REQUESTED
+    ]
+
+
+@pytest.mark.asyncio
+async def test_flush_all_sends_pending_immediately():
+    flush = AsyncMock()
+    coalescer = NotificationCoalescer(60, flush)
+
+    await coalescer.add("C1", "N00001", "本A", None, ProgressStatus.PURCHASED)
+    await coalescer.flush_all()
+
+    flush.assert_awaited_once()
+    assert coalescer._timers == {}
+
+
+@pytest.mark.asyncio
+async def test_slack_service_sends_single_message_with_transition_path(dispatcher):
+    """まとめ送信が有効な場合、連続した遷移は1通の通知になる"""
+    service = SlackService("xoxb-test", dispatcher=dispatcher, coalesce_window_seconds=60)
+
+    for status in (ProgressStatus.DISCOVERED, ProgressStatus.PURCHASED, ProgressStatus.MANUSCRIPT_REQUESTED):
+        # まとめ送信中は送信結果が分からない
+        assert await service.send_status_update(
+            channel="C1", n_number="N00001", title="本A", old_status=None,
+            new_status=status, auto_resolve_channel=False
+        ) is None
+    dispatcher.submit.assert_not_awaited()
+
+    await service.flush_notifications()
+
+    dispatcher.submit.assert_awaited_once()
+    blocks = dispatcher.submit.await_args.kwargs["blocks"]
+    assert "🔍 発見済み → 💰 購入完了 → ✍️ 原稿依頼中" in str(blocks)
+
+
+@pytest.mark.asyncio
+async def test_slack_service_sends_digest_for_multiple_items(dispatcher):
+    service = SlackService("xoxb-test", dispatcher=dispatcher, coalesce_window_seconds=60)
+
+    for n_number in ("N00001", "N00002", "N00003"):
+        await service.send_status_update(
+            channel="C1", n_number=n_number, title="本", old_status=None,
+            new_status=ProgressStatus.PURCHASED, auto_resolve_channel=False
+        )
+    await service.flush_notifications()
+
+    dispatcher.submit.assert_awaited_once()
+    assert "進捗更新まとめ（3件）" in str(dispatcher.submit.await_args.kwargs["blocks"])
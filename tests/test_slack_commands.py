@@ -0,0 +1,109 @@
+from unittest.mock import AsyncMock
+from urllib.parse import urlencode
+
+import pytest
+from httpx import AsyncClient
+
+from app.core.deps import get_db, get_slack_service
+from app.crud.workflow import get_status_history
+from app.main import app
+from app.models.enums import ProgressStatus, WebhookSource
+from app.services.workflow import WorkflowService
+from tests.test_slack_deferred import signed_headers
+
+
+pytestmark = pytest.mark.usefixtures("no_rate_limit", "override_deps_db")
+
+
+@pytest.fixture
+def override_deps_db(db_session):
+    """app.core.deps.get_dbもテスト用セッションに差し替える"""
+    async def _override_get_db():
+        yield db_session
+
+    app.dependency_overrides[get_db] = _override_get_db
+    yield
+    app.dependency_overrides.pop(get_db, None)
+
+
+@pytest.fixture
+def slack_service():
+    """共有SlackServiceのモック"""
+    service = AsyncMock()
+    app.dependency_overrides[get_slack_service] = lambda: service
+    yield service
+    app.dependency_overrides.pop(get_slack_service, None)
+
+
+async def run_command(async_client: AsyncClient, command: str, text: str) -> dict:
+    """署名付きでコマンドを送信（response_urlなしなので同期応答）"""
+    body = urlencode({"command": f"/{command}", "text": text, "user_name": "editor1", "channel_name": "books"})
+    response = await async_client.post(f"/api/v1/slack/commands/{command}", content=body, headers=signed_headers(body))
+    assert response.status_code == 200
+    return response.json()
+
+
+@pytest.mark.asyncio
+async def test_command_requires_valid_signature(async_client: AsyncClient):
+    body = urlencode({"command": "/status", "text": "N01234"})
+    headers = {**signed_headers(body), "X-Slack-Signature": "v0=invalid"}
+
+    missing = await async_client.post("/api/v1/slack/commands/status", content=body)
+    invalid = await async_client.post("/api/v1/slack/commands/status", content=body, headers=headers)
+
+    assert missing.status_code == 401
+    assert invalid.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_status_command(async_client: AsyncClient, db_session):
+    await WorkflowService(db_session).create_or_update(
+        n_number="N01234", title="本", author="著者", status=ProgressStatus.PURCHASED, assigned_editor="editor1"
+    )
+
+    usage = await run_command(async_client, "status", "")
+    found = await run_command(async_client, "status", "n01234")
+    not_found = await run_command(async_client, "status", "N09999")
+
+    assert usage["text"].startswith("使用方法")
+    assert found["response_type"] == "in_channel"
+    assert "📖 タイトル: 本" in found["text"]
+    assert "👤 担当編集者: editor1" in found["text"]
+    assert not_found["text"] == "❌ N09999 の進捗情報が見つかりませんでした。"
+
+
+@pytest.mark.asyncio
+async def test_update_command(async_client: AsyncClient, db_session, slack_service):
+    await WorkflowService(db_session).create_or_update(
+        n_number="N01234", title="本", status=ProgressStatus.PURCHASED, slack_channel="#books"
+    )
+
+    response = await run_command(async_client, "update", "n01234 manuscript_requested")
+
+    assert response["response_type"] == "in_channel"
+    assert response["text"].startswith("✅ N01234")
+    assert slack_service.send_status_update.await_args.kwargs == {
+        "channel": "#books",
+        "n_number": "N01234",
+        "title": "本",
+        "old_status": ProgressStatus.PURCHASED,
+        "new_status": ProgressStatus.MANUSCRIPT_REQUESTED,
+    }
+    event = (await get_status_history(db_session, "N01234"))[0]
+    assert (event.source, event.changed_by) == (WebhookSource.MANUAL, "editor1")
+
+
+@pytest.mark.asyncio
+async def test_update_command_rejects_invalid_input(async_client: AsyncClient, db_session, slack_service):
+    await WorkflowService(db_session).create_or_update(n_number="N01234", status=ProgressStatus.PURCHASED)
+    slack_service.send_status_update.side_effect = RuntimeError("slack down")
+
+    usage = await run_command(async_client, "update", "N01234")
+    invalid = await run_command(async_client, "update", "N01234 unknown")
+    not_found = await run_command(async_client, "update", "N09999 completed")
+    failed = await run_command(async_client, "update", "N01234 first_proof")
+
+    assert usage["text"].startswith("使用方法")
+    assert invalid["text"].startswith("❌ 無効なステータス: unknown")
+    assert not_found["text"] == "❌ N09999 の進捗情報が見つかりませんでした。"
+    assert failed == {"response_type": "ephemeral", "text": "❌ エラーが発生しました: slack down"}
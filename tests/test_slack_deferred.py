@@ -0,0 +1,100 @@
+import asyncio
+import hashlib
+import hmac
+import json
+import time
+from urllib.parse import urlencode
+
+import httpx
+import pytest
+from httpx import AsyncClient
+
+from app.core.config import settings
+from app.core.deps import get_command_responder
+from app.main import app
+from app.models.enums import ProgressStatus
+from app.models.workflow import WorkflowItem
+from app.services.slack_responder import SlackCommandResponder, is_response_url
+from tests.conftest import TestSessionLocal
+
+
+pytestmark = pytest.mark.usefixtures("no_rate_limit")
+
+
+@pytest.fixture
+def posted():
+    return []
+
+
+@pytest.fixture
+def responder(posted):
+    """response_urlへの送信を記録するレスポンダ"""
+    def handler(request: httpx.Request) -> httpx.Response:
+        posted.append((str(request.url), json.loads(request.content)))
+        return httpx.Response(200, text="ok")
+
+    responder = SlackCommandResponder(
+        session_factory=TestSessionLocal,
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+    app.dependency_overrides[get_command_responder] = lambda: responder
+    settings.SLACK_COMMAND_DEFERRED_RESPONSE = True
+    yield responder
+    settings.SLACK_COMMAND_DEFERRED_RESPONSE = False
+    app.dependency_overrides.pop(get_command_responder, None)
+
+
+def signed_headers(body: str) -> dict:
+    settings.SLACK_SIGNING_SECRET = "test-secret"
+    timestamp = str(int(time.time()))
+    signature = "v0=" + hmac.new(
+        b"test-secret", f"v0:{timestamp}:{body}".encode(), hashlib.sha256
+    ).hexdigest()
+    return {
+        "X-Slack-Request-Timestamp": timestamp,
+        "X-Slack-Signature": signature,
+        "Content-Type": "application/x-www-form-urlencoded",
+    }
+
+
+def test_only_slack_hooks_are_accepted_as_response_url():
+    assert is_response_url("https://hooks.slack.com/commands/T0001/1/abc")
+    assert not is_response_url("https://example.com/commands")
+    assert not is_response_url("")
+
+
+@pytest.mark.asyncio
+async def test_status_command_acks_then_posts_result(
+    async_client: AsyncClient, sample_slack_command, db_session, responder, posted
+):
+    """即座に「処理中」を返し、結果はresponse_urlへ送信される"""
+    db_session.add(WorkflowItem(
+        n_number="N99999",
+        title="テスト技術書",
+        author="テスト著者",
+        status=ProgressStatus.PURCHASED,
+    ))
+    await db_session.commit()
+
+    body = urlencode(sample_slack_command)
+    response = await async_client.post("/api/v1/slack/commands/status", content=body, headers=signed_headers(body))
+    await asyncio.gather(*responder._tasks)
+
+    assert response.status_code == 200
+    assert response.json()["response_type"] == "ephemeral"
+    assert "処理中" in response.json()["text"]
+
+    [(url, payload)] = posted
+    assert url == sample_slack_command["response_url"]
+    assert payload["response_type"] == "in_channel"
+    assert "テスト技術書" in payload["text"]
+
+
+@pytest.mark.asyncio
+async def test_failed_job_posts_error_message(responder, posted):
+    async def job(db):
+        raise RuntimeError("sheets timeout")
+
+    assert await responder.run("https://hooks.slack.com/commands/test", job)
+    assert posted[0][1]["response_type"] == "ephemeral"
+    assert "sheets timeout" in posted[0][1]["text"]
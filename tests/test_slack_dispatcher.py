@@ -0,0 +1,183 @@
+import asyncio
+
+import pytest
+from slack_sdk.errors import SlackApiError
+from slack_sdk.web.slack_response import SlackResponse
+
+from app.models.enums import ProgressStatus
+from app.services.slack import SlackService
+from app.services.slack_dispatcher import InMemorySlackQueue, SlackDispatcher, TokenBucket
+
+
+class FakeTime:
+    """時計とsleepを進めるだけのテスト用タイマー"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def clock(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def rate_limited_error(retry_after: str) -> SlackApiError:
+    response = SlackResponse(
+        client=None, http_verb="POST", api_url="https://slack.com/api/chat.postMessage",
+        req_args={}, data={"ok": False, "error": "ratelimited"},
+        headers={"Retry-After": retry_after}, status_code=429,
+    )
+    return SlackApiError("ratelimited", response)
+
+
+class FakeClient:
+    def __init__(self, failures=()):
+        self.failures = list(failures)
+        self.calls = []
+
+    async def chat_postMessage(self, **params):
+        self.calls.append(params)
+        if self.failures:
+            raise self.failures.pop(0)
+        return {"ok": True}
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_waits_for_refill():
+    """バースト分は即時、それ以降は補充間隔だけ待つ"""
+    timer = FakeTime()
+    bucket = TokenBucket(60, 2, clock=timer.clock, sleep=timer.sleep)
+
+    for _ in range(3):
+        await bucket.acquire()
+
+    assert timer.sleeps == [pytest.approx(1.0)]
+
+
+def test_default_client_is_async_web_client():
+    """モックなしでAsyncWebClientを生成できる（aiohttpが依存関係に入っていること）"""
+    from slack_sdk.web.async_client import AsyncWebClient
+
+    client = SlackDispatcher(token="xoxb-test").client
+
+    assert isinstance(client, AsyncWebClient)
+    assert client.token == "xoxb-test"
+
+
+@pytest.mark.asyncio
+async def test_call_honors_retry_after():
+    """429が返った場合はRetry-Afterだけ待ってから再試行する"""
+    timer = FakeTime()
+    client = FakeClient(failures=[rate_limited_error("7")])
+    dispatcher = SlackDispatcher(client=client, clock=timer.clock, sleep=timer.sleep)
+
+    assert await dispatcher.call("chat.postMessage", channel="C1", text="hi") == {"ok": True}
+    assert len(client.calls) == 2
+    assert sum(timer.sleeps) == pytest.approx(7.0)
+
+
+@pytest.mark.asyncio
+async def test_call_gives_up_after_max_retries():
+    timer = FakeTime()
+    client = FakeClient(failures=[rate_limited_error("1")] * 3)
+    dispatcher = SlackDispatcher(client=client, max_retries=2, clock=timer.clock, sleep=timer.sleep)
+
+    with pytest.raises(SlackApiError):
+        await dispatcher.call("chat.postMessage", channel="C1", text="hi")
+    assert len(client.calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_channels_have_separate_buckets():
+    """chat.postMessageはチャンネルごとに制限する"""
+    timer = FakeTime()
+    dispatcher = SlackDispatcher(
+        client=FakeClient(), limits={"chat.postMessage": (60, 1)}, clock=timer.clock, sleep=timer.sleep
+    )
+
+    for channel in ("C1", "C2", "C3"):
+        await dispatcher.call("chat.postMessage", channel=channel, text="hi")
+
+    assert timer.sleeps == []
+
+
+@pytest.mark.asyncio
+async def test_submit_is_sent_by_workers():
+    """ワーカー起動中はキュー経由で送信され、Futureが送信結果で完了する"""
+    client = FakeClient()
+    dispatcher = SlackDispatcher(client=client, queue=InMemorySlackQueue(), concurrency=2)
+    dispatcher.start()
+    try:
+        futures = [
+            await dispatcher.submit("chat.postMessage", channel=f"C{i}", text="hi")
+            for i in range(3)
+        ]
+        results = await asyncio.wait_for(asyncio.gather(*futures), timeout=1.0)
+    finally:
+        await dispatcher.stop()
+
+    assert results == [{"ok": True}] * 3
+    assert sorted(call["channel"] for call in client.calls) == ["C0", "C1", "C2"]
+
+
+@pytest.mark.asyncio
+async def test_submit_future_carries_failure():
+    """送信に失敗したメッセージのFutureには例外が設定される"""
+    client = FakeClient(failures=[rate_limited_error("1")] * 2)
+    timer = FakeTime()
+    dispatcher = SlackDispatcher(
+        client=client, queue=InMemorySlackQueue(), concurrency=1, max_retries=1, sleep=timer.sleep
+    )
+    dispatcher.start()
+    try:
+        future = await dispatcher.submit("chat.postMessage", channel="C1", text="hi")
+        with pytest.raises(SlackApiError):
+            await asyncio.wait_for(future, timeout=1.0)
+    finally:
+        await dispatcher.stop()
+
+
+@pytest.mark.asyncio
+async def test_stop_drains_queue():
+    """停止時はキューに残ったメッセージを送り切ってからワーカーを止める"""
+    client = FakeClient()
+    queue = InMemorySlackQueue()
+    dispatcher = SlackDispatcher(client=client, queue=queue, concurrency=1)
+    dispatcher.start()
+    futures = [await dispatcher.submit("chat.postMessage", channel="C1", text=str(i)) for i in range(5)]
+
+    await dispatcher.stop()
+
+    assert [call["text"] for call in client.calls] == ["0", "1", "2", "3", "4"]
+    assert all(future.done() and future.result() == {"ok": True} for future in futures)
+    assert queue.qsize() == 0
+
+
+@pytest.mark.asyncio
+async def test_slack_service_reports_delivery_result():
+    """通知の成否は送信結果で判定する（キューに積んだだけでは成功にしない）"""
+    error = SlackApiError("channel_not_found", SlackResponse(
+        client=None, http_verb="POST", api_url="https://slack.com/api/chat.postMessage",
+        req_args={}, data={"ok": False, "error": "channel_not_found"}, headers={}, status_code=200,
+    ))
+    client = FakeClient(failures=[error])
+    dispatcher = SlackDispatcher(client=client, queue=InMemorySlackQueue(), concurrency=1)
+    service = SlackService("xoxb-test", dispatcher=dispatcher, coalesce_window_seconds=0)
+    dispatcher.start()
+    try:
+        failed = await service.send_status_update(
+            channel="C1", n_number="N00001", title="本", old_status=None,
+            new_status=ProgressStatus.PURCHASED, auto_resolve_channel=False
+        )
+        sent = await service.send_status_update(
+            channel="C1", n_number="N00001", title="本", old_status=ProgressStatus.PURCHASED,
+            new_status=ProgressStatus.COMPLETED, auto_resolve_channel=False
+        )
+    finally:
+        await dispatcher.stop()
+
+    assert failed is False
+    assert sent is True
@@ -0,0 +1,196 @@
+import asyncio
+from datetime import timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from slack_sdk.errors import SlackApiError
+
+from app.models.enums import ProgressStatus
+from app.services.slack import SlackService
+from app.services.slack_channel_cache import SlackChannelCache
+
+
+class RecordingDispatcher:
+    """送信内容を記録し、指定した結果のFutureを返すディスパッチャ"""
+
+    def __init__(self, result=None):
+        self.calls = []
+        self.result = result
+
+    async def submit(self, method, **params):
+        self.calls.append((method, params))
+        future = asyncio.get_running_loop().create_future()
+        if isinstance(self.result, Exception):
+            future.set_exception(self.result)
+        elif self.result != "pending":
+            future.set_result({"ok": True})
+        return future
+
+
+@pytest.fixture
+def dispatcher():
+    return RecordingDispatcher()
+
+
+@pytest.fixture
+def service(dispatcher, tmp_path):
+    """Google Sheetsなしで、チャンネル解決は渡されたチャンネルをそのまま使う"""
+    service = SlackService(
+        "xoxb-test",
+        channel_cache=SlackChannelCache(str(tmp_path / "channels.json"), 3600),
+        dispatcher=dispatcher,
+        coalesce_window_seconds=0,
+    )
+    service.client = MagicMock()
+    service.sheets_service = None
+    service.async_sheets_service = None
+    return service
+
+
+def channel_page(channels, next_cursor=""):
+    return {"channels": channels, "response_metadata": {"next_cursor": next_cursor}}
+
+
+@pytest.mark.asyncio
+async def test_resolve_channel_name_from_sheet(service):
+    """シートのチャンネル名に#を補い、見つからなければ既定のチャンネルを使う"""
+    service.sheets_service = MagicMock()
+    service.sheets_service.get_workflow_info.side_effect = [{"slack_channel": "books"}, None, RuntimeError("boom")]
+    service.async_sheets_service = MagicMock()
+    service.async_sheets_service.get_workflow_info = AsyncMock(
+        side_effect=[{"slack_channel": "#books"}, RuntimeError("boom")]
+    )
+
+    assert service.resolve_channel_name("N00001") == "#books"
+    assert service.resolve_channel_name("N00002", "#fallback") == "#fallback"
+    assert service.resolve_channel_name("N00003") == "#general"
+    assert await service.resolve_channel_name_async("N00001") == "#books"
+    assert await service.resolve_channel_name_async("N00002") == "#general"
+
+    service.sheets_service = service.async_sheets_service = None
+    assert service.resolve_channel_name("N00001", "#x") == "#x"
+    assert await service.resolve_channel_name_async("N00001", "#x") == "#x"
+
+
+def test_get_channel_id_pages_until_found_and_caches(service):
+    service.client.conversations_list.side_effect = [
+        channel_page([{"id": "C1", "name": "other", "is_member": True}], next_cursor="next"),
+        channel_page([{"id": "C2", "name": "books", "is_member": True}]),
+    ]
+
+    assert service.get_channel_id("#books") == "C2"
+    assert service.client.conversations_list.call_args.kwargs["cursor"] == "next"
+    # 取得済みのページのチャンネルはキャッシュから引く
+    assert service.get_channel_id("other") == "C1"
+    assert service.client.conversations_list.call_count == 2
+
+
+def test_get_channel_id_not_found_or_api_error(service):
+    service.client.conversations_list.side_effect = [
+        channel_page([{"id": "C3", "name": "books", "is_member": False}]),
+        SlackApiError("error", {"ok": False}),
+    ]
+
+    assert service.get_channel_id("#books") is None
+    assert service.get_channel_id("#books") is None
+
+
+@pytest.mark.asyncio
+async def test_resolve_channel_id_uses_resolved_name(service):
+    service.client.conversations_list.return_value = channel_page([{"id": "C9", "name": "general", "is_member": True}])
+
+    assert service.resolve_channel_id("N00001") == "C9"
+    assert await service.resolve_channel_id_async("N00001") == "C9"
+
+
+@pytest.mark.asyncio
+async def test_send_status_updates_sends_digest_per_channel(service, dispatcher):
+    """同じチャンネルの複数アイテムはダイジェスト、1件なら通常の通知"""
+    service.get_channel_id = MagicMock(return_value=None)
+
+    results = await service.send_status_updates([
+        ("#books", "N00001", "本1", ProgressStatus.DISCOVERED, ProgressStatus.PURCHASED),
+        ("#books", "N00002", "本2", ProgressStatus.DISCOVERED, ProgressStatus.PURCHASED),
+        ("#books", "N00001", "本1", ProgressStatus.PURCHASED, ProgressStatus.MANUSCRIPT_REQUESTED),
+        ("#other", "N00003", "本3", None, ProgressStatus.DISCOVERED),
+    ])
+
+    assert results == {"N00001": True, "N00002": True, "N00003": True}
+    digest, single = (params for _, params in dispatcher.calls)
+    assert digest["channel"] == "#books"
+    assert digest["text"] == "進捗更新まとめ: N00001, N00002"
+    assert single["channel"] == "#other"
+    assert single["text"].startswith("進捗更新: N00003")
+
+
+@pytest.mark.asyncio
+async def test_send_status_updates_splits_large_digests(service, dispatcher):
+    service.get_channel_id = MagicMock(return_value="C1")
+    service.digest_max_items = 2
+
+    results = await service.send_status_updates([
+        ("#books", f"N0000{i}", "本", ProgressStatus.DISCOVERED, ProgressStatus.PURCHASED) for i in range(3)
+    ])
+
+    assert len(results) == 3
+    assert [params["channel"] for _, params in dispatcher.calls] == ["C1", "C1"]
+
+
+@pytest.mark.asyncio
+async def test_completion_and_delay_alert_use_resolved_channel(service, dispatcher):
+    service.get_channel_id = MagicMock(return_value="C1")
+
+    completed = await service.send_completion_notification("#books", "N00001", "repo", {"pages": 100})
+    alerted = await service.send_delay_alert(
+        "#books", "N00001", "本", ProgressStatus.PURCHASED, timedelta(days=4), timedelta(days=3)
+    )
+
+    assert completed is True and alerted is True
+    assert [params["channel"] for _, params in dispatcher.calls] == ["C1", "C1"]
+    assert dispatcher.calls[0][1]["text"] == "制作完了: N00001 - repo"
+    assert dispatcher.calls[1][1]["text"].startswith("遅延アラート: N00001")
+
+
+@pytest.mark.asyncio
+async def test_delivery_result_pending_or_failed(service, dispatcher):
+    """結果を待ちきれなければNone、送信エラーならFalse"""
+    service.result_timeout_seconds = 0.01
+    dispatcher.result = "pending"
+    pending = await service.send_delay_alert(
+        "C1", "N00001", "本", ProgressStatus.PURCHASED, timedelta(days=4), None, auto_resolve_channel=False
+    )
+    dispatcher.result = RuntimeError("boom")
+    failed = await service.send_completion_notification("C1", "N00001", "repo", {}, auto_resolve_channel=False)
+
+    assert pending is None
+    assert failed is False
+
+
+def test_post_and_delete_test_message(service):
+    service.get_channel_id = MagicMock(return_value="C1")
+    service.client.chat_postMessage.return_value = {"ts": "1.0", "message": {"permalink": "https://example"}}
+
+    with patch("time.sleep") as sleep:
+        result = service.test_post_and_delete("#books", auto_delete_delay=3)
+
+    assert result["success"] is True
+    assert result["message_ts"] == "1.0"
+    assert result["post_result"]["permalink"] == "https://example"
+    sleep.assert_called_once_with(3)
+    service.client.chat_delete.assert_called_once_with(channel="C1", ts="1.0")
+
+
+def test_post_and_delete_reports_failures(service):
+    service.get_channel_id = MagicMock(return_value=None)
+    assert service.post_test_message("#missing") is None
+    assert service.delete_message("#missing", "1.0") is False
+    assert service.test_post_and_delete("#missing")["error"] == "Failed to post test message"
+
+    service.get_channel_id = MagicMock(return_value="C1")
+    service.client.chat_postMessage.return_value = {}
+    assert service.test_post_and_delete("#books")["error"] == "No message timestamp received"
+
+    service.client.chat_postMessage.side_effect = SlackApiError("error", {"ok": False})
+    service.client.chat_delete.side_effect = SlackApiError("error", {"ok": False})
+    assert service.post_test_message("#books")["success"] is False
+    assert service.delete_message("#books", "1.0") is False
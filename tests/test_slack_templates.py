@@ -0,0 +1,70 @@
+from app.models.enums import ProgressStatus
+from app.services.slack_templates import (
+    render_completion,
+    render_status_digest,
+    render_status_update,
+    status_label,
+)
+
+
+def test_status_update_shares_constant_blocks():
+    """値を含むブロックだけが毎回作られ、ステータスのフィールドと案内文は共有される"""
+    _, blocks = render_status_update("N00001", "本", [ProgressStatus.PURCHASED, ProgressStatus.COMPLETED])
+    _, again = render_status_update("N00002", "本", [ProgressStatus.PURCHASED, ProgressStatus.COMPLETED])
+
+    assert blocks[0]["text"]["text"] == "📊 進捗更新: N00001"
+    assert again[0]["text"]["text"] == "📊 進捗更新: N00002"
+    assert blocks[1]["fields"][3] is again[1]["fields"][3]
+    assert blocks[2] is again[2]
+
+
+def test_values_are_not_reinterpreted_as_placeholders():
+    text, blocks = render_status_update("N00001", "{title} と {n_number}", [None, ProgressStatus.PURCHASED])
+
+    assert "{title} と {n_number}" in blocks[1]["fields"][0]["text"]
+    assert text == f"進捗更新: N00001 - {status_label(ProgressStatus.PURCHASED)}"
+
+
+def test_status_update_uses_enum_labels_and_footer():
+    _, blocks = render_status_update(
+        "N00001", "本", [ProgressStatus.DISCOVERED, ProgressStatus.PURCHASED, ProgressStatus.MANUSCRIPT_REQUESTED]
+    )
+
+    assert blocks[1]["fields"][2]["text"] == "*変更前:*\n🔍 発見済み"
+    assert blocks[1]["fields"][3]["text"] == "*変更後:*\n✍️ 原稿依頼中"
+    assert blocks[2]["type"] == "context"
+    assert "原稿依頼をお忘れなく" in blocks[3]["text"]["text"]
+
+
+
+def test_status_update_from_creation_keeps_intermediate_status():
+    """新規作成からまとめた通知でも途中のステータスを表示する"""
+    _, blocks = render_status_update("N00001", "本", [None, ProgressStatus.DISCOVERED, ProgressStatus.PURCHASED])
+
+    assert blocks[1]["fields"][2]["text"] == "*変更前:*\nなし"
+    assert blocks[2]["elements"][0]["text"] == "*経過:* 🔍 発見済み → 💰 購入完了"
+
+def test_completion_shows_at_most_two_metadata_fields():
+    _, blocks = render_completion("N00001", "repo", {"pages": 120, "format": "PDF", "completed_by": "editor"})
+
+    assert [field["text"] for field in blocks[2]["fields"]] == ["*ページ数:*\n120ページ", "*フォーマット:*\nPDF"]
+    assert "制作が完了しました" in blocks[3]["text"]["text"]
+
+
+def test_digest_lists_each_item():
+    text, blocks = render_status_digest([
+        ("N00001", "本1", [ProgressStatus.DISCOVERED, ProgressStatus.PURCHASED]),
+        ("N00002", "本2", [None, ProgressStatus.DISCOVERED]),
+    ])
+
+    assert text == "進捗更新まとめ: N00001, N00002"
+    assert blocks[0]["text"]["text"] == "📊 進捗更新まとめ（2件）"
+    assert blocks[2]["text"]["text"] == f"*N00002* 本2\n{status_label(ProgressStatus.DISCOVERED)}"
+
+
+def test_rendered_block_list_is_not_shared():
+    _, first = render_completion("N00001", "repo", None)
+    first.append({"type": "divider"})
+    _, second = render_completion("N00001", "repo", None)
+
+    assert len(second) == len(first) - 1
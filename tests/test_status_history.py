@@ -0,0 +1,91 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import text
+
+from app.crud.workflow import add_notification_event, get_status_history
+from app.models.enums import NotificationStatus, ProgressStatus, WebhookSource
+from app.services.workflow import WorkflowService
+
+
+pytestmark = pytest.mark.usefixtures("no_rate_limit")
+
+
+@pytest.mark.asyncio
+async def test_upsert_records_only_status_changes(db_session):
+    service = WorkflowService(db_session)
+    await service.create_or_update(n_number="N01234", status=ProgressStatus.PURCHASED, source=WebhookSource.TECH)
+    await service.create_or_update(n_number="N01234", title="タイトルのみ更新")
+    await service.bulk_create_or_update(
+        [{"n_number": "N01234", "status": ProgressStatus.FIRST_PROOF}, {"n_number": "N05678"}],
+        source=WebhookSource.TECH
+    )
+    await service.update_status("N01234", ProgressStatus.SECOND_PROOF, source=WebhookSource.MANUAL, changed_by="editor1")
+
+    history = [event.to_dict() for event in await get_status_history(db_session, "N01234")]
+
+    assert [(e["old_status"], e["new_status"]) for e in history] == [
+        ("first_proof", "second_proof"),
+        ("purchased", "first_proof"),
+        (None, "purchased"),
+    ]
+    assert (history[0]["source"], history[0]["changed_by"]) == ("manual", "editor1")
+    assert history[1]["source"] == "tech"
+    # 新規作成はデフォルトのステータスで記録される
+    assert [e.new_status for e in await get_status_history(db_session, "N05678")] == [ProgressStatus.DISCOVERED]
+
+
+
+@pytest.mark.asyncio
+async def test_transition_uses_current_status_without_history(db_session):
+    """履歴テーブル導入前からあるアイテムも実際の変更前ステータスを遷移元にする"""
+    await db_session.execute(text(
+        "INSERT INTO workflow_items (n_number, book_id, title, author, status, repository_name, slack_channel, "
+        "workflow_metadata) VALUES ('N01234', '', '本', '', 'PURCHASED', '', '#general', '{}')"
+    ))
+    await db_session.execute(text(
+        "INSERT INTO workflow_items (n_number, book_id, title, author, status, repository_name, slack_channel, "
+        "workflow_metadata) VALUES ('N05678', '', '本', '', 'DISCOVERED', '', '#general', '{}')"
+    ))
+    await db_session.commit()
+    service = WorkflowService(db_session)
+
+    await service.create_or_update(n_number="N01234", status=ProgressStatus.FIRST_PROOF)
+    await service.create_or_update(n_number="N01234", status=ProgressStatus.FIRST_PROOF)
+    await service.bulk_update_status(ProgressStatus.PURCHASED, n_numbers=["N05678"])
+
+    assert [(e.old_status, e.new_status) for e in await get_status_history(db_session, "N01234")] == [
+        (ProgressStatus.PURCHASED, ProgressStatus.FIRST_PROOF),
+    ]
+    assert [(e.old_status, e.new_status) for e in await get_status_history(db_session, "N05678")] == [
+        (ProgressStatus.DISCOVERED, ProgressStatus.PURCHASED),
+    ]
+
+@pytest.mark.asyncio
+async def test_history_endpoints_return_newest_first(async_client: AsyncClient, db_session):
+    service = WorkflowService(db_session)
+    await service.create_or_update(n_number="N01234", status=ProgressStatus.PURCHASED)
+    await service.update_status("N01234", ProgressStatus.MANUSCRIPT_REQUESTED)
+    add_notification_event(db_session, "N01234", "#books", NotificationStatus.SENT, source=WebhookSource.TECH)
+    add_notification_event(db_session, "N01234", "#books", NotificationStatus.FAILED, source=WebhookSource.TECH)
+    await db_session.commit()
+
+    history = await async_client.get("/api/v1/progress/n01234/history", params={"limit": 1})
+    notifications = await async_client.get("/api/v1/progress/N01234/notifications")
+
+    assert history.status_code == 200
+    assert [e["new_status"] for e in history.json()["history"]] == ["manuscript_requested"]
+    assert notifications.status_code == 200
+    assert [e["status"] for e in notifications.json()["notifications"]] == ["failed", "sent"]
+
+
+@pytest.mark.asyncio
+async def test_history_query_uses_index(db_session):
+    """N番号の履歴取得はテーブル全体を走査しない"""
+    plan = await db_session.execute(text(
+        "EXPLAIN QUERY PLAN SELECT * FROM workflow_status_events "
+        "WHERE n_number = 'N01234' ORDER BY created_at DESC, id DESC LIMIT 50"
+    ))
+    details = " ".join(row[-1] for row in plan)
+
+    assert "ix_workflow_status_events_n_number_created_at" in details
+    assert "TEMP B-TREE" not in details
@@ -0,0 +1,157 @@
+import json
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.core.deps import get_db, get_slack_service
+from app.main import app
+from app.models.enums import ProgressStatus
+from app.services.webhook_idempotency import WebhookIdempotencyStore
+from app.services.workflow import WorkflowService
+from tests.test_webhook_endpoints import generate_signature
+
+
+pytestmark = pytest.mark.usefixtures("no_rate_limit")
+
+
+@pytest.fixture
+def slack_service(db_session):
+    """共有SlackServiceのモックとテスト用DBセッションを差し替える"""
+    service = AsyncMock()
+    service.send_status_update.return_value = True
+
+    async def _override_get_db():
+        yield db_session
+
+    app.dependency_overrides[get_slack_service] = lambda: service
+    app.dependency_overrides[get_db] = _override_get_db
+    yield service
+    app.dependency_overrides.pop(get_slack_service, None)
+    app.dependency_overrides.pop(get_db, None)
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_or_update_keeps_unspecified_fields(db_session):
+    """更新時は指定されたフィールドのみ変更する"""
+    service = WorkflowService(db_session)
+    await service.bulk_create_or_update([
+        {"n_number": "N00001", "title": "既存の本", "status": ProgressStatus.DISCOVERED, "assigned_editor": "editor1"},
+    ])
+
+    items = await service.bulk_create_or_update([
+        {"n_number": "N00001", "status": ProgressStatus.PURCHASED},
+        {"n_number": "N00002", "title": "新しい本"},
+    ])
+
+    assert [item.n_number for item in items] == ["N00001", "N00002"]
+    assert items[0].status == ProgressStatus.PURCHASED
+    assert items[0].title == "既存の本"
+    assert items[0].assigned_editor == "editor1"
+    assert items[1].status == ProgressStatus.DISCOVERED
+    assert items[1].slack_channel == "#general"
+
+
+@pytest.mark.asyncio
+async def test_tech_webhook_batch_returns_per_item_results(
+    async_client: AsyncClient, sample_tech_webhook_payload, slack_service
+):
+    """不正なイベントはスキップし、イベントごとの結果を返す"""
+    settings.TECH_WEBHOOK_SECRET = "test-secret"
+    payload = {
+        "events": [
+            sample_tech_webhook_payload,
+            {**sample_tech_webhook_payload, "n_number": "N99998", "status": "unknown"},
+            {**sample_tech_webhook_payload, "n_number": "N99997", "status": "completed"},
+        ]
+    }
+
+    response = await async_client.post(
+        "/api/v1/webhook/tech/status-change/batch",
+        content=json.dumps(payload, separators=(',', ':')),
+        headers={
+            "X-Webhook-Signature": generate_signature(payload, "test-secret"),
+            "Content-Type": "application/json",
+        }
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] == "partial"
+    assert data["failed"] == 1
+    assert [result["status"] for result in data["results"]] == ["success", "error", "success"]
+    assert data["results"][2]["workflow_status"] == "completed"
+    assert slack_service.send_status_update.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_tech_webhook_batch_rejects_empty_events(async_client: AsyncClient, slack_service):
+    settings.TECH_WEBHOOK_SECRET = "test-secret"
+    payload = {"events": []}
+
+    response = await async_client.post(
+        "/api/v1/webhook/tech/status-change/batch",
+        content=json.dumps(payload, separators=(',', ':')),
+        headers={
+            "X-Webhook-Signature": generate_signature(payload, "test-secret"),
+            "Content-Type": "application/json",
+        }
+    )
+
+    assert response.status_code == 400
+
+
+
+@pytest.mark.asyncio
+async def test_tech_webhook_batch_skips_duplicate_events(
+    async_client: AsyncClient, sample_tech_webhook_payload, slack_service, redis
+):
+    """単体・一括のどちらで処理済みのイベントも重複として処理しない"""
+    settings.TECH_WEBHOOK_SECRET = "test-secret"
+    retried = {**sample_tech_webhook_payload, "n_number": "N99997", "status": "completed"}
+
+    async def post(events):
+        payload = {"events": events}
+        return await async_client.post(
+            "/api/v1/webhook/tech/status-change/batch",
+            content=json.dumps(payload, separators=(',', ':')),
+            headers={
+                "X-Webhook-Signature": generate_signature(payload, "test-secret"),
+                "Content-Type": "application/json",
+            }
+        )
+
+    store = WebhookIdempotencyStore(redis, ttl_seconds=60)
+    with patch('app.api.v1.webhooks.get_idempotency_store', new=AsyncMock(return_value=store)):
+        first = await post([sample_tech_webhook_payload, {"status": "purchased"}])
+        second = await post([{"status": "purchased"}, retried, sample_tech_webhook_payload])
+
+    assert [result["status"] for result in first.json()["results"]] == ["success", "error"]
+    data = second.json()
+    assert data["duplicates"] == 1
+    assert data["failed"] == 1
+    assert [(result["index"], result["status"]) for result in data["results"]] == [
+        (0, "error"), (1, "success"), (2, "duplicate"),
+    ]
+    assert slack_service.send_status_update.await_count == 2
+
+@pytest.mark.asyncio
+async def test_create_or_update_statements(db_session):
+    """create_or_updateはrefreshを行わず、遷移元の読み取り・upsert・履歴の追記の3文で処理する"""
+    service = WorkflowService(db_session)
+    await service.create_or_update(n_number="N00003", title="本", slack_channel="#books")
+
+    statements = []
+    engine = db_session.get_bind()
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        item = await service.create_or_update(n_number="N00003", status=ProgressStatus.FIRST_PROOF)
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    assert [statement.split()[0].upper() for statement in statements] == ["SELECT", "INSERT", "INSERT"]
+    assert item.status == ProgressStatus.FIRST_PROOF
+    assert item.slack_channel == "#books"
@@ -0,0 +1,113 @@
+import json
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from httpx import AsyncClient
+
+from app.core.config import settings
+from app.models.enums import WebhookSource
+from app.services.webhook_idempotency import WebhookIdempotencyStore, idempotency_key
+from tests.test_webhook_endpoints import generate_signature
+
+
+class InMemoryRedis:
+    """SET NX/EXと GET/DELETE だけを実装したテスト用Redis"""
+
+    def __init__(self):
+        self.data = {}
+
+    async def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        return True
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def delete(self, key):
+        return 1 if self.data.pop(key, None) is not None else 0
+
+
+@pytest.fixture
+def store():
+    return WebhookIdempotencyStore(InMemoryRedis(), ttl_seconds=60)
+
+
+pytestmark = pytest.mark.usefixtures("no_rate_limit")
+
+
+def test_idempotency_key_prefers_delivery_id(sample_tech_webhook_payload):
+    """配信IDがあればそれを、なければ正規化したペイロードのハッシュを使う"""
+    reordered = dict(reversed(list(sample_tech_webhook_payload.items())))
+
+    assert idempotency_key(WebhookSource.TECH, sample_tech_webhook_payload) == \
+        idempotency_key(WebhookSource.TECH, reordered)
+    assert idempotency_key(WebhookSource.TECH, sample_tech_webhook_payload) != \
+        idempotency_key(WebhookSource.TECHZIP, sample_tech_webhook_payload)
+    assert idempotency_key(WebhookSource.TECH, sample_tech_webhook_payload, "d-1").endswith(":id:d-1")
+
+
+@pytest.mark.asyncio
+async def test_claim_store_and_release(store):
+    """初回はNone、処理中はpending、保存後はレスポンスを返す"""
+    assert await store.claim("k") is None
+    assert await store.claim("k") == {"pending": True}
+
+    await store.store("k", 202, {"status": "accepted"})
+    assert await store.claim("k") == {"status_code": 202, "body": {"status": "accepted"}}
+
+    await store.release("k")
+    assert await store.claim("k") is None
+
+
+@pytest.mark.asyncio
+async def test_duplicate_webhook_replays_cached_response(
+    async_client: AsyncClient, sample_tech_webhook_payload, store
+):
+    """再送された同一イベントはキューに投入せず保存済みのレスポンスを返す"""
+    settings.TECH_WEBHOOK_SECRET = "test-secret"
+    body = json.dumps(sample_tech_webhook_payload, separators=(',', ':'))
+    headers = {
+        "X-Webhook-Signature": generate_signature(sample_tech_webhook_payload, "test-secret"),
+        "Content-Type": "application/json",
+    }
+    enqueue = AsyncMock(return_value="1-0")
+
+    with patch('app.api.v1.webhooks.get_idempotency_store', new=AsyncMock(return_value=store)), \
+            patch('app.api.v1.webhooks.enqueue_webhook', new=enqueue):
+        first = await async_client.post("/api/v1/webhook/tech/status-change", content=body, headers=headers)
+        second = await async_client.post("/api/v1/webhook/tech/status-change", content=body, headers=headers)
+
+    assert first.status_code == 202
+    assert second.status_code == 202
+    assert second.json() == first.json()
+    assert second.headers["X-Idempotent-Replay"] == "true"
+    enqueue.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_failed_webhook_releases_key(async_client: AsyncClient, sample_techzip_webhook_payload, store):
+    """処理に失敗した場合はキーを解放し、再送で再処理できる"""
+    settings.TECHZIP_WEBHOOK_SECRET = "test-secret"
+    settings.WEBHOOK_ASYNC_PROCESSING = False
+    body = json.dumps(sample_techzip_webhook_payload, separators=(',', ':'))
+    headers = {
+        "X-Webhook-Signature": generate_signature(sample_techzip_webhook_payload, "test-secret"),
+        "Content-Type": "application/json",
+        "X-Webhook-Delivery-Id": "delivery-1",
+    }
+    processor = AsyncMock(side_effect=RuntimeError("sheets unavailable"))
+
+    try:
+        with patch('app.api.v1.webhooks.get_idempotency_store', new=AsyncMock(return_value=store)), \
+                patch.dict('app.api.v1.webhooks.WEBHOOK_PROCESSORS', {WebhookSource.TECHZIP: processor}):
+            first = await async_client.post("/api/v1/webhook/techzip/completion", content=body, headers=headers)
+            second = await async_client.post("/api/v1/webhook/techzip/completion", content=body, headers=headers)
+    finally:
+        settings.WEBHOOK_ASYNC_PROCESSING = True
+
+    assert first.status_code == 500
+    assert second.status_code == 500
+    assert processor.await_count == 2
+    assert store.redis.data == {}
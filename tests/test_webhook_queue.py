@@ -0,0 +1,287 @@
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from httpx import AsyncClient
+from redis.exceptions import ConnectionError, ResponseError
+
+from app.core.config import settings
+from app.core.deps import get_db, get_slack_service
+from app.main import app
+from app.models.enums import ProgressStatus, WebhookSource
+from app.services.webhook_queue import DEAD_LETTER_KEY, STREAM_KEY, WebhookQueue, WebhookWorkerPool, enqueue_webhook
+from tests.conftest import TestSessionLocal
+from tests.test_webhook_endpoints import generate_signature
+
+
+pytestmark = pytest.mark.usefixtures("no_rate_limit")
+
+
+def signed_body(payload: dict) -> bytes:
+    """署名生成時と同じ形式でシリアライズ"""
+    return json.dumps(payload, separators=(',', ':')).encode()
+
+
+@pytest.fixture
+def slack_service():
+    """共有SlackServiceのモック"""
+    service = AsyncMock()
+    app.dependency_overrides[get_slack_service] = lambda: service
+    yield service
+    app.dependency_overrides.pop(get_slack_service, None)
+
+
+@pytest.fixture
+def override_deps_db(db_session):
+    """app.core.deps.get_dbもテスト用セッションに差し替える"""
+    async def _override_get_db():
+        yield db_session
+
+    app.dependency_overrides[get_db] = _override_get_db
+    yield
+    app.dependency_overrides.pop(get_db, None)
+
+
+@pytest.fixture
+def signed_headers(sample_tech_webhook_payload):
+    settings.TECH_WEBHOOK_SECRET = "test-secret"
+    return {
+        "X-Webhook-Signature": generate_signature(sample_tech_webhook_payload, "test-secret"),
+        "Content-Type": "application/json"
+    }
+
+
+@pytest.fixture
+def queue():
+    """Redis Streamsキューのモック"""
+    mock_queue = MagicMock()
+    mock_queue.ack = AsyncMock()
+    mock_queue.dead_letter = AsyncMock()
+    mock_queue.delivery_count = AsyncMock(return_value=1)
+    return mock_queue
+
+
+@pytest.fixture
+def worker_pool(slack_service, db_session):
+    return WebhookWorkerPool(
+        queue_factory=AsyncMock(),
+        slack_service_factory=lambda: slack_service,
+        concurrency=1,
+        max_attempts=3,
+        retry_idle_seconds=30,
+        session_factory=TestSessionLocal,
+    )
+
+
+def message_fields(source: WebhookSource, payload: dict) -> dict:
+    return {"source": source.value, "payload": json.dumps(payload), "received_at": "2025-01-29T10:00:00"}
+
+
+@pytest.mark.asyncio
+async def test_tech_webhook_is_acknowledged_immediately(
+    async_client: AsyncClient, sample_tech_webhook_payload, signed_headers, slack_service
+):
+    """キューに投入できた場合は処理を待たずに202を返す"""
+    with patch('app.api.v1.webhooks.enqueue_webhook', new=AsyncMock(return_value="1-0")) as mock_enqueue:
+        response = await async_client.post(
+            "/api/v1/webhook/tech/status-change",
+            content=signed_body(sample_tech_webhook_payload),
+            headers=signed_headers
+        )
+
+    assert response.status_code == 202
+    assert response.json()["event_id"] == "1-0"
+    mock_enqueue.assert_awaited_once_with(WebhookSource.TECH, sample_tech_webhook_payload)
+    slack_service.send_status_update.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_tech_webhook_invalid_status_is_rejected_before_enqueue(
+    async_client: AsyncClient, sample_tech_webhook_payload, slack_service
+):
+    """不正なステータスはキューに投入しない"""
+    payload = {**sample_tech_webhook_payload, "status": "unknown"}
+    settings.TECH_WEBHOOK_SECRET = "test-secret"
+
+    with patch('app.api.v1.webhooks.enqueue_webhook', new=AsyncMock()) as mock_enqueue:
+        response = await async_client.post(
+            "/api/v1/webhook/tech/status-change",
+            content=signed_body(payload),
+            headers={"X-Webhook-Signature": generate_signature(payload, "test-secret")}
+        )
+
+    assert response.status_code == 400
+    mock_enqueue.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_tech_webhook_falls_back_to_inline_processing(
+    async_client: AsyncClient, sample_tech_webhook_payload, signed_headers, slack_service, override_deps_db
+):
+    """Redisに接続できない場合はリクエスト内で処理する"""
+    with patch('app.api.v1.webhooks.enqueue_webhook', new=AsyncMock(return_value=None)):
+        response = await async_client.post(
+            "/api/v1/webhook/tech/status-change",
+            content=signed_body(sample_tech_webhook_payload),
+            headers=signed_headers
+        )
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "success"
+    slack_service.send_status_update.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_worker_processes_and_acks(worker_pool, queue, slack_service, sample_tech_webhook_payload):
+    """ワーカーはDB更新・通知後にACKする"""
+    handled = await worker_pool.handle(
+        queue, "1-0", message_fields(WebhookSource.TECH, sample_tech_webhook_payload)
+    )
+
+    assert handled is True
+    queue.ack.assert_awaited_once_with("1-0")
+    slack_service.send_status_update.assert_awaited_once()
+    assert slack_service.send_status_update.await_args.kwargs["new_status"] == ProgressStatus.PURCHASED
+
+
+@pytest.mark.asyncio
+async def test_worker_leaves_failed_message_pending(worker_pool, queue, slack_service, sample_tech_webhook_payload):
+    """一時的な失敗はACKせず、後でリトライさせる"""
+    slack_service.send_status_update.side_effect = RuntimeError("slack down")
+
+    handled = await worker_pool.handle(
+        queue, "1-0", message_fields(WebhookSource.TECH, sample_tech_webhook_payload)
+    )
+
+    assert handled is False
+    queue.ack.assert_not_called()
+    queue.dead_letter.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_worker_dead_letters_permanent_failures(worker_pool, queue, sample_techzip_webhook_payload):
+    """対象が存在しない完了通知はリトライせずデッドレターへ移す"""
+    handled = await worker_pool.handle(
+        queue, "1-0", message_fields(WebhookSource.TECHZIP, sample_techzip_webhook_payload)
+    )
+
+    assert handled is False
+    queue.dead_letter.assert_awaited_once()
+    assert "WorkflowItem not found" in queue.dead_letter.await_args.args[2]
+
+
+@pytest.mark.asyncio
+async def test_worker_dead_letters_after_max_attempts(worker_pool, queue, sample_tech_webhook_payload):
+    """配信回数が上限を超えたメッセージはデッドレターへ移す"""
+    queue.delivery_count.return_value = 4
+
+    handled = await worker_pool.handle(
+        queue, "1-0", message_fields(WebhookSource.TECH, sample_tech_webhook_payload), retry=True
+    )
+
+    assert handled is False
+    queue.dead_letter.assert_awaited_once_with(
+        "1-0", message_fields(WebhookSource.TECH, sample_tech_webhook_payload), "max attempts exceeded"
+    )
+
+
+@pytest.mark.asyncio
+async def test_worker_dead_letters_invalid_message(worker_pool, queue):
+    """ソースやペイロードを解釈できないメッセージはリトライしない"""
+    handled = await worker_pool.handle(queue, "1-0", {"source": "unknown", "payload": "{}"})
+
+    assert handled is False
+    assert queue.dead_letter.await_args.args[2].startswith("invalid message:")
+
+
+@pytest.fixture
+def redis_client():
+    """Redis Streamsコマンドのモック"""
+    redis = MagicMock()
+    for command in ("xgroup_create", "xadd", "xreadgroup", "xautoclaim", "xpending_range"):
+        setattr(redis, command, AsyncMock())
+    pipe = MagicMock()
+    pipe.execute = AsyncMock()
+    redis.pipeline.return_value.__aenter__ = AsyncMock(return_value=pipe)
+    redis.pipeline.return_value.__aexit__ = AsyncMock(return_value=False)
+    redis.pipe = pipe
+    return redis
+
+
+@pytest.mark.asyncio
+async def test_queue_stream_commands(redis_client):
+    queue = WebhookQueue(redis_client)
+    redis_client.xgroup_create.side_effect = ResponseError("BUSYGROUP Consumer Group name already exists")
+    redis_client.xadd.return_value = "1-0"
+    redis_client.xreadgroup.return_value = [[STREAM_KEY, [("1-0", {"source": "tech"})]]]
+    redis_client.xautoclaim.return_value = ["0-0", [("2-0", {"source": "tech"}), ("3-0", {})], []]
+    redis_client.xpending_range.side_effect = [[{"times_delivered": 2}], []]
+
+    await queue.ensure_group()
+    assert await queue.enqueue(WebhookSource.TECH, {"n_number": "N01234"}) == "1-0"
+    assert json.loads(redis_client.xadd.await_args.args[1]["payload"]) == {"n_number": "N01234"}
+    assert await queue.read("worker-0", count=1, block_ms=10) == [("1-0", {"source": "tech"})]
+    # 削除済みのメッセージ（フィールドなし）は引き取らない
+    assert await queue.claim_stale("worker-0", 1000, count=2) == [("2-0", {"source": "tech"})]
+    assert await queue.delivery_count("2-0") == 2
+    assert await queue.delivery_count("9-0") == 0
+
+    await queue.dead_letter("2-0", {"source": "tech"}, "boom")
+    assert redis_client.xadd.await_args.args[0] == DEAD_LETTER_KEY
+    assert redis_client.xadd.await_args.args[1]["original_id"] == "2-0"
+    redis_client.pipe.xack.assert_called_once_with(STREAM_KEY, "webhook-workers", "2-0")
+    redis_client.pipe.xdel.assert_called_once_with(STREAM_KEY, "2-0")
+
+
+@pytest.mark.asyncio
+async def test_queue_ensure_group_raises_other_errors(redis_client):
+    redis_client.xgroup_create.side_effect = ResponseError("WRONGTYPE")
+
+    with pytest.raises(ResponseError):
+        await WebhookQueue(redis_client).ensure_group()
+
+
+@pytest.mark.asyncio
+async def test_enqueue_webhook_returns_none_without_redis():
+    with patch("app.services.webhook_queue.get_webhook_queue", new=AsyncMock(side_effect=ConnectionError("down"))):
+        assert await enqueue_webhook(WebhookSource.TECH, {"n_number": "N01234"}) is None
+
+
+@pytest.mark.asyncio
+async def test_worker_loop_retries_stale_then_reads_new(worker_pool, queue):
+    """リトライ対象を先に処理し、キューの取得に失敗したら作り直す"""
+    processed = asyncio.Event()
+    queue.ensure_group = AsyncMock()
+    stale = [[("1-0", {})]]
+    new = [RuntimeError("redis down"), [("2-0", {})]]
+
+    async def read(consumer, count, block_ms):
+        if not new:
+            await asyncio.sleep(3600)
+        result = new.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    queue.claim_stale = AsyncMock(side_effect=lambda *args, **kwargs: stale.pop() if stale else [])
+    queue.read = read
+    worker_pool.queue_factory = AsyncMock(return_value=queue)
+    worker_pool.error_backoff_seconds = 0
+    handled = []
+
+    async def handle(queue, message_id, fields, retry=False):
+        handled.append((message_id, retry))
+        if message_id == "2-0":
+            processed.set()
+        return True
+
+    worker_pool.handle = handle
+    worker_pool.start()
+    try:
+        await asyncio.wait_for(processed.wait(), timeout=1)
+    finally:
+        await worker_pool.stop()
+
+    assert handled == [("1-0", True), ("2-0", False)]
+    assert worker_pool.queue_factory.await_count == 2
@@ -0,0 +1,109 @@
+from datetime import datetime
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from httpx import AsyncClient
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.models.enums import ProgressStatus
+from app.models.workflow import WorkflowItem
+from app.services.workflow import WorkflowService
+from app.services.workflow_cache import WorkflowItemCache
+
+
+def make_item(n_number="N01234", status=ProgressStatus.PURCHASED):
+    return WorkflowItem(
+        id=1,
+        n_number=n_number,
+        title="テスト書籍",
+        status=status,
+        workflow_metadata={},
+        created_at=datetime(2025, 1, 1),
+        updated_at=datetime(2025, 1, 1),
+    )
+
+
+pytestmark = pytest.mark.usefixtures("no_rate_limit")
+
+
+@pytest.mark.asyncio
+async def test_read_through_uses_local_then_redis(redis):
+    """初回のみloaderで読み込み、以降はLRU、別プロセス相当のキャッシュはRedisから取得"""
+    async def redis_factory():
+        return redis
+
+    loader = AsyncMock(return_value=make_item())
+    cache = WorkflowItemCache(redis_factory=redis_factory)
+
+    first = await cache.get_or_load("N01234", loader)
+    second = await cache.get_or_load("N01234", loader)
+    other = await WorkflowItemCache(redis_factory=redis_factory).get_or_load("N01234", loader)
+
+    assert first == second == other
+    assert loader.await_count == 1
+    assert cache.stats()["local_hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+@pytest.mark.asyncio
+async def test_local_entries_expire_and_evict():
+    now = [0.0]
+    cache = WorkflowItemCache(redis_factory=None, local_max_items=2, local_ttl_seconds=5, clock=lambda: now[0])
+
+    await cache.set("N1", "1")
+    await cache.set("N2", "2")
+    assert await cache.get("N1") == "1"
+    await cache.set("N3", "3")  # N2が最も古い
+
+    assert await cache.get("N2") is None
+    now[0] = 10.0
+    assert await cache.get("N1") is None
+
+
+@pytest.mark.asyncio
+async def test_redis_errors_fall_back_to_loader():
+    """Redisに接続できなくてもデータベースから読み込める"""
+    async def redis_factory():
+        raise RedisConnectionError("connection refused")
+
+    cache = WorkflowItemCache(redis_factory=redis_factory)
+    loader = AsyncMock(return_value=None)
+
+    assert await cache.get_or_load("N99999", loader) is None
+    await cache.invalidate("N99999")
+    loader.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_writes_invalidate_cached_item(db_session, shared_cache, redis):
+    """WorkflowServiceの更新後は新しい内容を返す"""
+    service = WorkflowService(db_session)
+    await service.create_or_update(n_number="N01234", title="テスト書籍", status=ProgressStatus.PURCHASED)
+
+    cached = await shared_cache.get_item("N01234", lambda: service.get_by_n_number("N01234"))
+    assert cached.status == ProgressStatus.PURCHASED
+    assert redis.data
+
+    await service.update_status("N01234", ProgressStatus.MANUSCRIPT_REQUESTED)
+
+    assert "techbridge:workflow:item:N01234" not in redis.data
+    cached = await shared_cache.get_item("N01234", lambda: service.get_by_n_number("N01234"))
+    assert cached.status == ProgressStatus.MANUSCRIPT_REQUESTED
+
+
+@pytest.mark.asyncio
+async def test_progress_detail_is_served_from_cache(async_client: AsyncClient, db_session, shared_cache):
+    db_session.add(make_item())
+    await db_session.commit()
+
+    first = await async_client.get("/api/v1/progress/n01234")
+    with patch('app.crud.workflow.get_workflow_item_by_n_number', new=AsyncMock()) as load:
+        second = await async_client.get("/api/v1/progress/N01234")
+    stats = await async_client.get("/health/cache")
+
+    assert first.status_code == second.status_code == 200
+    assert second.json() == first.json()
+    assert first.json()["n_number"] == "N01234"
+    load.assert_not_awaited()
+    assert stats.json()["workflow_items"]["hits"] == 1
+    assert stats.json()["workflow_items"]["misses"] == 1
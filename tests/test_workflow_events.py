@@ -0,0 +1,87 @@
+import asyncio
+import json
+from unittest.mock import patch
+
+import pytest
+
+from app.models.enums import ProgressStatus
+from app.services.workflow import WorkflowService
+from app.services.workflow_events import InMemoryEventLog, WorkflowEvent, WorkflowEventBroker
+
+
+def event(n_number, status, editor=None, previous=None):
+    return WorkflowEvent("updated", {"n_number": n_number, "status": status, "assigned_editor": editor}, previous)
+
+
+def parse(message):
+    """SSEメッセージのid/event/dataを取り出す"""
+    fields = dict(line.split(": ", 1) for line in message.strip().splitlines())
+    return fields.get("id"), fields.get("event"), json.loads(fields["data"]) if "data" in fields else None
+
+
+@pytest.fixture
+def broker():
+    return WorkflowEventBroker(InMemoryEventLog(max_len=3), queue_size=10)
+
+
+def test_filter_matches_new_or_previous_values():
+    moved = event("N1", "first_proof", previous={"status": "manuscript_received", "assigned_editor": None})
+
+    assert moved.matches(status="first_proof")
+    assert moved.matches(status="manuscript_received")
+    assert not moved.matches(status="completed")
+    assert not event("N2", "first_proof", "editor1").matches(assigned_editor="editor2")
+
+
+@pytest.mark.asyncio
+async def test_stream_delivers_filtered_events(broker):
+    stream = broker.stream(status="completed", heartbeat_seconds=60)
+    assert (await anext(stream)).startswith("retry:")
+
+    next_message = asyncio.ensure_future(anext(stream))
+    await asyncio.sleep(0)
+    await broker.publish([event("N1", "first_proof"), event("N2", "completed")])
+
+    event_id, event_type, data = parse(await next_message)
+    assert (event_id, event_type, data["n_number"]) == ("2-0", "updated", "N2")
+    await stream.aclose()
+    assert not broker._subscriptions
+
+
+@pytest.mark.asyncio
+async def test_stream_resumes_after_last_event_id(broker):
+    await broker.publish([event("N1", "discovered"), event("N2", "discovered"), event("N3", "discovered")])
+
+    stream = broker.stream(last_event_id="1-0", heartbeat_seconds=60)
+    await anext(stream)
+    replayed = [parse(await anext(stream))[0] for _ in range(2)]
+    await stream.aclose()
+
+    assert replayed == ["2-0", "3-0"]
+
+
+@pytest.mark.asyncio
+async def test_stream_resets_when_history_is_gone(broker):
+    """保持件数を超えて古いIDからの再開はresetを送る"""
+    await broker.publish([event(f"N{i}", "discovered") for i in range(5)])
+
+    stream = broker.stream(last_event_id="1-0", heartbeat_seconds=60)
+    await anext(stream)
+    _, event_type, _ = parse(await anext(stream))
+    await stream.aclose()
+
+    assert event_type == "reset"
+
+
+@pytest.mark.asyncio
+async def test_workflow_service_publishes_changes(db_session, broker):
+    subscription = broker.subscribe()
+    with patch('app.services.workflow.workflow_events', broker):
+        service = WorkflowService(db_session)
+        await service.create_or_update(n_number="N01234", title="テスト書籍", status=ProgressStatus.PURCHASED)
+        await service.update_status("N01234", ProgressStatus.MANUSCRIPT_REQUESTED)
+
+    created, updated = subscription.queue.get_nowait(), subscription.queue.get_nowait()
+    assert created.item["status"] == ProgressStatus.PURCHASED.value
+    assert updated.item["status"] == ProgressStatus.MANUSCRIPT_REQUESTED.value
+    assert updated.previous["status"] == ProgressStatus.PURCHASED.value
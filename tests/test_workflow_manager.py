@@ -0,0 +1,86 @@
+import pytest
+
+from app.crud.workflow import get_status_history
+from app.models.enums import ProgressStatus, WebhookSource
+from app.schemas.progress import WorkflowItemCreate, WorkflowItemUpdate
+from app.services.workflow import WorkflowService
+from app.services.workflow_manager import WorkflowManager
+
+
+@pytest.mark.asyncio
+async def test_create_update_and_delete_workflow(db_session):
+    manager = WorkflowManager(db_session)
+
+    item = await manager.create_workflow(WorkflowItemCreate(
+        n_number="N01234", title="本", status=ProgressStatus.DISCOVERED, slack_channel="#books"
+    ))
+    assert item.due_at is None
+    assert (await manager.get_workflow_by_n_number("N01234")).id == item.id
+
+    updated = await manager.update_workflow(item.id, WorkflowItemUpdate(status=ProgressStatus.PURCHASED))
+    assert updated.status == ProgressStatus.PURCHASED and updated.due_at is not None
+    assert await manager.update_workflow(9999, WorkflowItemUpdate(title="なし")) is None
+
+    history = await get_status_history(db_session, "N01234")
+    assert [(event.old_status, event.new_status) for event in history] == [
+        (ProgressStatus.DISCOVERED, ProgressStatus.PURCHASED),
+        (None, ProgressStatus.DISCOVERED),
+    ]
+
+    assert await manager.delete_workflow(item.id) is True
+    assert await manager.delete_workflow(item.id) is False
+    assert await manager.get_workflow_by_n_number("N01234") is None
+
+
+@pytest.mark.asyncio
+async def test_update_status_records_change(db_session):
+    manager = WorkflowManager(db_session)
+    await manager.create_workflow(WorkflowItemCreate(n_number="N01234", status=ProgressStatus.PURCHASED))
+
+    item = await manager.update_status(
+        "N01234", ProgressStatus.MANUSCRIPT_REQUESTED, {"format": "pdf"},
+        source=WebhookSource.MANUAL, changed_by="editor1", comment="依頼済み"
+    )
+
+    assert item.workflow_metadata == {"format": "pdf"}
+    event = (await get_status_history(db_session, "N01234"))[0]
+    assert (event.changed_by, event.comment) == ("editor1", "依頼済み")
+    assert await manager.update_status("N09999", ProgressStatus.COMPLETED) is None
+
+
+@pytest.mark.asyncio
+async def test_assign_editor_and_filter(db_session):
+    manager = WorkflowManager(db_session)
+    for n_number, status in [("N00001", ProgressStatus.DISCOVERED), ("N00002", ProgressStatus.PURCHASED)]:
+        await manager.create_workflow(WorkflowItemCreate(n_number=n_number, status=status))
+
+    assert (await manager.assign_editor("N00001", "editor1")).assigned_editor == "editor1"
+    assert await manager.assign_editor("N09999", "editor1") is None
+
+    items, total = await manager.get_workflows(assigned_editor="editor1")
+    assert ([item.n_number for item in items], total) == (["N00001"], 1)
+    items, total = await manager.get_workflows(status=ProgressStatus.PURCHASED)
+    assert ([item.n_number for item in items], total) == (["N00002"], 1)
+
+
+@pytest.mark.asyncio
+async def test_workflow_service_queries_and_updates(db_session):
+    service = WorkflowService(db_session)
+    await service.bulk_create_or_update([
+        {"n_number": "N00001", "status": ProgressStatus.DISCOVERED, "assigned_editor": "editor1"},
+        {"n_number": "N00002", "status": ProgressStatus.PURCHASED, "assigned_editor": "editor1"},
+        {"n_number": "N00003", "status": ProgressStatus.PURCHASED},
+    ])
+
+    assert {item.n_number for item in await service.get_by_status(ProgressStatus.PURCHASED)} == {"N00002", "N00003"}
+    assert {item.n_number for item in await service.get_by_editor("editor1")} == {"N00001", "N00002"}
+    items, total = await service.get_multi_with_filters(
+        status=ProgressStatus.PURCHASED, assigned_editor="editor1"
+    )
+    assert ([item.n_number for item in items], total) == (["N00002"], 1)
+
+    item = await service.update_status("N00002", ProgressStatus.MANUSCRIPT_REQUESTED, {"pages": 80})
+    assert (item.status, item.workflow_metadata) == (ProgressStatus.MANUSCRIPT_REQUESTED, {"pages": 80})
+    assert (await service.assign_editor("N00003", "editor2")).assigned_editor == "editor2"
+    assert await service.update_status("N09999", ProgressStatus.COMPLETED) is None
+    assert await service.assign_editor("N09999", "editor2") is None